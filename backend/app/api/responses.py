@@ -0,0 +1,185 @@
+from email.utils import formatdate, parsedate_to_datetime
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.types import Receive, Scope, Send
+from typing import Optional, Tuple
+import anyio
+import os
+import stat
+
+from app.services import metrics
+
+
+class RangeFileResponse(FileResponse):
+    """
+    Range/If-Range/조건부 요청을 지원하는 파일 응답 (이어받기, 탐색, CDN 캐시용)
+
+    - 단일 바이트 범위 요청은 206 Partial Content (여러 범위는 전체 파일로 응답)
+    - If-Range가 현재 ETag/Last-Modified와 다르면 전체 파일로 응답
+    - If-None-Match가 일치하면 304 Not Modified
+    - 서버가 ASGI zerocopysend 확장을 지원하면 sendfile로 전송 (아니면 큰 청크 pread)
+    """
+
+    chunk_size = 256 * 1024
+    metrics_endpoint = 'download'  # 전송 바이트 메트릭 레이블
+
+    def set_stat_headers(self, stat_result: os.stat_result) -> None:
+        # 강한 ETag (mtime_ns + 크기, 해시 계산 없음)
+        self.headers.setdefault('content-length', str(stat_result.st_size))
+        self.headers.setdefault('last-modified', formatdate(stat_result.st_mtime, usegmt=True))
+        self.headers.setdefault('etag', f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"')
+        self.headers.setdefault('accept-ranges', 'bytes')
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self.stat_result is None:
+            try:
+                self.stat_result = await anyio.to_thread.run_sync(os.stat, self.path)
+            except FileNotFoundError:
+                raise RuntimeError(f"File at path {self.path} does not exist.")
+            if not stat.S_ISREG(self.stat_result.st_mode):
+                raise RuntimeError(f"File at path {self.path} is not a file.")
+            self.set_stat_headers(self.stat_result)
+
+        size = self.stat_result.st_size
+        request_headers = Headers(scope=scope)
+
+        if self._not_modified(request_headers):
+            await self._send_empty(send, 304, exclude=('content-length', 'content-type', 'content-disposition'))
+            return
+
+        offset, count = 0, size
+        if scope.get('method', 'GET') in ('GET', 'HEAD') and self._if_range_matches(request_headers):
+            byte_range = self.parse_range(request_headers.get('range'), size)
+            if byte_range == 'unsatisfiable':
+                self.headers['content-range'] = f'bytes */{size}'
+                await self._send_empty(send, 416, exclude=('content-length', 'content-disposition'))
+                return
+            if byte_range is not None:
+                offset, count = byte_range
+                self.status_code = 206
+                self.headers['content-range'] = f'bytes {offset}-{offset + count - 1}/{size}'
+                self.headers['content-length'] = str(count)
+
+        await send({
+            'type': 'http.response.start',
+            'status': self.status_code,
+            'headers': self.raw_headers
+        })
+
+        if self.send_header_only or scope.get('method') == 'HEAD':
+            await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+        elif 'http.response.zerocopysend' in scope.get('extensions', {}):
+            with open(self.path, 'rb') as file:
+                await send({
+                    'type': 'http.response.zerocopysend',
+                    'file': file,
+                    'offset': offset,
+                    'count': count,
+                    'more_body': False
+                })
+        else:
+            await self._send_chunks(send, offset, count)
+
+        if scope.get('method') != 'HEAD':
+            metrics.bytes_served.inc(count, (self.metrics_endpoint,))
+
+        if self.background is not None:
+            await self.background()
+
+    async def _send_chunks(self, send: Send, offset: int, count: int) -> None:
+        """pread로 범위를 청크 단위 전송 (파일 위치 공유 없이 스레드에서 읽기)"""
+        fd = await anyio.to_thread.run_sync(os.open, self.path, os.O_RDONLY)
+        try:
+            remaining = count
+            if remaining == 0:
+                await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+            while remaining > 0:
+                chunk = await anyio.to_thread.run_sync(
+                    os.pread, fd, min(self.chunk_size, remaining), offset
+                )
+                if not chunk:
+                    # 전송 중 파일이 줄어든 경우
+                    await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+                    break
+                offset += len(chunk)
+                remaining -= len(chunk)
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': remaining > 0})
+        finally:
+            os.close(fd)
+
+    async def _send_empty(self, send: Send, status_code: int, exclude: Tuple[str, ...]) -> None:
+        """본문 없는 응답 (304/416)"""
+        headers = [
+            (name, value) for name, value in self.raw_headers
+            if name.decode('latin-1') not in exclude
+        ]
+        if status_code == 416:
+            headers.append((b'content-length', b'0'))
+        await send({'type': 'http.response.start', 'status': status_code, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+
+    def _not_modified(self, request_headers: Headers) -> bool:
+        """If-None-Match 확인"""
+        if_none_match = request_headers.get('if-none-match')
+        if not if_none_match:
+            return False
+        etag = self.headers['etag']
+        tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+        return '*' in tags or etag in tags
+
+    def _if_range_matches(self, request_headers: Headers) -> bool:
+        """If-Range가 없거나 현재 파일과 일치하면 Range 적용"""
+        if_range = request_headers.get('if-range')
+        if not if_range:
+            return True
+        if if_range.startswith('"') or if_range.startswith('W/'):
+            # If-Range에는 강한 ETag만 허용
+            return if_range == self.headers['etag']
+        try:
+            return int(parsedate_to_datetime(if_range).timestamp()) >= int(self.stat_result.st_mtime)
+        except (TypeError, ValueError):
+            return False
+
+    @staticmethod
+    def parse_range(header: Optional[str], size: int):
+        """
+        Range 헤더 파싱
+
+        Args:
+            header: Range 헤더 값 (예: bytes=0-1023, bytes=1024-, bytes=-500)
+            size: 파일 크기
+
+        Returns:
+            (offset, count), 범위를 적용하지 않으면 None, 만족할 수 없으면 'unsatisfiable'
+        """
+        if not header or not header.startswith('bytes='):
+            return None
+
+        if size == 0:
+            return 'unsatisfiable'
+
+        ranges = header[len('bytes='):].split(',')
+        if len(ranges) != 1:
+            return None  # 여러 범위는 전체 파일로 응답 (RFC 9110 허용)
+
+        start, _, end = ranges[0].strip().partition('-')
+        try:
+            if start == '':
+                # 끝에서부터 N바이트
+                suffix = int(end)
+                if suffix <= 0:
+                    return 'unsatisfiable'
+                offset = max(0, size - suffix)
+                return offset, size - offset
+
+            offset = int(start)
+            last = int(end) if end else size - 1
+        except ValueError:
+            return None  # 잘못된 형식은 무시
+
+        if offset >= size:
+            return 'unsatisfiable'
+        if last < offset:
+            return None
+        last = min(last, size - 1)
+        return offset, last - offset + 1
@@ -1,18 +1,27 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse, FileResponse
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from urllib.parse import quote
 import json
-import asyncio
 import os
-from typing import AsyncGenerator
+import uuid
+from typing import AsyncGenerator, List, Optional, Set
 
 from app.models.schemas import (
     PreviewRequest, PreviewResponse, VideoInfo,
-    ExtractRequest, DownloadRequest, ErrorResponse
+    ExtractRequest, DownloadRequest, ErrorResponse, JobStatusResponse, AudioFormat
 )
+from app.api.responses import RangeFileResponse
+from app.services.archive import ArchiveEntry, iter_zip
+from app.services.batch import run_batch
+from app.services import metrics, tracing
 from app.services.youtube import youtube_service, VideoError
-from app.services.audio import audio_service
 from app.services.session import session_manager
-from app.utils.sanitize import parse_cover_filename, sanitize_filename
+from app.services.cache import audio_cache
+from app.services.jobs import job_manager, QueueFullError
+from app.services.pipeline import error_category, error_event, extract_to_session, stream_job_audio
+from app.services.transcode import CODECS
+from app.utils.sanitize import sanitize_filename
+from app.utils.youtube_url import parse_youtube_url
 from app.core.config import settings
 
 router = APIRouter()
@@ -32,141 +41,66 @@ async def preview_video(request: PreviewRequest):
         )
 
     except VideoError as e:
+        metrics.errors.inc(labels=(e.category,))
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
+        metrics.errors.inc(labels=(error_category(e),))
         raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
 
 
+def _sse(data: dict) -> str:
+    """SSE 이벤트 포맷"""
+    return f"data: {json.dumps(data)}\n\n"
+
+
 @router.get("/extract")
-async def extract_audio(youtube_url: str):
+async def extract_audio(
+    youtube_url: str,
+    audio_format: Optional[AudioFormat] = Query(None, alias="format"),
+    x_profile: Optional[str] = Header(None)
+):
     """
     음원 추출 (SSE 스트림)
+
+    동일 영상에 대한 동시 요청은 하나의 추출 작업을 공유하고,
+    작업이 끝나면 요청마다 별도의 세션을 받는다.
+    작업 대기열이 가득 차면 503 + Retry-After를 반환한다.
+    format=m4a|opus를 지정하면 원본 코덱이 같을 때 재인코딩 없이 제공한다.
+    응답의 X-Trace-ID로 이 요청과 작업의 JSON 로그를 찾을 수 있다.
     """
-    async def event_generator() -> AsyncGenerator[str, None]:
-        session_id = None
-        output_path = None
+    audio_format = audio_format or settings.AUDIO_FORMAT
+    trace_id = uuid.uuid4().hex
+    profile = tracing.profiling_requested(x_profile)
 
-        try:
-            # Step 1: 영상 정보 확인
-            yield f"data: {json.dumps({'step': 'validating', 'progress': settings.PROGRESS_VALIDATION_START, 'message': '영상 정보 확인 중...'})}\n\n"
-            await asyncio.sleep(settings.DELAY_STEP_TRANSITION)
-
-            video_info = await youtube_service.get_video_info(youtube_url)
-
-            yield f"data: {json.dumps({'step': 'validating', 'progress': settings.PROGRESS_VALIDATION_END, 'message': '영상 정보 확인 완료'})}\n\n"
-            await asyncio.sleep(settings.DELAY_STEP_TRANSITION)
-
-            # 세션 ID 및 파일 경로 생성
-            import uuid
-            session_id = str(uuid.uuid4())
-            output_path = os.path.join(settings.upload_path, session_id)
-
-            # Step 2: 음원 다운로드
-            last_progress = settings.PROGRESS_DOWNLOAD_START
-
-            def progress_callback(data):
-                nonlocal last_progress
-                # yt-dlp progress를 다운로드 진행률 범위로 매핑
-                percent = data.get('percent', 0)
-                progress_range = settings.PROGRESS_DOWNLOAD_END - settings.PROGRESS_DOWNLOAD_START
-                mapped_progress = settings.PROGRESS_DOWNLOAD_START + (percent * progress_range / 100)
-
-                # 변화가 있을 때만 업데이트 (노이즈 감소)
-                if abs(mapped_progress - last_progress) >= 1:
-                    last_progress = mapped_progress
-                    # SSE 이벤트는 비동기 컨텍스트에서만 전송 가능
-                    # 여기서는 progress만 저장
-
-            yield f"data: {json.dumps({'step': 'downloading', 'progress': settings.PROGRESS_DOWNLOAD_START, 'message': '음원 다운로드 시작...'})}\n\n"
-
-            mp3_path = await youtube_service.download_audio(
-                youtube_url,
-                output_path,
-                progress_callback=None  # 콜백은 동기 함수라 SSE와 호환 안됨
-            )
-
-            yield f"data: {json.dumps({'step': 'downloading', 'progress': settings.PROGRESS_DOWNLOAD_END, 'message': '음원 다운로드 완료'})}\n\n"
-            await asyncio.sleep(settings.DELAY_STEP_TRANSITION)
-
-            # Step 3: 썸네일 추출
-            yield f"data: {json.dumps({'step': 'extracting_thumbnail', 'progress': settings.PROGRESS_THUMBNAIL_START, 'message': '썸네일 추출 중...'})}\n\n"
-            await asyncio.sleep(settings.DELAY_THUMBNAIL_EXTRACTION)
-
-            yield f"data: {json.dumps({'step': 'extracting_thumbnail', 'progress': settings.PROGRESS_THUMBNAIL_END, 'message': '썸네일 추출 완료'})}\n\n"
-            await asyncio.sleep(settings.DELAY_STEP_TRANSITION)
-
-            # Step 4: 커버 이미지 삽입
-            yield f"data: {json.dumps({'step': 'embedding', 'progress': settings.PROGRESS_EMBEDDING_START, 'message': '커버 이미지 삽입 중...'})}\n\n"
-
-            await audio_service.embed_cover_image(
-                mp3_path,
-                video_info['thumbnail_url'],
-                metadata={
-                    'title': video_info['title'],
-                    'artist': video_info['channel']
-                }
-            )
-
-            yield f"data: {json.dumps({'step': 'embedding', 'progress': settings.PROGRESS_EMBEDDING_END, 'message': '커버 이미지 삽입 완료'})}\n\n"
-            await asyncio.sleep(settings.DELAY_STEP_TRANSITION)
-
-            # 파일명 제안
-            suggested_filename = parse_cover_filename(video_info['title'])
-
-            # 세션 생성
-            session_manager.create_session(
-                file_path=mp3_path,
-                metadata={
-                    'thumbnail_url': video_info['thumbnail_url'],
-                    'suggested_filename': suggested_filename,
-                    'original_title': video_info['title'],
-                    'duration': video_info['duration'],
-                    'channel': video_info['channel']
-                }
-            )
-
-            # Step 5: 완료
-            complete_data = {
-                'step': 'complete',
-                'progress': 100,
-                'message': '완료!',
-                'session_id': session_id,
-                'preview': {
-                    'thumbnail_url': video_info['thumbnail_url'],
-                    'suggested_filename': suggested_filename,
-                    'original_title': video_info['title'],
-                    'duration': video_info['duration']
-                }
-            }
-            yield f"data: {json.dumps(complete_data)}\n\n"
-
-        except VideoError as e:
-            # 영상 관련 에러
-            error_data = {
-                'step': 'error',
-                'progress': 0,
-                'message': str(e),
-                'error_detail': 'video_error'
-            }
-            yield f"data: {json.dumps(error_data)}\n\n"
-
-            # 임시 파일 정리
-            if output_path and os.path.exists(f"{output_path}.mp3"):
-                os.remove(f"{output_path}.mp3")
+    # URL 검증 (잘못된 입력은 대기열 상태와 관계없이 400)
+    try:
+        parsed = youtube_service.parse_url(youtube_url)
+    except VideoError as e:
+        metrics.errors.inc(labels=(e.category,))
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # 대기열 확인 (캐시 히트나 진행 중인 작업 합류는 대기열을 쓰지 않음)
+    job_key = audio_cache.make_key(parsed.video_id, audio_format, settings.AUDIO_BITRATE)
+    cached = settings.AUDIO_CACHE_ENABLED and audio_cache.contains(
+        parsed.video_id, audio_format, settings.AUDIO_BITRATE
+    )
+
+    try:
+        if not cached:
+            job_manager.check_capacity(job_key)
+    except QueueFullError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
 
+    async def event_generator() -> AsyncGenerator[str, None]:
+        try:
+            async for event in extract_to_session(youtube_url, audio_format, trace_id=trace_id, profile=profile):
+                yield _sse(event)
         except Exception as e:
-            # 일반 에러
-            error_data = {
-                'step': 'error',
-                'progress': 0,
-                'message': '처리 중 오류가 발생했습니다',
-                'error_detail': str(e)
-            }
-            yield f"data: {json.dumps(error_data)}\n\n"
-
-            # 임시 파일 정리
-            if output_path and os.path.exists(f"{output_path}.mp3"):
-                os.remove(f"{output_path}.mp3")
+            yield _sse(error_event(e))
 
     return StreamingResponse(
         event_generator(),
@@ -174,17 +108,171 @@ async def extract_audio(youtube_url: str):
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
+            "X-Trace-ID": trace_id,
         }
     )
 
 
-@router.post("/download")
-async def download_file(request: DownloadRequest):
+@router.get("/batch/extract")
+async def extract_batch(
+    youtube_url: List[str] = Query(..., description="영상 또는 재생목록 URL (여러 번 지정 가능)"),
+    audio_format: Optional[AudioFormat] = Query(None, alias="format"),
+    x_profile: Optional[str] = Header(None)
+):
+    """
+    여러 영상/재생목록 일괄 추출 (하나의 SSE 스트림)
+
+    재생목록은 flat 조회 한 번으로 펼치고, 영상들은 BATCH_CONCURRENCY개씩 병렬로 추출한다.
+    항목별 진행 이벤트(step=item)에 전체 진행률이 포함되고,
+    마지막 complete 이벤트의 session_ids로 /batch/zip에서 한 번에 받을 수 있다.
+    모든 항목의 로그는 응답의 X-Trace-ID 하나로 묶인다.
+    """
+    audio_format = audio_format or settings.AUDIO_FORMAT
+    trace_id = uuid.uuid4().hex
+    profile = tracing.profiling_requested(x_profile)
+
+    if len(youtube_url) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {settings.BATCH_MAX_ITEMS}개까지 추출할 수 있습니다")
+    for url in youtube_url:
+        if parse_youtube_url(url) is None:
+            raise HTTPException(status_code=400, detail=f"올바른 YouTube URL이 아닙니다: {url}")
+
+    async def event_generator() -> AsyncGenerator[str, None]:
+        # 항목별 추출은 이 추적 ID를 이어받음
+        with tracing.start(trace_id):
+            try:
+                yield _sse({'step': 'resolving', 'progress': 0, 'message': '영상 목록 확인 중...'})
+
+                entries = await youtube_service.resolve_entries(youtube_url, settings.BATCH_MAX_ITEMS)
+                if not entries:
+                    raise VideoError('추출할 영상이 없습니다', 'unavailable')
+
+                async for event in run_batch(entries, audio_format, profile=profile):
+                    yield _sse(event)
+            except Exception as e:
+                yield _sse(error_event(e))
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Trace-ID": trace_id,
+        }
+    )
+
+
+def _unique_name(name: str, ext: str, used: Set[str]) -> str:
+    """ZIP 안에서 겹치지 않는 파일명 (같은 제목이면 ' (2)' 등을 붙임)"""
+    candidate = f"{name}.{ext}"
+    counter = 2
+    while candidate.lower() in used:
+        candidate = f"{name} ({counter}).{ext}"
+        counter += 1
+    used.add(candidate.lower())
+    return candidate
+
+
+@router.get("/batch/zip")
+async def download_batch_zip(
+    session_id: List[str] = Query(..., description="일괄 추출 결과 세션 ID (여러 번 지정 가능)"),
+    filename: Optional[str] = None
+):
+    """
+    여러 세션의 음원을 ZIP 하나로 다운로드
+
+    아카이브는 파일을 읽는 대로 만들어 전송하므로 메모리나 디스크에 미리 만들지 않는다.
+    만료되었거나 없는 세션은 건너뛴다.
+    """
+    if len(session_id) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {settings.BATCH_MAX_ITEMS}개까지 받을 수 있습니다")
+
+    entries: List[ArchiveEntry] = []
+    used: Set[str] = set()
+    try:
+        for sid in dict.fromkeys(session_id):
+            session = session_manager.get_session(sid)
+            if not session:
+                continue
+
+            metadata = session['metadata']
+            codec = CODECS.get(metadata.get('audio_format', 'mp3'), CODECS['mp3'])
+            try:
+                # 전송 중에 세션이 정리되어도 열린 파일은 끝까지 읽을 수 있음
+                file = open(session['file_path'], 'rb')
+            except FileNotFoundError:
+                continue
+            stat_result = os.fstat(file.fileno())
+            name = _unique_name(metadata.get('suggested_filename', 'audio'), codec['ext'], used)
+            entries.append(ArchiveEntry(name, file, stat_result.st_size, stat_result.st_mtime))
+    except BaseException:
+        for entry in entries:
+            entry.file.close()
+        raise
+
+    if not entries:
+        raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다")
+
+    archive_name = f"{sanitize_filename(filename) if filename else 'audio'}.zip"
+    def counted_zip():
+        for chunk in iter_zip(entries):
+            metrics.bytes_served.inc(len(chunk), ('zip',))
+            yield chunk
+
+    return StreamingResponse(
+        counted_zip(),
+        media_type="application/zip",
+        headers={"Content-Disposition": f"attachment; filename*=utf-8''{quote(archive_name)}"}
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job_status(job_id: str):
+    """
+    추출 작업 상태 조회
+    """
+    job = job_manager.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+
+    return JobStatusResponse(**job)
+
+
+@router.get("/listen/{job_id}")
+async def listen_job(job_id: str):
     """
-    MP3 파일 다운로드
+    추출 중인 음원 재생 (chunked 스트림)
+
+    변환 중인 파일을 만들어지는 대로 전송하므로 긴 영상도 추출이 끝나기 전에 재생할 수 있다.
+    job_id는 추출 SSE 이벤트에 포함된다. 태그가 들어간 완성본은 기존처럼 세션으로 받는다.
     """
+    job = job_manager.join(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="진행 중인 작업을 찾을 수 없습니다")
+
+    # 작업 키는 audio_cache.make_key 형식 (<video_id>_<bitrate>k.<format>)
+    codec = CODECS.get(os.path.splitext(job.key)[1].lstrip('.'), CODECS['mp3'])
+
+    async def audio_generator() -> AsyncGenerator[bytes, None]:
+        try:
+            async for chunk in stream_job_audio(job):
+                metrics.bytes_served.inc(len(chunk), ('listen',))
+                yield chunk
+        finally:
+            job_manager.release(job)
+
+    return StreamingResponse(
+        audio_generator(),
+        media_type=codec['mime'],
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
+def _session_file_response(session_id: str, filename: Optional[str], method: str) -> RangeFileResponse:
+    """세션 파일 응답 생성 (세션에 기록된 포맷의 확장자/MIME 사용)"""
     # 세션 확인
-    session = session_manager.get_session(request.session_id)
+    session = session_manager.get_session(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다")
 
@@ -192,23 +280,72 @@ async def download_file(request: DownloadRequest):
     metadata = session['metadata']
 
     # 파일 존재 확인
-    if not os.path.exists(file_path):
+    try:
+        stat_result = os.stat(file_path)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다")
 
     # 파일명 처리
-    if request.filename:
-        filename = sanitize_filename(request.filename)
+    if filename:
+        filename = sanitize_filename(filename)
     else:
         filename = metadata.get('suggested_filename', 'audio')
 
-    filename = f"{filename}.mp3"
+    codec = CODECS.get(metadata.get('audio_format', 'mp3'), CODECS['mp3'])
 
-    # 파일 다운로드
-    return FileResponse(
+    # 비ASCII 파일명은 filename*=utf-8'' 형식으로 인코딩됨
+    return RangeFileResponse(
         path=file_path,
-        filename=filename,
-        media_type="audio/mpeg",
-        headers={
-            "Content-Disposition": f'attachment; filename="{filename}"'
-        }
+        filename=f"{filename}.{codec['ext']}",
+        media_type=codec['mime'],
+        stat_result=stat_result,
+        method=method
+    )
+
+
+@router.api_route("/download/{session_id}", methods=["GET", "HEAD"])
+async def download_session_file(session_id: str, request: Request, filename: Optional[str] = None):
+    """
+    음원 파일 다운로드 (GET, 이어받기/탐색 지원)
+
+    Range/If-Range 요청에 206으로 응답하고 ETag/Last-Modified를 제공한다.
+    """
+    return _session_file_response(session_id, filename, request.method)
+
+
+@router.get("/download/{session_id}/profile")
+async def download_session_profile(session_id: str, request: Request):
+    """
+    작업 프로파일 다운로드 (PROFILE_MODE로 측정된 경우, pstats 파일)
+
+    python -m pstats 또는 snakeviz로 열 수 있다.
+    """
+    session = session_manager.get_session(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다")
+
+    profile_path = session['metadata'].get('profile_path')
+    try:
+        stat_result = os.stat(profile_path) if profile_path else None
+    except FileNotFoundError:
+        stat_result = None
+    if stat_result is None:
+        raise HTTPException(status_code=404, detail="프로파일을 찾을 수 없습니다")
+
+    response = RangeFileResponse(
+        path=profile_path,
+        filename=f"{session['metadata'].get('suggested_filename', 'audio')}.prof",
+        media_type="application/octet-stream",
+        stat_result=stat_result,
+        method=request.method
     )
+    response.metrics_endpoint = 'profile'
+    return response
+
+
+@router.post("/download")
+async def download_file(request: DownloadRequest):
+    """
+    음원 파일 다운로드 (POST, 사용자 지정 파일명)
+    """
+    return _session_file_response(request.session_id, request.filename, "POST")
@@ -30,19 +30,103 @@ class Settings(BaseSettings):
     PROGRESS_VALIDATION_START: int = 0
     PROGRESS_VALIDATION_END: int = 15
     PROGRESS_DOWNLOAD_START: int = 15
+    PROGRESS_POSTPROCESS_START: int = 65  # FFmpeg 변환 시작
     PROGRESS_DOWNLOAD_END: int = 70
     PROGRESS_THUMBNAIL_START: int = 70
     PROGRESS_THUMBNAIL_END: int = 85
     PROGRESS_EMBEDDING_START: int = 85
     PROGRESS_EMBEDDING_END: int = 100
 
-    # UI delay times (seconds)
+    # Minimum interval between streamed download progress events (seconds)
+    PROGRESS_EVENT_INTERVAL: float = 0.25
+
+    # Fast-path mode: 단계 이벤트를 실제 작업 완료 즉시 전송 (연출용 지연 없음)
+    PIPELINE_FAST_PATH: bool = True
+
+    # UI delay times (seconds, PIPELINE_FAST_PATH=False일 때만 사용)
     DELAY_STEP_TRANSITION: float = 0.3
     DELAY_THUMBNAIL_EXTRACTION: float = 0.5
 
     # Video duration warning threshold (seconds)
     LONG_VIDEO_WARNING_SECONDS: int = 1800  # 30 minutes
 
+    # Audio output
+    AUDIO_FORMAT: str = "mp3"  # 기본 출력 포맷 (mp3 | m4a | opus)
+    AUDIO_BITRATE: int = 192  # kbps
+
+    # Result cache (완성된 음원 재사용)
+    AUDIO_CACHE_ENABLED: bool = True
+    AUDIO_CACHE_DIR: str = "cache"  # upload_path 하위 디렉토리
+    AUDIO_CACHE_MAX_MB: int = 2048  # 같은 캐시 디렉토리를 쓰는 워커 전체 합계
+
+    # Job queue (추출 작업 대기열)
+    JOB_QUEUE_MAX_DEPTH: int = 20  # 초과 시 503 + Retry-After
+    JOB_RETRY_AFTER_SECONDS: int = 30  # 작업 1개 예상 소요 시간 초기값
+    JOB_CANCEL_GRACE_SECONDS: float = 5.0  # 마지막 대기자가 연결을 끊은 뒤 취소까지 유예 (새로고침/재접속 대비)
+    JOB_STORE: str = "memory"  # memory | sqlite (여러 워커가 진행 중인 작업을 공유하려면 sqlite)
+    JOB_STORE_FILE: str = "jobs.db"  # upload_path 기준
+
+    # Session store (여러 워커가 세션을 공유하려면 sqlite)
+    SESSION_STORE: str = "memory"  # memory | sqlite
+    SESSION_STORE_FILE: str = "sessions.db"  # upload_path 기준
+    SESSION_CLEANUP_INTERVAL_SECONDS: int = 60  # 만료 세션 정리 주기
+
+    # Orphan files (재시작/중단된 작업이 남긴 파일 정리)
+    ORPHAN_SWEEP_INTERVAL_SECONDS: int = 3600  # 시작 시 1회 + 주기
+    ORPHAN_PARTIAL_AGE_SECONDS: int = 1800  # 이보다 오래된 중간 파일만 삭제
+
+    # Storage quota (temp_files 실측 크기: 세션 파일 + 음원 캐시 + 작업 파일, 진행 중인 작업 예약량)
+    STORAGE_QUOTA_MB: int = 4096
+    STORAGE_PRESSURE_PERCENT: int = 90  # 초과 시 오래된 세션, 캐시 항목 순으로 조기 삭제
+    STORAGE_MIN_FREE_MB: int = 256  # 디스크 여유 공간 하한
+    STORAGE_MEASURE_INTERVAL_SECONDS: int = 30  # 작업 시작 시 이보다 오래된 실측만 다시 측정 (할당량을 넘으면 항상)
+
+    # Thread pools (메타데이터 조회와 다운로드는 별도 풀)
+    # 작업 대기열도 단계별로 같은 수만큼 동시에 실행 (다운로드 중인 작업 수, 변환 중인 작업 수)
+    METADATA_WORKERS: int = 4
+    DOWNLOAD_WORKERS: int = 3
+    TRANSCODE_WORKERS: int = 0  # 0 = CPU 코어 수
+
+    # FFmpeg
+    FFMPEG_PATH: str = "ffmpeg"
+    FFMPEG_THREADS: int = 1  # 변환 작업당 스레드 수
+    STREAM_COPY_ENABLED: bool = True  # 원본 코덱이 요청 포맷과 같으면 재인코딩 생략
+    PIPELINE_STREAMING: bool = False  # 원본 파일 없이 다운로드 바이트를 FFmpeg stdin으로 바로 전달
+    STREAM_CHUNK_BYTES: int = 10 * 1024 * 1024  # 스트리밍 다운로드 Range 요청 크기
+
+    # Listen while extracting (변환 중인 파일 재생 스트리밍)
+    LISTEN_CHUNK_BYTES: int = 64 * 1024
+    LISTEN_POLL_INTERVAL: float = 0.2  # 출력이 더 쓰이기를 기다리는 간격 (초)
+
+    # Batch / playlist extraction
+    BATCH_MAX_ITEMS: int = 50  # 요청당 최대 영상 수 (재생목록 포함)
+    BATCH_CONCURRENCY: int = 3  # 배치 하나에서 동시에 추출할 영상 수
+
+    # Outbound HTTP (썸네일 등, keep-alive 커넥션 풀)
+    HTTP_POOL_SIZE: int = 10
+    HTTP_TIMEOUT_SECONDS: int = 10
+    THUMBNAIL_WORKERS: int = 4
+
+    # Cover image (썸네일 → 정사각형 JPEG)
+    THUMBNAIL_SIZE: int = 600  # px
+    THUMBNAIL_JPEG_QUALITY: int = 85
+    THUMBNAIL_CACHE_TTL_SECONDS: int = 3600
+    THUMBNAIL_CACHE_MAX_ENTRIES: int = 256
+
+    # Metrics (/metrics, Prometheus 텍스트 포맷)
+    METRICS_ENABLED: bool = True
+
+    # Tracing (작업별 추적 ID, 구간별 소요 시간을 JSON 로그로 출력)
+    TRACING_ENABLED: bool = True
+    LOG_FORMAT: str = "text"  # text | json (trace 로그는 항상 JSON)
+    # 작업 프로파일 (cProfile, 세션과 함께 저장되어 /download/{session_id}/profile로 받음)
+    PROFILE_MODE: str = "off"  # off | header (X-Profile: 1) | all
+
+    # Video info cache (미리보기 결과 재사용)
+    VIDEO_INFO_CACHE_TTL_SECONDS: int = 600
+    VIDEO_INFO_CACHE_NEGATIVE_TTL_SECONDS: int = 60  # 비공개/삭제 영상
+    VIDEO_INFO_CACHE_MAX_ENTRIES: int = 1024
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -58,6 +142,21 @@ class Settings(BaseSettings):
         base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
         return os.path.join(base_dir, self.UPLOAD_DIR)
 
+    @property
+    def job_store_path(self) -> str:
+        """Get absolute path for SQLite job store"""
+        return os.path.join(self.upload_path, self.JOB_STORE_FILE)
+
+    @property
+    def session_store_path(self) -> str:
+        """Get absolute path for SQLite session store"""
+        return os.path.join(self.upload_path, self.SESSION_STORE_FILE)
+
+    @property
+    def audio_cache_path(self) -> str:
+        """Get absolute path for audio cache directory"""
+        return os.path.join(self.upload_path, self.AUDIO_CACHE_DIR)
+
 
 settings = Settings()
 
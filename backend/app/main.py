@@ -1,5 +1,6 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
 import asyncio
 import logging
@@ -7,24 +8,45 @@ import logging
 from app.core.config import settings
 from app.api.routes import router
 from app.services.session import session_manager
+from app.services.cache import audio_cache
+from app.services.youtube import youtube_service
+from app.services.jobs import job_manager
+from app.services.executors import get_executor_stats
+from app.services.storage import storage_manager
+from app.services.reconcile import orphan_reconciler
+from app.services.thumbnail import thumbnail_service
+from app.services import metrics, tracing
 
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
+# 작업/구간 로그는 JSON 한 줄씩 (LOG_FORMAT=json이면 일반 로그도 JSON)
+tracing.setup_logging()
 logger = logging.getLogger(__name__)
 
 
 # 백그라운드 작업
 async def periodic_cleanup():
-    """주기적으로 오래된 세션 정리 (1시간마다)"""
+    """주기적으로 만료된 세션 정리 (SESSION_CLEANUP_INTERVAL_SECONDS마다)"""
     while True:
         try:
-            await asyncio.sleep(3600)  # 1시간
-            count = session_manager.cleanup_old_sessions(settings.MAX_FILE_AGE_HOURS)
-            if count > 0:
-                logger.info(f"Cleaned up {count} old sessions")
+            await asyncio.sleep(settings.SESSION_CLEANUP_INTERVAL_SECONDS)
+            # 세션 파일은 캐시 파일의 하드링크이므로 세션 삭제가 캐시에 영향을 주지 않고,
+            # 캐시 LRU 삭제도 살아있는 세션의 파일을 지우지 않는다
+            result = await session_manager.cleanup_old_sessions(settings.MAX_FILE_AGE_HOURS)
+            if result['sessions'] > 0:
+                logger.info(
+                    f"Cleaned up {result['sessions']} old sessions "
+                    f"({result['bytes_reclaimed']} bytes reclaimed, {result['duration_ms']}ms)"
+                )
+            job_manager.purge_finished(settings.MAX_FILE_AGE_HOURS)
+
+            # 디스크 사용량이 임계치를 넘었으면 오래된 세션 조기 삭제
+            evicted = await storage_manager.relieve_pressure()
+            if evicted > 0:
+                logger.info(f"Evicted {evicted} sessions under storage pressure")
         except asyncio.CancelledError:
             logger.info("Cleanup task cancelled")
             break
@@ -39,13 +61,21 @@ async def lifespan(app: FastAPI):
     logger.info(f"Starting {settings.PROJECT_NAME} v{settings.VERSION}")
     logger.info(f"Upload directory: {settings.upload_path}")
 
+    # 추출 작업 워커 시작
+    job_manager.start()
+
     # 백그라운드 정리 작업 시작
     cleanup_task = asyncio.create_task(periodic_cleanup())
 
+    # 고아 파일 정리/세션 복구 (백그라운드, 준비 상태를 지연하지 않음)
+    orphan_reconciler.start()
+
     yield
 
     # 종료 시
     logger.info("Shutting down...")
+    await job_manager.stop()
+    await orphan_reconciler.stop()
     cleanup_task.cancel()
     try:
         await cleanup_task
@@ -80,8 +110,86 @@ async def health_check():
     return {
         "status": "healthy",
         "version": settings.VERSION,
-        "sessions": session_manager.get_session_count()
+        "sessions": session_manager.get_session_count(),
+        "session_cleanup": session_manager.last_cleanup,
+        "storage": storage_manager.get_stats(),
+        "reconcile": orphan_reconciler.get_stats(),
+        "cache": audio_cache.get_stats(),
+        "video_info_cache": youtube_service.info_cache.get_stats(),
+        "jobs": job_manager.get_stats(),
+        "executors": get_executor_stats()
+    }
+
+
+def _runtime_metrics() -> list:
+    """수집 시점에 읽는 서비스 상태 (대기열, 풀, 캐시, 세션, 용량)"""
+    executors = get_executor_stats()
+    caches = {
+        'audio': audio_cache.get_stats(),
+        'video_info': youtube_service.info_cache.get_stats(),
+        'thumbnail': thumbnail_service.cache.get_stats()
     }
+    jobs = job_manager.get_stats()
+    storage = storage_manager.get_stats()
+
+    return [
+        metrics.gauge_family(
+            'ytaudio_executor_queue_depth', 'Tasks waiting for a worker thread',
+            [({'pool': e['name']}, e['queued']) for e in executors]
+        ),
+        metrics.gauge_family(
+            'ytaudio_executor_active_workers', 'Worker threads running a task',
+            [({'pool': e['name']}, e['active']) for e in executors]
+        ),
+        metrics.gauge_family(
+            'ytaudio_executor_max_workers', 'Worker thread pool size',
+            [({'pool': e['name']}, e['max_workers']) for e in executors]
+        ),
+        metrics.gauge_family(
+            'ytaudio_executor_completed_tasks_total', 'Tasks completed by the pool',
+            [({'pool': e['name']}, e['completed']) for e in executors], kind='counter'
+        ),
+        metrics.gauge_family(
+            'ytaudio_cache_hits_total', 'Cache hits',
+            [({'cache': name}, stats['hits']) for name, stats in caches.items()], kind='counter'
+        ),
+        metrics.gauge_family(
+            'ytaudio_cache_misses_total', 'Cache misses',
+            [({'cache': name}, stats['misses']) for name, stats in caches.items()], kind='counter'
+        ),
+        metrics.gauge_family(
+            'ytaudio_cache_hit_ratio', 'Cache hit ratio since start',
+            [({'cache': name}, stats['hit_ratio']) for name, stats in caches.items()]
+        ),
+        metrics.gauge_family(
+            'ytaudio_jobs', 'Extraction jobs by state',
+            [({'state': 'running'}, jobs['running']), ({'state': 'queued'}, jobs['queued'])]
+        ),
+        metrics.gauge_family(
+            'ytaudio_job_stage_active', 'Running jobs holding a download or transcode slot',
+            [({'stage': 'download'}, jobs['downloading']), ({'stage': 'transcode'}, jobs['transcoding'])]
+        ),
+        metrics.gauge_family('ytaudio_sessions', 'Active sessions', [({}, session_manager.get_session_count())]),
+        metrics.gauge_family('ytaudio_storage_used_bytes', 'Measured temp_files bytes plus unwritten reservations', [({}, storage['used_bytes'])]),
+        metrics.gauge_family('ytaudio_storage_quota_bytes', 'Storage quota', [({}, storage['quota_bytes'])]),
+    ]
+
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def metrics_endpoint():
+        """Prometheus 메트릭 (text format 0.0.4)"""
+        families = [
+            metrics.stage_seconds.collect(),
+            metrics.bytes_downloaded.collect(),
+            metrics.bytes_served.collect(),
+            metrics.errors.collect(),
+            *_runtime_metrics()
+        ]
+        return PlainTextResponse(
+            metrics.render(families),
+            media_type="text/plain; version=0.0.4; charset=utf-8"
+        )
 
 
 # 루트 엔드포인트
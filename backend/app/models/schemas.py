@@ -1,5 +1,9 @@
 from pydantic import BaseModel, HttpUrl, Field
-from typing import Optional, Literal
+from typing import List, Optional, Literal
+from datetime import datetime
+
+# 출력 음원 포맷 (m4a/opus는 원본 코덱이 같으면 재인코딩 없이 제공)
+AudioFormat = Literal['mp3', 'm4a', 'opus']
 
 
 class PreviewRequest(BaseModel):
@@ -25,6 +29,7 @@ class PreviewResponse(BaseModel):
 class ExtractRequest(BaseModel):
     """음원 추출 요청"""
     youtube_url: str = Field(..., description="YouTube video URL")
+    format: Optional[AudioFormat] = Field(None, description="Output format (default: server AUDIO_FORMAT)")
 
 
 class PreviewData(BaseModel):
@@ -37,14 +42,62 @@ class PreviewData(BaseModel):
 
 class ProgressEvent(BaseModel):
     """진행 상황 이벤트 (SSE)"""
-    step: Literal['validating', 'downloading', 'extracting_thumbnail', 'embedding', 'complete', 'error']
+    step: Literal['validating', 'queued', 'downloading', 'postprocessing', 'extracting_thumbnail', 'embedding', 'complete', 'error']
     progress: int = Field(..., ge=0, le=100, description="Progress percentage (0-100)")
     message: str
+    percent: Optional[float] = Field(None, description="Stage percent (downloading/postprocessing)")
+    downloaded_bytes: Optional[int] = None
+    total_bytes: Optional[int] = None
+    speed: Optional[float] = Field(None, description="Download speed (bytes/s)")
+    eta: Optional[int] = Field(None, description="Estimated seconds remaining")
+    job_id: Optional[str] = Field(None, description="Extraction job ID")
+    queue_position: Optional[int] = Field(None, description="Position in the job queue (queued only)")
+    retry_after: Optional[int] = Field(None, description="Seconds to wait before retrying (queue_full only)")
     session_id: Optional[str] = None
+    trace_id: Optional[str] = Field(None, description="Trace ID in the JSON logs (complete only)")
+    profile: Optional[bool] = Field(None, description="Job profile available at /download/{session_id}/profile (complete only)")
     preview: Optional[PreviewData] = None
     error_detail: Optional[str] = None
 
 
+class BatchItem(BaseModel):
+    """일괄 추출 항목 결과"""
+    index: int
+    video_id: str
+    title: Optional[str] = None
+    session_id: Optional[str] = None
+    suggested_filename: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BatchProgressEvent(BaseModel):
+    """일괄 추출 진행 이벤트 (SSE)"""
+    step: Literal['resolving', 'resolved', 'item', 'complete', 'error']
+    progress: int = Field(..., ge=0, le=100, description="Overall progress percentage (0-100)")
+    message: str
+    total: Optional[int] = Field(None, description="Number of videos in the batch")
+    completed: Optional[int] = None
+    failed: Optional[int] = None
+    index: Optional[int] = Field(None, description="Item index (item only)")
+    video_id: Optional[str] = Field(None, description="Item video ID (item only)")
+    item_step: Optional[str] = Field(None, description="Item step, same values as ProgressEvent.step (item only)")
+    item_progress: Optional[int] = Field(None, description="Item progress percentage (item only)")
+    session_ids: Optional[List[str]] = Field(None, description="Completed session IDs for /batch/zip (complete only)")
+    items: Optional[List[BatchItem]] = None
+    error_detail: Optional[str] = None
+
+
+class JobStatusResponse(BaseModel):
+    """추출 작업 상태"""
+    job_id: str
+    status: Literal['queued', 'running', 'completed', 'failed', 'cancelled']
+    queue_position: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
 class DownloadRequest(BaseModel):
     """다운로드 요청"""
     session_id: str = Field(..., description="Session ID from extraction")
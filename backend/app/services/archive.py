@@ -0,0 +1,74 @@
+from typing import BinaryIO, Iterator, List, NamedTuple
+import io
+import time
+import zipfile
+
+
+class ArchiveEntry(NamedTuple):
+    name: str  # ZIP 안의 파일명
+    file: BinaryIO  # 열린 파일 (세션이 정리돼도 끝까지 읽을 수 있도록 미리 연다)
+    size: int
+    mtime: float
+
+
+class _ChunkSink(io.RawIOBase):
+    """zipfile 출력을 받아 청크로 내보내는 쓰기 전용 스트림 (seek 불가 → 데이터 디스크립터 사용)"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._offset = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_zip(entries: List[ArchiveEntry], chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+    """
+    파일들을 ZIP으로 묶어 만들어지는 대로 전송 (메모리나 디스크에 전체 아카이브를 만들지 않음)
+
+    음원은 이미 압축돼 있으므로 무압축(STORED)으로 저장한다.
+    동기 생성기이므로 StreamingResponse가 스레드 풀에서 읽는다.
+
+    Args:
+        entries: 묶을 파일 목록
+        chunk_size: 파일을 읽는 단위
+
+    Yields:
+        ZIP 바이트 청크
+    """
+    sink = _ChunkSink()
+    try:
+        with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_STORED) as archive:
+            for entry in entries:
+                info = zipfile.ZipInfo(entry.name, date_time=time.localtime(entry.mtime)[:6])
+                info.compress_type = zipfile.ZIP_STORED
+                info.file_size = entry.size  # 4GB 이상이면 ZIP64 헤더 사용
+
+                with archive.open(info, 'w') as dest:
+                    while True:
+                        chunk = entry.file.read(chunk_size)
+                        if not chunk:
+                            break
+                        dest.write(chunk)
+                        yield sink.drain()
+
+        # 데이터 디스크립터 + 중앙 디렉토리
+        tail = sink.drain()
+        if tail:
+            yield tail
+    finally:
+        for entry in entries:
+            entry.file.close()
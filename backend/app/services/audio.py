@@ -1,101 +1,138 @@
 from mutagen.mp3 import MP3
+from mutagen.mp4 import MP4, MP4Cover
+from mutagen.oggopus import OggOpus
+from mutagen.flac import Picture
 from mutagen.id3 import ID3, APIC, TIT2, TPE1, TALB
-import requests
-import asyncio
 from typing import Optional, Dict
+import asyncio
+import base64
+import os
+
+from app.services import tracing
 
 
 class AudioService:
     @staticmethod
     async def embed_cover_image(
         audio_path: str,
-        thumbnail_url: str,
-        metadata: Optional[Dict] = None
+        thumbnail_data: bytes,
+        metadata: Optional[Dict] = None,
+        mime: str = 'image/jpeg'
     ) -> None:
         """
-        MP3 파일에 커버 이미지 및 메타데이터 삽입
+        음원 파일에 커버 이미지 및 메타데이터 삽입 (MP3/M4A/Opus, 확장자로 컨테이너 판단)
 
         Args:
-            audio_path: MP3 file path
-            thumbnail_url: Thumbnail image URL
+            audio_path: Audio file path (.mp3, .m4a, .opus)
+            thumbnail_data: Cover image data (thumbnail_service.get_cover 결과)
             metadata: Optional metadata (title, artist, album)
+            mime: Cover image MIME type
 
         Raises:
             Exception: If embedding fails
         """
-        try:
-            # 썸네일 다운로드
-            loop = asyncio.get_event_loop()
-            thumbnail_data = await loop.run_in_executor(
-                None,
-                AudioService._download_thumbnail,
-                thumbnail_url
-            )
-
-            # MP3 파일 열기
-            audio = MP3(audio_path, ID3=ID3)
-
-            # ID3 태그가 없으면 생성
-            if audio.tags is None:
-                audio.add_tags()
-
-            # 기존 APIC (앨범 아트) 제거
-            audio.tags.delall('APIC')
-
-            # 커버 이미지 삽입
-            audio.tags.add(
-                APIC(
-                    encoding=3,  # UTF-8
-                    mime='image/jpeg',  # MIME type
-                    type=3,  # Cover (front)
-                    desc='Cover',
-                    data=thumbnail_data
+        ext = os.path.splitext(audio_path)[1].lower()
+
+        if ext == '.m4a':
+            tag = AudioService._tag_mp4
+        elif ext in ('.opus', '.ogg'):
+            tag = AudioService._tag_ogg
+        else:
+            tag = AudioService._tag_mp3
+
+        with tracing.span('audio.embed', format=ext.lstrip('.'), cover_bytes=len(thumbnail_data)):
+            try:
+                # 태그 저장은 파일을 다시 쓰므로 스레드에서 실행 (작업 프로파일이 켜져 있으면 함께 측정)
+                await asyncio.get_running_loop().run_in_executor(
+                    None, tracing.bind(tag), audio_path, thumbnail_data, metadata or {}, mime
                 )
-            )
+            except Exception as e:
+                raise Exception(f'커버 이미지 삽입 실패: {str(e)}')
 
-            # 메타데이터 추가 (옵션)
-            if metadata:
-                if 'title' in metadata:
-                    # 기존 타이틀 제거 후 추가
-                    audio.tags.delall('TIT2')
-                    audio.tags.add(TIT2(encoding=3, text=metadata['title']))
+    @staticmethod
+    def _tag_mp3(audio_path: str, thumbnail_data: bytes, metadata: Dict, mime: str) -> None:
+        """MP3 (ID3) 태그"""
+        # MP3 파일 열기
+        audio = MP3(audio_path, ID3=ID3)
+
+        # ID3 태그가 없으면 생성
+        if audio.tags is None:
+            audio.add_tags()
+
+        # 기존 APIC (앨범 아트) 제거
+        audio.tags.delall('APIC')
+
+        # 커버 이미지 삽입
+        audio.tags.add(
+            APIC(
+                encoding=3,  # UTF-8
+                mime=mime,  # MIME type
+                type=3,  # Cover (front)
+                desc='Cover',
+                data=thumbnail_data
+            )
+        )
 
-                if 'artist' in metadata:
-                    # 기존 아티스트 제거 후 추가
-                    audio.tags.delall('TPE1')
-                    audio.tags.add(TPE1(encoding=3, text=metadata['artist']))
+        # 메타데이터 추가 (옵션)
+        if 'title' in metadata:
+            # 기존 타이틀 제거 후 추가
+            audio.tags.delall('TIT2')
+            audio.tags.add(TIT2(encoding=3, text=metadata['title']))
 
-                if 'album' in metadata:
-                    # 기존 앨범 제거 후 추가
-                    audio.tags.delall('TALB')
-                    audio.tags.add(TALB(encoding=3, text=metadata['album']))
+        if 'artist' in metadata:
+            # 기존 아티스트 제거 후 추가
+            audio.tags.delall('TPE1')
+            audio.tags.add(TPE1(encoding=3, text=metadata['artist']))
 
-            # 저장
-            audio.save()
+        if 'album' in metadata:
+            # 기존 앨범 제거 후 추가
+            audio.tags.delall('TALB')
+            audio.tags.add(TALB(encoding=3, text=metadata['album']))
 
-        except Exception as e:
-            raise Exception(f'커버 이미지 삽입 실패: {str(e)}')
+        # 저장
+        audio.save()
 
     @staticmethod
-    def _download_thumbnail(url: str) -> bytes:
-        """
-        썸네일 다운로드 (동기 함수)
+    def _tag_mp4(audio_path: str, thumbnail_data: bytes, metadata: Dict, mime: str) -> None:
+        """M4A (MP4 atom) 태그"""
+        audio = MP4(audio_path)
+        if audio.tags is None:
+            audio.add_tags()
 
-        Args:
-            url: Thumbnail URL
+        # MP4 커버는 JPEG/PNG만 지원
+        image_format = MP4Cover.FORMAT_PNG if mime == 'image/png' else MP4Cover.FORMAT_JPEG
+        audio.tags['covr'] = [MP4Cover(thumbnail_data, imageformat=image_format)]
 
-        Returns:
-            Image data as bytes
+        if 'title' in metadata:
+            audio.tags['\xa9nam'] = [metadata['title']]
+        if 'artist' in metadata:
+            audio.tags['\xa9ART'] = [metadata['artist']]
+        if 'album' in metadata:
+            audio.tags['\xa9alb'] = [metadata['album']]
 
-        Raises:
-            Exception: If download fails
-        """
-        try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            return response.content
-        except Exception as e:
-            raise Exception(f'썸네일 다운로드 실패: {str(e)}')
+        audio.save()
+
+    @staticmethod
+    def _tag_ogg(audio_path: str, thumbnail_data: bytes, metadata: Dict, mime: str) -> None:
+        """Opus (Vorbis comment) 태그"""
+        audio = OggOpus(audio_path)
+
+        # 커버는 FLAC Picture 블록을 base64로 인코딩해 저장 (Vorbis comment 표준)
+        picture = Picture()
+        picture.type = 3  # Cover (front)
+        picture.mime = mime
+        picture.desc = 'Cover'
+        picture.data = thumbnail_data
+        audio['metadata_block_picture'] = [base64.b64encode(picture.write()).decode('ascii')]
+
+        if 'title' in metadata:
+            audio['title'] = [metadata['title']]
+        if 'artist' in metadata:
+            audio['artist'] = [metadata['artist']]
+        if 'album' in metadata:
+            audio['album'] = [metadata['album']]
+
+        audio.save()
 
 
 # 싱글톤 인스턴스
@@ -0,0 +1,126 @@
+from typing import AsyncGenerator, Dict, List
+import asyncio
+
+from app.core.config import settings
+from app.services.pipeline import error_event, extract_to_session
+
+
+async def run_batch(entries: List[Dict], audio_format: str, profile: bool = False) -> AsyncGenerator[Dict, None]:
+    """
+    여러 영상을 제한된 동시성으로 추출하고 진행 상황을 하나의 이벤트 스트림으로 합침
+
+    - 영상마다 extract_to_session()을 실행 (캐시/진행 중인 작업 합류/대기열은 단일 추출과 동일)
+    - 동시에 BATCH_CONCURRENCY개까지만 실행하고 나머지는 순서대로 대기
+    - 한 영상의 실패는 해당 항목의 에러로만 보고하고 나머지는 계속 진행
+    - 생성기가 중간에 닫히면 (클라이언트 연결 종료) 진행 중인 항목을 모두 취소
+
+    Args:
+        entries: youtube_service.resolve_entries() 결과
+        audio_format: 출력 포맷 (mp3, m4a, opus)
+        profile: 항목마다 새로 시작한 작업을 cProfile로 측정
+
+    Yields:
+        resolved (항목 목록) → item (항목별 진행, 전체 진행률 포함) → complete (결과 요약)
+    """
+    total = len(entries)
+    items = [
+        {
+            'index': index,
+            'video_id': entry['video_id'],
+            'title': entry.get('title'),
+            'status': 'pending',
+            'progress': 0,
+            'session_id': None,
+            'suggested_filename': None,
+            'error': None
+        }
+        for index, entry in enumerate(entries)
+    ]
+    events: asyncio.Queue = asyncio.Queue()
+    semaphore = asyncio.Semaphore(settings.BATCH_CONCURRENCY)
+
+    async def run_item(item: Dict, url: str) -> None:
+        try:
+            async with semaphore:
+                try:
+                    async for event in extract_to_session(url, audio_format, profile=profile):
+                        events.put_nowait((item, event))
+                except Exception as e:
+                    events.put_nowait((item, error_event(e)))
+        finally:
+            events.put_nowait((item, None))
+
+    yield {
+        'step': 'resolved',
+        'progress': 0,
+        'message': f'영상 {total}개 추출 시작',
+        'total': total,
+        'items': [{'index': item['index'], 'video_id': item['video_id'], 'title': item['title']} for item in items]
+    }
+
+    tasks = [
+        asyncio.create_task(run_item(item, entry['url']))
+        for item, entry in zip(items, entries)
+    ]
+    remaining = total
+
+    try:
+        while remaining:
+            item, event = await events.get()
+            if event is None:
+                remaining -= 1
+                continue
+
+            if event['step'] == 'complete':
+                item['status'] = 'completed'
+                item['progress'] = 100
+                item['session_id'] = event['session_id']
+                item['suggested_filename'] = event['preview']['suggested_filename']
+                item['title'] = event['preview']['original_title']
+            elif event['step'] == 'error':
+                item['status'] = 'failed'
+                item['progress'] = 100  # 전체 진행률 계산에서는 끝난 항목으로 취급
+                item['error'] = event['message']
+            else:
+                item['status'] = 'running'
+                item['progress'] = event['progress']
+
+            yield {
+                **event,
+                'step': 'item',
+                'item_step': event['step'],
+                'item_progress': event['progress'] if event['step'] != 'error' else 0,
+                'index': item['index'],
+                'video_id': item['video_id'],
+                'progress': sum(i['progress'] for i in items) // total,
+                'completed': sum(1 for i in items if i['status'] == 'completed'),
+                'failed': sum(1 for i in items if i['status'] == 'failed'),
+                'total': total
+            }
+    finally:
+        # 연결이 끊긴 경우: 남은 항목 취소 (각 항목은 공유 작업에서 빠지고, 마지막 대기자면 작업도 취소됨)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    completed = [item for item in items if item['status'] == 'completed']
+    yield {
+        'step': 'complete',
+        'progress': 100,
+        'message': f'{len(completed)}/{total}개 완료',
+        'total': total,
+        'completed': len(completed),
+        'failed': total - len(completed),
+        'session_ids': [item['session_id'] for item in completed],
+        'items': [
+            {
+                'index': item['index'],
+                'video_id': item['video_id'],
+                'title': item['title'],
+                'session_id': item['session_id'],
+                'suggested_filename': item['suggested_filename'],
+                'error': item['error']
+            }
+            for item in items
+        ]
+    }
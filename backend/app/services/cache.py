@@ -0,0 +1,317 @@
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import os
+import shutil
+import threading
+import time
+import uuid
+
+from app.core.config import settings
+
+
+def link_file(src: str, dst: str) -> None:
+    """
+    파일을 하드링크로 연결 (실패 시 복사)
+
+    하드링크는 inode를 공유하므로 한쪽 경로를 삭제해도 다른 경로의 파일은 유지된다.
+
+    Args:
+        src: 원본 파일 경로
+        dst: 대상 파일 경로
+    """
+    try:
+        os.link(src, dst)
+    except OSError:
+        # 다른 파일시스템이거나 하드링크 미지원
+        shutil.copyfile(src, dst)
+
+
+class AudioCache:
+    """
+    완성된 음원 파일 캐시 (디스크 기반, LRU)
+
+    캐시 디렉토리가 기준이고 인덱스는 그 사본이다. 같은 디렉토리를 쓰는 여러 워커는
+    서로 등록한 항목을 조회 시 인덱스에 반영하고, 등록 시 디렉토리를 다시 색인해
+    AUDIO_CACHE_MAX_MB를 워커 전체 합계로 지킨다 (LRU 순서는 파일 수정 시각으로 공유).
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[str, int]" = OrderedDict()  # 파일명 -> 크기 (오래된 순)
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def make_key(video_id: str, audio_format: str, bitrate: int) -> str:
+        """캐시 키 (= 캐시 파일명) 생성"""
+        return f"{video_id}_{bitrate}k.{audio_format}"
+
+    def contains(self, video_id: str, audio_format: str, bitrate: int) -> bool:
+        """캐시 항목 존재 여부 (히트/미스 통계에 반영하지 않음, 다른 워커가 등록한 항목 포함)"""
+        key = self.make_key(video_id, audio_format, bitrate)
+        return key in self.entries or self._adopt(key)
+
+    def fetch(self, video_id: str, audio_format: str, bitrate: int, dest_path: str) -> bool:
+        """
+        캐시된 음원을 dest_path에 연결
+
+        Args:
+            video_id: YouTube video ID
+            audio_format: 음원 포맷 (mp3 등)
+            bitrate: 비트레이트 (kbps)
+            dest_path: 세션 파일 경로
+
+        Returns:
+            True if cache hit, False otherwise
+        """
+        key = self.make_key(video_id, audio_format, bitrate)
+        cache_path = os.path.join(self.cache_dir, key)
+
+        with self._lock:
+            indexed = key in self.entries
+        if not indexed and not self._adopt(key):
+            with self._lock:
+                self.misses += 1
+            return False
+
+        # 하드링크가 안 되면 전체 복사이므로 잠금 밖에서 연결 (다른 조회/등록/삭제를 막지 않음)
+        try:
+            link_file(cache_path, dest_path)
+        except OSError:
+            # 연결 전에 (다른 워커 포함) 삭제됐거나 복사 실패 (부분 파일 제거)
+            if os.path.exists(dest_path):
+                os.remove(dest_path)
+            with self._lock:
+                if not os.path.exists(cache_path):
+                    self._forget(key)
+                self.misses += 1
+            return False
+
+        with self._lock:
+            # 연결 중에 삭제된 항목은 다시 등록하지 않음 (연결된 파일은 열어 둔 inode 기준이라 온전함)
+            if key in self.entries:
+                self.entries.move_to_end(key)
+            self.hits += 1
+
+        # 재시작 후와 다른 워커에서도 LRU 순서를 유지하기 위해 수정 시간 갱신
+        try:
+            os.utime(cache_path)
+        except OSError:
+            pass
+
+        return True
+
+    def store(self, video_id: str, audio_format: str, bitrate: int, src_path: str) -> None:
+        """
+        완성된 음원을 캐시에 등록
+
+        Args:
+            video_id: YouTube video ID
+            audio_format: 음원 포맷 (mp3 등)
+            bitrate: 비트레이트 (kbps)
+            src_path: 태그까지 완료된 음원 파일 경로
+        """
+        key = self.make_key(video_id, audio_format, bitrate)
+        cache_path = os.path.join(self.cache_dir, key)
+        # 같은 항목을 동시에 등록하는 다른 워커와 임시 파일이 겹치지 않도록 고유한 이름 사용
+        tmp_path = f"{cache_path}.{uuid.uuid4().hex}.tmp"
+
+        size = os.path.getsize(src_path)
+        if size > self.max_bytes:
+            return
+
+        try:
+            link_file(src_path, tmp_path)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        # 다른 워커의 등록/삭제까지 반영한 뒤 전체 용량 한도 적용
+        self._sync(evict=True)
+
+    def evict_oldest(self) -> Optional[Tuple[int, Optional[Tuple[int, int]]]]:
+        """
+        가장 오래 사용되지 않은 항목 삭제 (용량 부족 시 StorageManager가 호출)
+
+        Returns:
+            (회수된 바이트 수, 삭제한 파일의 (st_dev, st_ino)), 캐시가 비었으면 None
+            세션이 같은 inode를 쓰고 있으면 회수된 바이트는 0 (그 세션은 이제 단독 파일)
+        """
+        if not self.entries:
+            # 다른 워커가 등록한 항목이 남아 있을 수 있음
+            self._sync()
+
+        with self._lock:
+            if not self.entries:
+                return None
+            key, size = self.entries.popitem(last=False)
+            self.total_bytes -= size
+            cache_path = os.path.join(self.cache_dir, key)
+            try:
+                stat_result = os.stat(cache_path)
+                os.remove(cache_path)
+            except FileNotFoundError:
+                return 0, None
+        reclaimed = size if stat_result.st_nlink == 1 else 0
+        return reclaimed, (stat_result.st_dev, stat_result.st_ino)
+
+    def get_stats(self) -> Dict:
+        """캐시 상태"""
+        total = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / total, 3) if total else 0.0
+        }
+
+    def _load_index(self) -> None:
+        """디스크의 캐시 파일로 인덱스 복원 (오래된 임시 파일 정리)"""
+        now = time.time()
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                # 다른 워커가 등록 중인 임시 파일은 남겨 둔다
+                if entry.name.endswith('.tmp') and entry.is_file():
+                    try:
+                        if now - entry.stat().st_mtime > settings.ORPHAN_PARTIAL_AGE_SECONDS:
+                            os.remove(entry.path)
+                    except FileNotFoundError:
+                        pass
+
+        self._sync(evict=True)
+
+    def _sync(self, evict: bool = False) -> None:
+        """
+        캐시 디렉토리를 다시 색인해 인덱스 교체 (수정 시간 순)
+
+        Args:
+            evict: 색인 후 용량 초과분 삭제 여부
+        """
+        files = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith('.tmp'):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue  # 색인 중에 다른 워커가 삭제
+                files.append((stat.st_mtime, entry.name, stat.st_size))
+
+        with self._lock:
+            self.entries = OrderedDict((name, size) for _, name, size in sorted(files))
+            self.total_bytes = sum(self.entries.values())
+            if evict:
+                self._evict()
+
+    def _adopt(self, key: str) -> bool:
+        """
+        다른 워커가 등록한 캐시 파일을 인덱스에 추가
+
+        Returns:
+            True if the cache file exists
+        """
+        try:
+            size = os.path.getsize(os.path.join(self.cache_dir, key))
+        except OSError:
+            return False
+
+        with self._lock:
+            if key not in self.entries:
+                self.entries[key] = size
+                self.total_bytes += size
+        return True
+
+    def _forget(self, key: str) -> None:
+        """인덱스에서 항목 제거 (파일은 유지)"""
+        size = self.entries.pop(key, None)
+        if size is not None:
+            self.total_bytes -= size
+
+    def _evict(self) -> None:
+        """용량 초과 시 가장 오래 사용되지 않은 항목부터 삭제"""
+        while self.total_bytes > self.max_bytes and self.entries:
+            key, size = self.entries.popitem(last=False)
+            self.total_bytes -= size
+            # 세션 파일은 별도 하드링크이므로 캐시 파일만 삭제된다
+            try:
+                os.remove(os.path.join(self.cache_dir, key))
+            except FileNotFoundError:
+                pass
+
+
+class TTLCache:
+    """만료 시간이 있는 인메모리 LRU 캐시"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()  # 키 -> (만료 시각, 값)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        캐시 조회
+
+        Returns:
+            Cached value or None if missing/expired
+        """
+        with self._lock:
+            item = self.entries.get(key)
+            if item is None or item[0] <= time.monotonic():
+                if item is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """
+        캐시 저장
+
+        Args:
+            key: 캐시 키
+            value: 저장할 값
+            ttl_seconds: 항목별 TTL (기본값: 캐시 TTL)
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self.entries[key] = (time.monotonic() + ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def get_stats(self) -> Dict:
+        """캐시 상태"""
+        total = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / total, 3) if total else 0.0
+        }
+
+
+# 싱글톤 인스턴스
+audio_cache = AudioCache(
+    settings.audio_cache_path,
+    settings.AUDIO_CACHE_MAX_MB * 1024 * 1024
+)
@@ -0,0 +1,82 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List
+import os
+import threading
+import time
+
+from app.core.config import settings
+
+
+class InstrumentedExecutor(ThreadPoolExecutor):
+    """대기열 길이, 실행 중인 작업 수, 대기 시간을 측정하는 ThreadPoolExecutor"""
+
+    def __init__(self, name: str, max_workers: int):
+        super().__init__(max_workers=max_workers, thread_name_prefix=name)
+        self.name = name
+        self.max_workers = max_workers
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._stats_lock = threading.Lock()
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        submitted_at = time.monotonic()
+
+        def run():
+            wait = time.monotonic() - submitted_at
+            with self._stats_lock:
+                self.queued -= 1
+                self.active += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._stats_lock:
+                    self.active -= 1
+                    self.completed += 1
+
+        with self._stats_lock:
+            self.queued += 1
+        future = super().submit(run)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future: Future) -> None:
+        # 실행 전에 취소된 작업은 대기열에서만 제거
+        if future.cancelled():
+            with self._stats_lock:
+                self.queued -= 1
+
+    def get_stats(self) -> Dict:
+        """풀 상태 (saturated: 모든 워커가 바쁘고 대기 작업이 있음)"""
+        with self._stats_lock:
+            started = self.completed + self.active
+            return {
+                'name': self.name,
+                'max_workers': self.max_workers,
+                'active': self.active,
+                'queued': self.queued,
+                'completed': self.completed,
+                'avg_wait_ms': round(self.total_wait / started * 1000, 1) if started else 0.0,
+                'max_wait_ms': round(self.max_wait * 1000, 1),
+                'saturated': self.active >= self.max_workers and self.queued > 0
+            }
+
+
+# 용도별 스레드 풀 (짧은 메타데이터 조회가 긴 다운로드 뒤에서 기다리지 않도록 분리)
+metadata_executor = InstrumentedExecutor('metadata', settings.METADATA_WORKERS)
+download_executor = InstrumentedExecutor('download', settings.DOWNLOAD_WORKERS)
+thumbnail_executor = InstrumentedExecutor('thumbnail', settings.THUMBNAIL_WORKERS)
+# FFmpeg 자식 프로세스를 관리하는 풀 (CPU 코어 수만큼 동시 인코딩)
+transcode_executor = InstrumentedExecutor('transcode', settings.TRANSCODE_WORKERS or os.cpu_count() or 1)
+
+
+def get_executor_stats() -> List[Dict]:
+    """모든 풀 상태"""
+    return [
+        executor.get_stats()
+        for executor in (metadata_executor, download_executor, thumbnail_executor, transcode_executor)
+    ]
@@ -0,0 +1,29 @@
+from requests.adapters import HTTPAdapter
+import requests
+
+from app.core.config import settings
+
+
+def create_http_session(pool_size: int) -> requests.Session:
+    """
+    keep-alive 커넥션 풀을 사용하는 HTTP 세션 생성
+
+    Args:
+        pool_size: 호스트당 최대 유지 커넥션 수
+
+    Returns:
+        requests.Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['User-Agent'] = (
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+        '(KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36'
+    )
+    return session
+
+
+# 싱글톤 인스턴스 (썸네일 등 외부 HTTP 요청에서 공유)
+http_session = create_http_session(settings.HTTP_POOL_SIZE)
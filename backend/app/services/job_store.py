@@ -0,0 +1,260 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, Optional, Set
+import os
+import socket
+import sqlite3
+import threading
+import uuid
+
+from app.core.config import settings
+
+# 작업 상태
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_COMPLETED = 'completed'
+JOB_FAILED = 'failed'
+JOB_CANCELLED = 'cancelled'
+
+FINISHED_STATUSES = (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+
+class JobStore(ABC):
+    """작업 상태 저장소 인터페이스"""
+
+    @abstractmethod
+    def create(self, job_id: str, key: str) -> None:
+        """새 작업 등록 (queued 상태)"""
+
+    @abstractmethod
+    def update(self, job_id: str, status: str, error: Optional[str] = None) -> None:
+        """작업 상태 변경 (시작/종료 시각 자동 기록)"""
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Dict]:
+        """작업 조회"""
+
+    @abstractmethod
+    def active_ids(self) -> Set[str]:
+        """대기/실행 중인 작업 ID (저장소를 공유하는 다른 프로세스의 작업 포함)"""
+
+    @abstractmethod
+    def recover(self) -> int:
+        """
+        종료된 프로세스가 끝내지 못한 작업을 실패 처리 (실행 중인 다른 프로세스의 작업은 유지)
+
+        Returns:
+            Number of interrupted jobs
+        """
+
+    @abstractmethod
+    def purge(self, older_than: datetime) -> int:
+        """
+        종료된 오래된 작업 기록 삭제
+
+        Returns:
+            Number of purged jobs
+        """
+
+
+class InMemoryJobStore(JobStore):
+    """인메모리 작업 저장소 (프로세스 재시작 시 초기화)"""
+
+    def __init__(self):
+        self.jobs: Dict[str, Dict] = {}
+
+    def create(self, job_id: str, key: str) -> None:
+        self.jobs[job_id] = {
+            'job_id': job_id,
+            'key': key,
+            'status': JOB_QUEUED,
+            'error': None,
+            'created_at': datetime.now(),
+            'started_at': None,
+            'finished_at': None
+        }
+
+    def update(self, job_id: str, status: str, error: Optional[str] = None) -> None:
+        job = self.jobs.get(job_id)
+        if job is None:
+            return
+
+        job['status'] = status
+        job['error'] = error
+        if status == JOB_RUNNING:
+            job['started_at'] = datetime.now()
+        elif status in FINISHED_STATUSES:
+            job['finished_at'] = datetime.now()
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        job = self.jobs.get(job_id)
+        return dict(job) if job else None
+
+    def active_ids(self) -> Set[str]:
+        return {job_id for job_id, job in self.jobs.items() if job['status'] not in FINISHED_STATUSES}
+
+    def recover(self) -> int:
+        return 0
+
+    def purge(self, older_than: datetime) -> int:
+        expired = [
+            job_id for job_id, job in self.jobs.items()
+            if job['status'] in FINISHED_STATUSES and job['finished_at'] < older_than
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+        return len(expired)
+
+
+def _pid_alive(pid: int) -> bool:
+    """같은 호스트의 프로세스가 살아 있는지 확인"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # 다른 사용자의 프로세스
+    return True
+
+
+class SQLiteJobStore(JobStore):
+    """
+    SQLite 작업 저장소 (재시작 후에도 작업 기록 유지, 한 호스트의 여러 워커가 공유 가능)
+
+    작업마다 만든 프로세스(호스트, PID, 저장소 인스턴스 ID)를 기록해
+    recover()가 종료된 프로세스의 작업만 실패 처리한다.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.host = socket.gethostname()
+        self.pid = os.getpid()
+        self.instance_id = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                key TEXT NOT NULL,
+                status TEXT NOT NULL,
+                error TEXT,
+                created_at TEXT NOT NULL,
+                started_at TEXT,
+                finished_at TEXT,
+                owner_host TEXT,
+                owner_pid INTEGER,
+                owner_id TEXT
+            )
+        ''')
+        # 이전 버전 스키마에 소유자 컬럼 추가 (기존 행은 소유자 없음 = 종료된 프로세스로 간주)
+        columns = {row['name'] for row in self.conn.execute('PRAGMA table_info(jobs)')}
+        for column, column_type in (('owner_host', 'TEXT'), ('owner_pid', 'INTEGER'), ('owner_id', 'TEXT')):
+            if column not in columns:
+                try:
+                    self.conn.execute(f'ALTER TABLE jobs ADD COLUMN {column} {column_type}')
+                except sqlite3.OperationalError:
+                    pass  # 동시에 시작한 다른 워커가 먼저 추가함
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status)')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_finished_at ON jobs (finished_at)')
+
+    def create(self, job_id: str, key: str) -> None:
+        with self._lock:
+            self.conn.execute(
+                'INSERT INTO jobs (job_id, key, status, created_at, owner_host, owner_pid, owner_id) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (job_id, key, JOB_QUEUED, datetime.now().isoformat(), self.host, self.pid, self.instance_id)
+            )
+
+    def update(self, job_id: str, status: str, error: Optional[str] = None) -> None:
+        now = datetime.now().isoformat()
+        with self._lock:
+            if status == JOB_RUNNING:
+                self.conn.execute(
+                    'UPDATE jobs SET status = ?, error = ?, started_at = ? WHERE job_id = ?',
+                    (status, error, now, job_id)
+                )
+            elif status in FINISHED_STATUSES:
+                self.conn.execute(
+                    'UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE job_id = ?',
+                    (status, error, now, job_id)
+                )
+            else:
+                self.conn.execute(
+                    'UPDATE jobs SET status = ?, error = ? WHERE job_id = ?',
+                    (status, error, job_id)
+                )
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT job_id, key, status, error, created_at, started_at, finished_at FROM jobs WHERE job_id = ?',
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        job = dict(row)
+        for field in ('created_at', 'started_at', 'finished_at'):
+            if job[field]:
+                job[field] = datetime.fromisoformat(job[field])
+        return job
+
+    def active_ids(self) -> Set[str]:
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT job_id FROM jobs WHERE status IN (?, ?)',
+                (JOB_QUEUED, JOB_RUNNING)
+            ).fetchall()
+        return {row['job_id'] for row in rows}
+
+    def recover(self) -> int:
+        """
+        종료된 프로세스의 작업만 실패 처리
+
+        - 소유자가 없는 행 (이전 버전이 기록한 작업)
+        - 같은 호스트에서 PID가 더 이상 없는 프로세스의 작업
+        - 같은 PID지만 다른 인스턴스의 작업 (컨테이너 재시작 등으로 PID가 재사용된 경우)
+
+        다른 호스트의 작업은 생존 여부를 알 수 없으므로 그대로 둔다.
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT DISTINCT owner_host, owner_pid, owner_id FROM jobs WHERE status IN (?, ?)',
+                (JOB_QUEUED, JOB_RUNNING)
+            ).fetchall()
+
+            interrupted = 0
+            now = datetime.now().isoformat()
+            for row in rows:
+                if row['owner_id'] == self.instance_id:
+                    continue
+                if row['owner_id'] is not None:
+                    if row['owner_host'] != self.host:
+                        continue
+                    if row['owner_pid'] != self.pid and _pid_alive(row['owner_pid']):
+                        continue
+
+                cursor = self.conn.execute(
+                    'UPDATE jobs SET status = ?, error = ?, finished_at = ? '
+                    'WHERE status IN (?, ?) AND owner_id IS ?',
+                    (JOB_FAILED, 'interrupted', now, JOB_QUEUED, JOB_RUNNING, row['owner_id'])
+                )
+                interrupted += cursor.rowcount
+        return interrupted
+
+    def purge(self, older_than: datetime) -> int:
+        with self._lock:
+            cursor = self.conn.execute(
+                'DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?',
+                (older_than.isoformat(),)
+            )
+        return cursor.rowcount
+
+
+def create_job_store() -> JobStore:
+    """설정에 따른 작업 저장소 생성"""
+    if settings.JOB_STORE == 'sqlite':
+        return SQLiteJobStore(settings.job_store_path)
+    return InMemoryJobStore()
@@ -0,0 +1,523 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from datetime import datetime, timedelta
+import asyncio
+import logging
+import os
+import threading
+import time
+import uuid
+
+from app.core.config import settings
+from app.services import tracing
+from app.services.executors import transcode_executor
+from app.services.job_store import (
+    JobStore, create_job_store,
+    JOB_RUNNING, JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED
+)
+
+logger = logging.getLogger(__name__)
+
+
+class JobCancelledError(Exception):
+    """작업 취소 에러 (대기 중인 모든 요청에 전달)"""
+    pass
+
+
+class QueueFullError(Exception):
+    """작업 대기열이 가득 참 (잠시 후 재시도)"""
+
+    def __init__(self, retry_after: int):
+        super().__init__('요청이 많아 잠시 후 다시 시도해주세요')
+        self.retry_after = retry_after
+
+
+class ExtractionJob:
+    """추출 작업 (동일 영상에 대한 요청들이 공유)"""
+
+    def __init__(self, key: str, runner: Callable[['ExtractionJob'], Awaitable[str]]):
+        self.job_id = str(uuid.uuid4())
+        self.key = key
+        self.runner = runner
+        self.subscribers: list = []
+        self.last_event: Optional[dict] = None
+        self.waiters = 0
+        self.task: Optional[asyncio.Task] = None
+        self.cancel_requested = False
+        # 워커 스레드(yt-dlp 진행 훅, FFmpeg 실행)에서 확인하는 취소 신호
+        self.cancel_event = threading.Event()
+        self.result: asyncio.Future = asyncio.get_running_loop().create_future()
+        # 다운로드 단계 슬롯 보유 여부 (변환 단계로 넘어가면 반납)
+        self.holds_download_slot = False
+
+        # 작업을 만든 요청의 추적 ID와 프로파일 (작업 로그를 요청 로그와 연결)
+        trace = tracing.current()
+        self.trace_id = trace.trace_id if trace else uuid.uuid4().hex
+        self.profile: Optional[tracing.JobProfile] = trace.profile if trace else None
+        self.profile_path: Optional[str] = None
+        self.started_at: Optional[float] = None
+        # 작업 파일 경로 접두사 (job_<job_id>, 결과 파일을 삭제할 때까지 고아 파일 정리에서 제외)
+        self.file_prefix: Optional[str] = None
+
+        # 변환 중인 출력 파일 (재생 스트리밍용, 태그 삽입 전까지만 열 수 있음)
+        self.output_path: Optional[str] = None
+        self.output_size: Optional[int] = None
+        self.output_closed = False
+        self.listeners = 0
+
+    def publish(self, event: dict) -> None:
+        """모든 구독자에게 진행 이벤트 전달"""
+        event = {**event, 'job_id': self.job_id}
+        self.last_event = event
+        for queue in self.subscribers:
+            queue.put_nowait(event)
+
+    def subscribe(self) -> asyncio.Queue:
+        """
+        진행 이벤트 구독
+
+        늦게 합류한 요청도 현재 진행 상황을 바로 받을 수 있도록 마지막 이벤트를 먼저 넣어준다.
+        작업이 끝나면 None이 전달된다.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        if self.last_event is not None:
+            queue.put_nowait(self.last_event)
+        if self.result.done():
+            queue.put_nowait(None)
+        else:
+            self.subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """구독 해제"""
+        if queue in self.subscribers:
+            self.subscribers.remove(queue)
+
+    def raise_if_cancelled(self) -> None:
+        """
+        취소 확인 지점 (파이프라인 단계 사이에서 호출)
+
+        Raises:
+            JobCancelledError: If the job was cancelled
+        """
+        if self.cancel_event.is_set():
+            raise JobCancelledError('작업이 취소되었습니다')
+
+    def open_output(self, path: str) -> None:
+        """변환 출력 파일 공개 (이 시점부터 재생 스트림이 파일을 읽을 수 있음)"""
+        self.output_path = path
+
+    def close_output(self, size: Optional[int]) -> None:
+        """
+        변환 출력 종료 (새 재생 스트림은 태그까지 완료된 결과를 기다림)
+
+        Args:
+            size: 변환이 끝난 파일 크기 (실패 시 None)
+        """
+        self.output_size = size
+        self.output_closed = True
+
+    def _finish(self) -> None:
+        """구독자에게 종료 알림"""
+        for queue in self.subscribers:
+            queue.put_nowait(None)
+        self.subscribers.clear()
+
+
+class JobManager:
+    """
+    추출 작업 대기열
+
+    - 영상별 단일 실행 보장 (single-flight)
+    - 다운로드 단계와 변환 단계의 동시 실행 수를 따로 제한
+      (대기열 순서대로 다운로드 슬롯을 받고, 변환에 들어가면 슬롯을 반납해 다음 작업이 다운로드를 시작)
+    - 대기열이 가득 차면 QueueFullError (Retry-After 포함)
+    - 대기자가 모두 떠나면 (SSE 연결 종료) 유예 시간 뒤 작업 취소
+    """
+
+    def __init__(self, store: JobStore, download_workers: int, transcode_workers: int, max_queue_depth: int):
+        self.store = store
+        self.download_workers = download_workers
+        self.transcode_workers = transcode_workers
+        self.max_queue_depth = max_queue_depth
+        self.jobs: Dict[str, ExtractionJob] = {}  # 키 -> 대기/실행 중인 작업
+        self.pending: List[ExtractionJob] = []  # 대기 순서
+        self.running = 0  # 실행 중인 작업 (모든 단계)
+        self.downloading = 0  # 다운로드 슬롯을 가진 작업
+        self.transcoding = 0  # 변환 중인 작업
+        self.avg_job_seconds = float(settings.JOB_RETRY_AFTER_SECONDS)
+        self._queue: Optional[asyncio.Queue] = None
+        self._download_slots: Optional[asyncio.Semaphore] = None
+        self._transcode_slots: Optional[asyncio.Semaphore] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._run_tasks: Set[asyncio.Task] = set()
+        self._file_jobs: Set[ExtractionJob] = set()  # 작업 파일이 남아 있는 작업 (완료 후 대기자가 연결 중인 작업 포함)
+
+    def start(self) -> None:
+        """디스패처 시작 (앱 시작 시 호출)"""
+        self.recover_interrupted()
+
+        self._queue = asyncio.Queue()
+        self._download_slots = asyncio.Semaphore(self.download_workers)
+        self._transcode_slots = asyncio.Semaphore(self.transcode_workers)
+        self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def stop(self) -> None:
+        """디스패처와 실행 중인 작업 중지, 대기 중인 작업 취소 (앱 종료 시 호출)"""
+        tasks = [self._dispatcher, *self._run_tasks] if self._dispatcher else list(self._run_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._dispatcher = None
+        self._run_tasks.clear()
+
+        for job in list(self.pending):
+            self._complete(job, error=JobCancelledError('서버가 종료되어 작업이 취소되었습니다'))
+        self.pending.clear()
+
+    def retry_after(self) -> int:
+        """대기열이 빌 때까지의 예상 시간 (초)"""
+        backlog = len(self.pending) + self.downloading
+        return max(1, int(self.avg_job_seconds * backlog / max(1, self.download_workers)))
+
+    def check_capacity(self, key: Optional[str] = None) -> None:
+        """
+        새 작업을 받을 수 있는지 확인 (진행 중인 작업에 합류하는 경우는 항상 허용)
+
+        Args:
+            key: 작업 키 (알고 있는 경우)
+
+        Raises:
+            QueueFullError: If the queue is full
+        """
+        if key is not None and key in self.jobs:
+            return
+        if len(self.pending) >= self.max_queue_depth:
+            raise QueueFullError(self.retry_after())
+
+    def attach(
+        self,
+        key: str,
+        runner: Callable[[ExtractionJob], Awaitable[str]]
+    ) -> Tuple[ExtractionJob, bool]:
+        """
+        진행 중인 작업에 합류하거나 새 작업을 대기열에 추가
+
+        Args:
+            key: 작업 키 (영상 ID + 포맷 + 비트레이트)
+            runner: 결과 파일 경로를 반환하는 작업 코루틴 함수
+
+        Returns:
+            (job, created) - created는 새 작업을 추가했는지 여부
+
+        Raises:
+            QueueFullError: If a new job is needed but the queue is full
+        """
+        job = self.jobs.get(key)
+        created = job is None
+
+        if created:
+            self.check_capacity()
+
+            job = ExtractionJob(key, runner)
+            self.jobs[key] = job
+            self.pending.append(job)
+            self.store.create(job.job_id, key)
+            self._publish_positions()
+            self._queue.put_nowait(job)
+
+        job.waiters += 1
+        tracing.event(
+            'job.queued' if created else 'job.joined',
+            job_id=job.job_id,
+            job_trace_id=job.trace_id,
+            key=key,
+            waiters=job.waiters,
+            queued=len(self.pending)
+        )
+        return job, created
+
+    def join(self, job_id: str) -> Optional[ExtractionJob]:
+        """
+        작업 ID로 대기/실행 중인 작업에 합류 (끝난 작업이면 None)
+
+        합류한 경우 사용 후 release()를 호출해야 한다.
+        """
+        for job in self.jobs.values():
+            if job.job_id == job_id:
+                job.waiters += 1
+                return job
+        return None
+
+    def release(self, job: ExtractionJob) -> None:
+        """
+        대기자 해제
+
+        마지막 대기자가 떠나고 작업이 끝났으면 공유 결과 파일을 삭제한다.
+        (각 대기자는 결과 파일을 자신의 세션 경로로 하드링크한 뒤 해제한다)
+        작업이 아직 진행 중이면 JOB_CANCEL_GRACE_SECONDS 뒤에도 대기자가 없을 때 취소한다.
+        """
+        job.waiters -= 1
+        if job.waiters == 0 and not job.result.done():
+            grace = settings.JOB_CANCEL_GRACE_SECONDS
+            if grace > 0:
+                asyncio.get_running_loop().call_later(grace, self._cancel_if_abandoned, job)
+            else:
+                self._cancel_if_abandoned(job)
+        self._discard_result(job)
+
+    def cancel(self, job: ExtractionJob) -> None:
+        """
+        작업 취소
+
+        대기 중인 작업은 즉시 취소하고, 실행 중인 작업은 취소 신호를 보내
+        다운로드(yt-dlp 진행 훅)와 FFmpeg 프로세스를 중단시킨다.
+        파이프라인은 스레드가 멈춘 뒤 부분 파일을 정리하고 JobCancelledError로 끝난다.
+        """
+        if job.result.done():
+            return
+        job.cancel_requested = True
+        job.cancel_event.set()
+
+        if job in self.pending:
+            self.pending.remove(job)
+            self._complete(job, error=JobCancelledError('작업이 취소되었습니다'))
+            self._publish_positions()
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """작업 상태 조회 (대기 중이면 대기 순번 포함)"""
+        record = self.store.get(job_id)
+        if record is None:
+            return None
+
+        for position, job in enumerate(self.pending, start=1):
+            if job.job_id == job_id:
+                record['queue_position'] = position
+                break
+        return record
+
+    def get_stats(self) -> Dict:
+        """대기열 상태"""
+        return {
+            'download_workers': self.download_workers,
+            'transcode_workers': self.transcode_workers,
+            'running': self.running,
+            'downloading': self.downloading,
+            'transcoding': self.transcoding,
+            'queued': len(self.pending),
+            'max_queue_depth': self.max_queue_depth,
+            'avg_job_seconds': round(self.avg_job_seconds, 1)
+        }
+
+    def recover_interrupted(self) -> int:
+        """
+        종료된 프로세스가 끝내지 못한 작업을 실패 처리 (시작 시, 고아 파일 정리 전에 호출)
+
+        SQLite 저장소를 공유하는 다른 워커가 비정상 종료해도 그 작업이 계속 진행 중으로 남아
+        작업 파일이 정리되지 않는 일이 없도록 한다.
+
+        Returns:
+            Number of interrupted jobs
+        """
+        interrupted = self.store.recover()
+        if interrupted:
+            tracing.event('job.recovered', interrupted=interrupted)
+        return interrupted
+
+    def track_files(self, job: ExtractionJob, file_prefix: str) -> None:
+        """
+        작업 파일 경로 접두사 등록 (파이프라인이 파일을 만들기 전에 호출)
+
+        Args:
+            job: 추출 작업
+            file_prefix: 작업 파일 경로 접두사 (<upload_path>/job_<job_id>)
+        """
+        job.file_prefix = file_prefix
+        self._file_jobs.add(job)
+
+    def active_file_prefixes(self) -> Set[str]:
+        """
+        아직 사용 중인 작업 파일명 접두사 (job_<job_id>)
+
+        yt-dlp가 파일 수정 시각을 업로드 시각으로 바꾸거나 오래 걸리는 작업이 있어도
+        고아 파일 정리가 수정 시각만 보고 삭제하지 않도록 한다.
+        이 프로세스의 작업(완료 후 대기자가 연결 중인 작업 포함)과 작업 저장소에서 대기/실행 중인
+        작업을 합친다. SQLite 저장소면 같은 디렉토리를 쓰는 다른 워커의 작업도 포함된다.
+        """
+        prefixes = {os.path.basename(job.file_prefix) for job in self._file_jobs}
+        prefixes.update(f"job_{job_id}" for job_id in self.store.active_ids())
+        return prefixes
+
+    def get_job_count(self) -> int:
+        """대기/실행 중인 작업 수"""
+        return len(self.jobs)
+
+    def purge_finished(self, max_age_hours: int) -> int:
+        """오래된 작업 기록 삭제"""
+        return self.store.purge(datetime.now() - timedelta(hours=max_age_hours))
+
+    @asynccontextmanager
+    async def transcode_stage(self, job: ExtractionJob, release_download: bool = True) -> AsyncIterator[None]:
+        """
+        변환 단계 (변환 슬롯을 받을 때까지 대기, 동시 변환 수 제한)
+
+        release_download가 True면 다운로드 슬롯을 먼저 반납해 느린 변환이 다음 작업의 다운로드를 막지 않는다.
+        다운로드와 변환이 겹치는 스트리밍 파이프라인은 False로 두 슬롯을 함께 사용한다.
+
+        Args:
+            job: 실행 중인 작업
+            release_download: 변환 전에 다운로드 슬롯 반납 여부
+        """
+        if release_download:
+            self._release_download_slot(job)
+
+        if self._transcode_slots.locked():
+            job.publish({
+                'step': 'postprocessing',
+                'progress': settings.PROGRESS_POSTPROCESS_START,
+                'message': '변환 대기 중...'
+            })
+
+        async with self._transcode_slots:
+            self.transcoding += 1
+            try:
+                yield
+            finally:
+                self.transcoding -= 1
+
+    async def _dispatch(self) -> None:
+        """다운로드 슬롯이 빌 때마다 대기열 순서대로 작업 시작"""
+        while True:
+            await self._download_slots.acquire()
+            try:
+                while True:
+                    job = await self._queue.get()
+                    if job in self.pending:
+                        break  # 대기 중 취소된 작업은 건너뜀
+            except BaseException:
+                self._download_slots.release()
+                raise
+
+            self.pending.remove(job)
+            self._publish_positions()
+
+            job.holds_download_slot = True
+            self.downloading += 1
+            self.running += 1
+            task = asyncio.create_task(self._run(job))
+            self._run_tasks.add(task)
+            task.add_done_callback(self._run_tasks.discard)
+
+    def _release_download_slot(self, job: ExtractionJob) -> None:
+        """다운로드 슬롯 반납 (대기열의 다음 작업이 시작됨)"""
+        if job.holds_download_slot:
+            job.holds_download_slot = False
+            self.downloading -= 1
+            self._download_slots.release()
+
+    async def _run(self, job: ExtractionJob) -> None:
+        """작업 실행 후 결과(또는 에러)를 모든 대기자에게 전달"""
+        try:
+            await self._execute(job)
+        finally:
+            self._release_download_slot(job)
+            self.running -= 1
+
+    async def _execute(self, job: ExtractionJob) -> None:
+        """작업 코루틴 실행"""
+        self.store.update(job.job_id, JOB_RUNNING)
+        started = job.started_at = time.monotonic()
+
+        # 작업 태스크는 생성 시점의 컨텍스트를 복사하므로 작업 추적 정보가 파이프라인 전체에 전달됨
+        with tracing.start(job.trace_id, job.job_id, job.profile):
+            tracing.event('job.started', key=job.key, waiters=job.waiters)
+            job.task = asyncio.create_task(job.runner(job))
+        try:
+            result_path = await job.task
+        except asyncio.CancelledError:
+            # 실행 태스크가 취소됨 (앱 종료)
+            self._complete(job, error=JobCancelledError('서버가 종료되어 작업이 취소되었습니다'))
+            raise
+        except Exception as e:
+            if job.cancel_requested and not isinstance(e, JobCancelledError):
+                # 취소 신호로 중단된 다운로드/변환 에러
+                e = JobCancelledError('작업이 취소되었습니다')
+            self._complete(job, error=e)
+            return
+
+        self._complete(job, result_path=result_path)
+
+        # 예상 대기 시간 계산용 이동 평균
+        elapsed = time.monotonic() - started
+        self.avg_job_seconds = self.avg_job_seconds * 0.8 + elapsed * 0.2
+
+    def _complete(
+        self,
+        job: ExtractionJob,
+        result_path: Optional[str] = None,
+        error: Optional[BaseException] = None
+    ) -> None:
+        """작업 결과 확정"""
+        if error is None:
+            job.result.set_result(result_path)
+            self.store.update(job.job_id, JOB_COMPLETED)
+        else:
+            job.result.set_exception(error)
+            # 대기자가 모두 떠난 경우에도 예외 미회수 경고가 나지 않도록 조회
+            job.result.exception()
+            status = JOB_CANCELLED if isinstance(error, JobCancelledError) else JOB_FAILED
+            self.store.update(job.job_id, status, str(error))
+
+        fields = {'status': JOB_COMPLETED if error is None else status}
+        if job.started_at is not None:
+            fields['duration_ms'] = round((time.monotonic() - job.started_at) * 1000, 2)
+        if error is not None:
+            fields['error'] = str(error)[:500]
+            if getattr(error, 'category', None):
+                fields['error_category'] = error.category
+        tracing.event('job.finished', trace_id=job.trace_id, job_id=job.job_id, key=job.key, **fields)
+
+        # 결과가 확정되면 새 요청은 새 작업(또는 캐시)을 사용
+        if self.jobs.get(job.key) is job:
+            del self.jobs[job.key]
+        job._finish()
+        self._discard_result(job)
+
+    def _cancel_if_abandoned(self, job: ExtractionJob) -> None:
+        """유예 시간 동안 다시 합류한 대기자가 없으면 취소"""
+        if job.waiters == 0 and not job.result.done():
+            tracing.event('job.cancelling', trace_id=job.trace_id, job_id=job.job_id, reason='clients_disconnected')
+            self.cancel(job)
+
+    def _publish_positions(self) -> None:
+        """대기 중인 작업에 대기 순번 알림"""
+        for position, job in enumerate(self.pending, start=1):
+            job.publish({
+                'step': 'queued',
+                'progress': settings.PROGRESS_VALIDATION_END,
+                'message': f'대기 중... ({position}번째)',
+                'queue_position': position
+            })
+
+    def _discard_result(self, job: ExtractionJob) -> None:
+        """대기자가 없고 작업이 끝났으면 공유 결과 파일 삭제"""
+        if job.waiters > 0 or not job.result.done():
+            return
+
+        self._file_jobs.discard(job)
+        if job.result.exception() is None:
+            for path in (job.result.result(), job.profile_path):
+                if path and os.path.exists(path):
+                    try:
+                        os.remove(path)
+                    except OSError as e:
+                        logger.warning(f"Failed to delete job file {path}: {e}")
+
+
+# 싱글톤 인스턴스
+job_manager = JobManager(
+    create_job_store(),
+    download_workers=settings.DOWNLOAD_WORKERS,
+    transcode_workers=transcode_executor.max_workers,
+    max_queue_depth=settings.JOB_QUEUE_MAX_DEPTH
+)
@@ -0,0 +1,213 @@
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+import threading
+import time
+
+# 단계별 소요 시간 버킷 (초, 영상 정보 조회 수백 ms ~ 긴 영상 변환 수 분)
+STAGE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+Labels = Tuple[str, ...]
+
+
+class _PerThread:
+    """
+    스레드별 셀 (각 스레드는 자기 셀에만 쓰므로 기록 시 락이 없고, 수집할 때 합산)
+
+    셀 목록은 스레드가 처음 기록할 때 한 번만 락을 잡고 등록한다.
+    스레드 풀 크기가 고정이므로 셀 수도 제한된다.
+    """
+
+    def __init__(self, factory: Callable[[], dict]):
+        self._factory = factory
+        self._local = threading.local()
+        self._cells: List[dict] = []
+        self._lock = threading.Lock()
+
+    def cell(self) -> dict:
+        try:
+            return self._local.cell
+        except AttributeError:
+            cell = self._factory()
+            with self._lock:
+                self._cells.append(cell)
+            self._local.cell = cell
+            return cell
+
+    def snapshot(self) -> List[dict]:
+        """모든 셀의 복사본 (dict 복사는 GIL 아래에서 원자적)"""
+        with self._lock:
+            cells = list(self._cells)
+        return [dict(cell) for cell in cells]
+
+
+class Counter:
+    """단조 증가 카운터 (Prometheus counter)"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._cells = _PerThread(dict)
+
+    def inc(self, amount: float = 1, labels: Labels = ()) -> None:
+        cell = self._cells.cell()
+        cell[labels] = cell.get(labels, 0) + amount
+
+    def values(self) -> Dict[Labels, float]:
+        totals: Dict[Labels, float] = {}
+        for cell in self._cells.snapshot():
+            for labels, value in cell.items():
+                totals[labels] = totals.get(labels, 0) + value
+        return totals
+
+    def collect(self) -> List[str]:
+        lines = _header(self.name, self.documentation, 'counter')
+        values = self.values()
+        if not values and not self.labelnames:
+            values = {(): 0}
+        for labels, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """구간별 분포 (Prometheus histogram, 버킷 카운트는 수집할 때 누적)"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = STAGE_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._cells = _PerThread(dict)
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        cell = self._cells.cell()
+        series = cell.get(labels)
+        if series is None:
+            # [버킷별 카운트..., +Inf, 합계]
+            series = cell[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def time(self, labels: Labels = ()) -> '_Timer':
+        """with 블록의 소요 시간 기록 (예외가 나도 기록)"""
+        return _Timer(self, labels)
+
+    def collect(self) -> List[str]:
+        totals: Dict[Labels, List[float]] = {}
+        for cell in self._cells.snapshot():
+            for labels, series in cell.items():
+                series = list(series)
+                total = totals.get(labels)
+                if total is None:
+                    totals[labels] = series
+                else:
+                    for i, value in enumerate(series):
+                        total[i] += value
+
+        lines = _header(self.name, self.documentation, 'histogram')
+        for labels, series in sorted(totals.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else _format_value(bound)
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames + ('le',), labels + (le,))} {cumulative}"
+                )
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class _Timer:
+    def __init__(self, histogram: Histogram, labels: Labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self) -> '_Timer':
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.histogram.observe(time.perf_counter() - self.started, self.labels)
+
+
+def gauge_family(
+    name: str,
+    documentation: str,
+    samples: Iterable[Tuple[Dict[str, str], float]],
+    kind: str = 'gauge'
+) -> List[str]:
+    """
+    수집 시점에 읽는 값 (대기열 길이, 캐시 적중 수 등 서비스가 이미 가진 상태)
+
+    Args:
+        name: 메트릭 이름
+        documentation: 설명
+        samples: (레이블, 값) 목록
+        kind: gauge 또는 counter
+    """
+    lines = _header(name, documentation, kind)
+    for labels, value in samples:
+        lines.append(f"{name}{_format_labels(tuple(labels), tuple(labels.values()))} {_format_value(value)}")
+    return lines
+
+
+def render(families: Iterable[List[str]]) -> str:
+    """Prometheus 텍스트 포맷 (0.0.4)"""
+    lines = [line for family in families for line in family]
+    return '\n'.join(lines) + '\n'
+
+
+def _header(name: str, documentation: str, kind: str) -> List[str]:
+    return [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    if not names:
+        return ''
+    pairs = ','.join(
+        f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)
+    )
+    return '{' + pairs + '}'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+# 파이프라인/전송 메트릭 (기록은 스레드별 셀에 락 없이)
+stage_seconds = Histogram(
+    'ytaudio_stage_duration_seconds',
+    'Extraction pipeline stage latency (info, download, transcode, stream, thumbnail, embed, total)',
+    labelnames=('stage',)
+)
+bytes_downloaded = Counter(
+    'ytaudio_downloaded_bytes_total',
+    'Source audio bytes downloaded from YouTube'
+)
+bytes_served = Counter(
+    'ytaudio_served_bytes_total',
+    'Audio bytes sent to clients',
+    labelnames=('endpoint',)
+)
+errors = Counter(
+    'ytaudio_errors_total',
+    'Extraction errors reported to clients by category',
+    labelnames=('category',)
+)
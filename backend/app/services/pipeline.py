@@ -0,0 +1,608 @@
+from typing import AsyncGenerator, Dict, Optional
+import asyncio
+import functools
+import glob
+import os
+import shutil
+import time
+import uuid
+
+from app.core.config import settings
+from app.services import metrics, tracing
+from app.services.youtube import youtube_service, VideoError
+from app.services.audio import audio_service
+from app.services.thumbnail import thumbnail_service
+from app.services.transcode import CODECS, transcode_service
+from app.services.cache import audio_cache, link_file
+from app.services.jobs import ExtractionJob, JobCancelledError, QueueFullError, job_manager
+from app.services.progress import ProgressBridge
+from app.services.session import session_manager
+from app.services.storage import storage_manager
+from app.utils.sanitize import parse_cover_filename
+
+
+def _make_download_callback(bridge: ProgressBridge):
+    """yt-dlp 진행 정보를 SSE 이벤트로 변환하는 콜백 (워커 스레드에서 호출)"""
+    last_progress = -1
+
+    def progress_callback(data: Dict) -> None:
+        nonlocal last_progress
+
+        # yt-dlp progress를 다운로드 진행률 범위로 매핑
+        progress_range = settings.PROGRESS_POSTPROCESS_START - settings.PROGRESS_DOWNLOAD_START
+        mapped_progress = int(settings.PROGRESS_DOWNLOAD_START + data['percent'] * progress_range / 100)
+
+        # 변화가 있을 때만 업데이트 (노이즈 감소)
+        if mapped_progress == last_progress:
+            return
+        last_progress = mapped_progress
+
+        bridge.push({
+            'step': 'downloading',
+            'progress': mapped_progress,
+            'message': f"음원 다운로드 중... {data['percent']:.0f}%",
+            'percent': round(data['percent'], 1),
+            'downloaded_bytes': data['downloaded_bytes'],
+            'total_bytes': data['total_bytes'],
+            'speed': data['speed'],
+            'eta': data['eta']
+        })
+
+    return progress_callback
+
+
+def _make_transcode_callback(bridge: ProgressBridge):
+    """FFmpeg 진행률을 SSE 이벤트로 변환하는 콜백 (워커 스레드에서 호출)"""
+    last_progress = -1
+
+    def progress_callback(percent: float) -> None:
+        nonlocal last_progress
+
+        progress_range = settings.PROGRESS_DOWNLOAD_END - settings.PROGRESS_POSTPROCESS_START
+        mapped_progress = int(settings.PROGRESS_POSTPROCESS_START + percent * progress_range / 100)
+
+        if mapped_progress == last_progress:
+            return
+        last_progress = mapped_progress
+
+        bridge.push({
+            'step': 'postprocessing',
+            'progress': mapped_progress,
+            'message': f"음원 변환 중... {percent:.0f}%",
+            'percent': round(percent, 1)
+        })
+
+    return progress_callback
+
+
+def _create_bridge(job: ExtractionJob) -> ProgressBridge:
+    """워커 스레드의 진행 이벤트를 이벤트 루프로 전달하는 브리지"""
+    return ProgressBridge(
+        asyncio.get_running_loop(),
+        job.publish,
+        min_interval=settings.PROGRESS_EVENT_INTERVAL
+    )
+
+
+async def run_extraction(
+    job: ExtractionJob,
+    youtube_url: str,
+    video_info: Dict,
+    audio_format: str
+) -> str:
+    """
+    음원 추출 파이프라인 (다운로드 → 변환 → 썸네일 → 커버 삽입 → 캐시 등록)
+
+    진행 상황은 job.publish()로 모든 대기자에게 전달된다.
+    원본 코덱이 요청 포맷과 같으면 변환 단계는 재인코딩 없이 리먹스만 한다.
+    작업이 취소되면 다운로드/변환을 중단하고 부분 파일을 정리한다.
+    (변환이 끝난 뒤에는 남은 단계가 가벼우므로 끝까지 진행해 캐시에 등록한다)
+
+    Args:
+        job: 공유 추출 작업
+        youtube_url: YouTube video URL
+        video_info: get_video_info() 결과
+        audio_format: 출력 포맷 (mp3, m4a, opus)
+
+    Returns:
+        태그까지 완료된 음원 파일 경로 (작업 공유 파일)
+
+    Raises:
+        VideoError: If download fails or there is not enough storage
+        JobCancelledError: If the job was cancelled before transcoding finished
+    """
+    output_path = os.path.join(settings.upload_path, f"job_{job.job_id}")
+    job_manager.track_files(job, output_path)
+
+    # 다운로드 전에 필요한 공간 예약 (부족하면 오래된 세션을 먼저 정리, 그래도 없으면 실패)
+    reservation = await storage_manager.reserve(
+        storage_manager.estimate_bytes(video_info['duration']),
+        job_prefix=os.path.basename(output_path)
+    )
+
+    # 썸네일은 음원 다운로드와 동시에 가져온다
+    thumbnail_task = asyncio.ensure_future(
+        _timed_cover(video_info['video_id'], video_info['thumbnail_url'])
+    )
+
+    try:
+        job.raise_if_cancelled()
+
+        # Step 2: 음원 다운로드
+        job.publish({'step': 'downloading', 'progress': settings.PROGRESS_DOWNLOAD_START, 'message': '음원 다운로드 시작...'})
+
+        if settings.PIPELINE_STREAMING:
+            audio_path = await _download_streaming(job, youtube_url, output_path, audio_format)
+        else:
+            audio_path = await _download_then_transcode(
+                job, youtube_url, video_info, output_path, audio_format
+            )
+
+        # 재생 중인 스트림은 여기까지 읽고 종료 (이후 합류한 스트림은 태그 완료본을 받음)
+        job.close_output(os.path.getsize(audio_path))
+
+        job.publish({'step': 'postprocessing', 'progress': settings.PROGRESS_DOWNLOAD_END, 'message': '음원 변환 완료'})
+        await _pace(settings.DELAY_STEP_TRANSITION)
+
+        # Step 3: 썸네일 추출 (대부분 다운로드 중에 이미 완료됨)
+        job.publish({'step': 'extracting_thumbnail', 'progress': settings.PROGRESS_THUMBNAIL_START, 'message': '썸네일 추출 중...'})
+        await _pace(settings.DELAY_THUMBNAIL_EXTRACTION)
+
+        cover_data, cover_mime = await thumbnail_task
+
+        job.publish({'step': 'extracting_thumbnail', 'progress': settings.PROGRESS_THUMBNAIL_END, 'message': '썸네일 추출 완료'})
+        await _pace(settings.DELAY_STEP_TRANSITION)
+
+        # Step 4: 커버 이미지 삽입
+        job.publish({'step': 'embedding', 'progress': settings.PROGRESS_EMBEDDING_START, 'message': '커버 이미지 삽입 중...'})
+
+        # 재생 중인 스트림이 있으면 복사본에 태그 후 교체 (태그 삽입은 파일을 제자리에서 다시 쓰므로
+        # 열려 있는 원본 inode는 그대로 두어야 함)
+        loop = asyncio.get_running_loop()
+        tag_path = f"{output_path}.tagged{os.path.splitext(audio_path)[1]}" if job.listeners else audio_path
+        if tag_path != audio_path:
+            await loop.run_in_executor(None, shutil.copyfile, audio_path, tag_path)
+
+        try:
+            with metrics.stage_seconds.time(('embed',)):
+                await audio_service.embed_cover_image(
+                    tag_path,
+                    cover_data,
+                    metadata={
+                        'title': video_info['title'],
+                        'artist': video_info['channel']
+                    },
+                    mime=cover_mime
+                )
+            if tag_path != audio_path:
+                os.replace(tag_path, audio_path)
+        finally:
+            if tag_path != audio_path and os.path.exists(tag_path):
+                os.remove(tag_path)
+
+        job.publish({'step': 'embedding', 'progress': settings.PROGRESS_EMBEDDING_END, 'message': '커버 이미지 삽입 완료'})
+        await _pace(settings.DELAY_STEP_TRANSITION)
+
+        # 완성본 캐시 등록 (하드링크가 안 되면 복사하므로 스레드에서 실행)
+        if settings.AUDIO_CACHE_ENABLED:
+            await loop.run_in_executor(
+                None,
+                audio_cache.store,
+                video_info['video_id'],
+                audio_format,
+                settings.AUDIO_BITRATE,
+                audio_path
+            )
+
+        # 작업 프로파일 저장 (대기자마다 세션 경로로 하드링크)
+        if job.profile is not None:
+            profile_path = f"{output_path}.prof"
+            if await loop.run_in_executor(None, job.profile.dump, profile_path):
+                job.profile_path = profile_path
+
+        return audio_path
+
+    except BaseException:
+        job.close_output(None)
+        thumbnail_task.cancel()
+        # 썸네일이 먼저 실패한 경우 미회수 예외 경고 방지
+        thumbnail_task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+        # 임시 파일 정리 (변환 중 실패/취소된 경우의 부분 결과, yt-dlp .part 파일 포함)
+        _remove_job_files(output_path)
+        raise
+
+    finally:
+        storage_manager.release(reservation)
+
+
+async def _download_then_transcode(
+    job: ExtractionJob,
+    youtube_url: str,
+    video_info: Dict,
+    output_path: str,
+    audio_format: str
+) -> str:
+    """
+    원본 파일로 다운로드한 뒤 변환 (다운로드/변환 진행률을 각각 표시)
+
+    Returns:
+        결과 파일 경로 (원본 파일은 성공/실패와 관계없이 삭제)
+    """
+    bridge = _create_bridge(job)
+    try:
+        with metrics.stage_seconds.time(('download',)):
+            source_path, source_codec = await youtube_service.download_source(
+                youtube_url,
+                f"{output_path}.source",
+                audio_format=audio_format,
+                progress_callback=_make_download_callback(bridge),
+                cancel_event=job.cancel_event
+            )
+    finally:
+        bridge.drain()
+
+    try:
+        job.raise_if_cancelled()
+        job.publish({'step': 'downloading', 'progress': settings.PROGRESS_POSTPROCESS_START, 'message': '음원 다운로드 완료'})
+        _open_output(job, output_path, audio_format)
+
+        # 음원 변환 (다운로드 슬롯을 반납하고 변환 슬롯에서 실행, 느린 변환이 다음 다운로드를 막지 않음)
+        async with job_manager.transcode_stage(job):
+            job.publish({'step': 'postprocessing', 'progress': settings.PROGRESS_POSTPROCESS_START, 'message': '음원 변환 중...'})
+
+            bridge = _create_bridge(job)
+            try:
+                with metrics.stage_seconds.time(('transcode',)):
+                    return await transcode_service.transcode(
+                        source_path,
+                        output_path,
+                        audio_format=audio_format,
+                        duration=video_info['duration'],
+                        source_codec=source_codec,
+                        progress_callback=_make_transcode_callback(bridge),
+                        cancel_event=job.cancel_event
+                    )
+            finally:
+                bridge.drain()
+    finally:
+        if os.path.exists(source_path):
+            os.remove(source_path)
+
+
+async def _download_streaming(
+    job: ExtractionJob,
+    youtube_url: str,
+    output_path: str,
+    audio_format: str
+) -> str:
+    """
+    다운로드와 변환을 동시에 (원본 바이트를 FFmpeg stdin으로 전달, 중간 파일 없음)
+
+    변환이 다운로드 속도에 맞춰 진행되므로 다운로드 진행률만 표시한다.
+
+    Returns:
+        결과 파일 경로
+    """
+    source = await youtube_service.resolve_source(youtube_url, audio_format)
+    job.raise_if_cancelled()
+    _open_output(job, output_path, audio_format)
+
+    bridge = _create_bridge(job)
+    try:
+        # 다운로드와 변환이 겹치므로 두 단계 슬롯을 함께 사용하고 하나의 단계(stream)로 기록
+        async with job_manager.transcode_stage(job, release_download=False):
+            with metrics.stage_seconds.time(('stream',)):
+                audio_path = await transcode_service.transcode_stream(
+                    functools.partial(
+                        youtube_service.stream_source,
+                        source,
+                        progress_callback=_make_download_callback(bridge),
+                        cancel_event=job.cancel_event
+                    ),
+                    output_path,
+                    audio_format=audio_format,
+                    source_codec=source['acodec'],
+                    cancel_event=job.cancel_event
+                )
+    finally:
+        bridge.drain()
+
+    job.publish({'step': 'postprocessing', 'progress': settings.PROGRESS_POSTPROCESS_START, 'message': '음원 다운로드 및 변환 완료'})
+    return audio_path
+
+
+async def _timed_cover(video_id: str, thumbnail_url: str):
+    """썸네일 준비 시간 기록 (다운로드와 동시에 진행되므로 별도 측정)"""
+    with metrics.stage_seconds.time(('thumbnail',)):
+        return await thumbnail_service.get_cover(video_id, thumbnail_url)
+
+
+def _remove_job_files(output_path: str) -> None:
+    """작업 파일 정리 (원본, 부분 다운로드, 변환 결과, 태그 복사본)"""
+    for path in glob.glob(f"{glob.escape(output_path)}.*"):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _remove_quietly(path: Optional[str]) -> None:
+    """파일이 있으면 삭제 (없거나 실패해도 무시)"""
+    if path:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+async def _link_in_executor(dest_path: str, fn, *args):
+    """
+    dest_path를 만드는 파일 연결/복사를 스레드에서 실행
+
+    요청이 취소돼도 스레드는 끝까지 실행되므로, 그 경우 스레드가 끝난 뒤 dest_path를 삭제한다
+    (취소 직후의 정리보다 늦게 파일이 생겨 세션 없는 파일이 남는 것을 방지).
+    """
+    future = asyncio.get_running_loop().run_in_executor(None, fn, *args)
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        future.add_done_callback(lambda _: _remove_quietly(dest_path))
+        raise
+
+
+def _open_output(job: ExtractionJob, output_path: str, audio_format: str) -> None:
+    """앞에서부터 재생 가능한 포맷이면 변환 출력 파일을 재생 스트림에 공개"""
+    codec = CODECS[audio_format]
+    if codec['streamable']:
+        job.open_output(f"{output_path}.{codec['ext']}")
+
+
+async def stream_job_audio(job: ExtractionJob) -> AsyncGenerator[bytes, None]:
+    """
+    추출 중인 음원을 만들어지는 대로 전송 (재생하면서 추출)
+
+    - 변환 출력이 공개되면 커지는 파일을 따라가며 읽고, 변환이 끝난 크기까지 보낸 뒤 종료
+    - 이미 태그 단계에 들어갔거나 앞에서부터 재생할 수 없는 포맷이면 완성본을 기다렸다가 전송
+    - 작업이 실패하면 그 시점에서 스트림 종료 (에러는 SSE로 전달됨)
+
+    호출 측은 job_manager.join()으로 합류한 상태여야 한다 (작업 파일 유지).
+    """
+    loop = asyncio.get_running_loop()
+    chunk_size = settings.LISTEN_CHUNK_BYTES
+    fd = None
+    listening = False
+
+    try:
+        # 변환 출력 파일이 생기거나 작업이 끝날 때까지 대기
+        while not job.output_closed and not job.result.done():
+            if job.output_path and os.path.exists(job.output_path):
+                break
+            await asyncio.sleep(settings.LISTEN_POLL_INTERVAL)
+
+        if job.output_path and not job.output_closed and os.path.exists(job.output_path):
+            # 같은 이벤트 루프 안에서 확인과 등록을 연달아 해서 태그 단계와 경합하지 않음
+            fd = os.open(job.output_path, os.O_RDONLY)
+            job.listeners += 1
+            listening = True
+            size_limit = None
+        else:
+            try:
+                result_path = await asyncio.shield(job.result)
+            except Exception:
+                return
+            fd = os.open(result_path, os.O_RDONLY)
+            size_limit = os.fstat(fd).st_size
+
+        offset = 0
+        while True:
+            if listening and job.output_closed:
+                if job.output_size is None:
+                    return  # 작업 실패
+                size_limit = job.output_size
+
+            read_size = chunk_size if size_limit is None else min(chunk_size, size_limit - offset)
+            if read_size <= 0:
+                return
+
+            chunk = await loop.run_in_executor(None, os.pread, fd, read_size, offset)
+            if chunk:
+                offset += len(chunk)
+                yield chunk
+            elif size_limit is None:
+                # 아직 변환 중 (출력이 더 쓰이기를 기다림)
+                await asyncio.sleep(settings.LISTEN_POLL_INTERVAL)
+            else:
+                return
+
+    finally:
+        if listening:
+            job.listeners -= 1
+        if fd is not None:
+            os.close(fd)
+
+
+async def extract_to_session(
+    youtube_url: str,
+    audio_format: str,
+    video_info: Optional[Dict] = None,
+    trace_id: Optional[str] = None,
+    profile: bool = False
+) -> AsyncGenerator[Dict, None]:
+    """
+    영상 하나를 추출해 세션 생성 (진행 이벤트 생성기, 마지막 이벤트는 complete)
+
+    캐시에 완성본이 있으면 재사용하고, 없으면 진행 중인 동일 작업에 합류하거나 새 작업을 시작한다.
+    생성기가 중간에 닫히면 (클라이언트 연결 종료) 작업에서 빠지고, 마지막 대기자였다면 작업이 취소된다.
+
+    Args:
+        youtube_url: YouTube video URL
+        audio_format: 출력 포맷 (mp3, m4a, opus)
+        video_info: 이미 조회한 영상 정보 (없으면 조회)
+        trace_id: 추적 ID (없으면 현재 추적을 이어받거나 생성)
+        profile: 새 작업을 시작하면 cProfile로 측정 (세션과 함께 <session_id>.prof로 저장)
+
+    Raises:
+        VideoError: If the video cannot be extracted
+        JobCancelledError: If the shared job was cancelled
+        QueueFullError: If a new job is needed but the queue is full
+    """
+    with tracing.start(trace_id, profile=tracing.JobProfile() if profile else None) as trace:
+        audio_path = None
+        profile_path = None
+        session_created = False
+        completed = False
+        started = time.perf_counter()
+
+        try:
+            # Step 1: 영상 정보 확인
+            yield {'step': 'validating', 'progress': settings.PROGRESS_VALIDATION_START, 'message': '영상 정보 확인 중...'}
+
+            if video_info is None:
+                with metrics.stage_seconds.time(('info',)):
+                    video_info = await youtube_service.get_video_info(youtube_url)
+
+            yield {'step': 'validating', 'progress': settings.PROGRESS_VALIDATION_END, 'message': '영상 정보 확인 완료'}
+
+            # 세션 파일 경로 생성
+            # 파일명은 세션 ID (재시작 후 고아 파일 정리 시 세션 복구에 사용)
+            session_id = str(uuid.uuid4())
+            audio_path = os.path.join(
+                settings.upload_path,
+                f"{session_id}.{CODECS[audio_format]['ext']}"
+            )
+            video_id = video_info['video_id']
+            suggested_filename = parse_cover_filename(video_info['title'])
+            metadata = {
+                'thumbnail_url': video_info['thumbnail_url'],
+                'suggested_filename': suggested_filename,
+                'original_title': video_info['title'],
+                'duration': video_info['duration'],
+                'channel': video_info['channel'],
+                'audio_format': audio_format,
+                'profile_path': None
+            }
+
+            # 세션은 파일을 연결하기 전에 만든다. 세션 파일이 세션보다 먼저 생기면 그 사이의 고아 파일 정리가
+            # (SQLite 저장소면 다른 워커 포함) 같은 ID로 세션을 복구해 이 요청의 세션 생성과 충돌한다.
+
+            # 캐시 확인 (동일 영상/포맷/비트레이트의 완성본이 있으면 재사용)
+            # 파일 연결은 하드링크가 안 되면 복사하므로 이벤트 루프 밖에서 실행
+            cache_hit = False
+            if settings.AUDIO_CACHE_ENABLED:
+                if audio_cache.contains(video_id, audio_format, settings.AUDIO_BITRATE):
+                    session_manager.create_session(audio_path, metadata, session_id=session_id)
+                    session_created = True
+                cache_hit = await _link_in_executor(
+                    audio_path, audio_cache.fetch, video_id, audio_format, settings.AUDIO_BITRATE, audio_path
+                )
+                if not cache_hit and session_created:
+                    # 연결 직전에 캐시에서 삭제됨
+                    session_manager.store.delete(session_id)
+                    session_created = False
+
+            if cache_hit:
+                yield {'step': 'embedding', 'progress': settings.PROGRESS_EMBEDDING_END, 'message': '캐시된 음원 사용'}
+            else:
+                # 진행 중인 동일 작업이 있으면 합류, 없으면 새로 시작
+                job_key = audio_cache.make_key(video_id, audio_format, settings.AUDIO_BITRATE)
+                job, _ = job_manager.attach(
+                    job_key,
+                    lambda shared_job: run_extraction(shared_job, youtube_url, video_info, audio_format)
+                )
+                events = job.subscribe()
+                try:
+                    while True:
+                        event = await events.get()
+                        if event is None:
+                            break
+                        yield event
+
+                    # 작업 결과를 이 요청의 세션 경로로 연결
+                    result_path = await job.result
+                    if job.profile_path:
+                        profile_path = os.path.join(settings.upload_path, f"{session_id}.prof")
+                    session_manager.create_session(
+                        audio_path, {**metadata, 'profile_path': profile_path}, session_id=session_id
+                    )
+                    session_created = True
+                    await _link_in_executor(audio_path, link_file, result_path, audio_path)
+                    if profile_path:
+                        await _link_in_executor(profile_path, link_file, job.profile_path, profile_path)
+                finally:
+                    job.unsubscribe(events)
+                    job_manager.release(job)
+
+            # Step 5: 완료 (캐시 히트/작업 합류 포함, 요청 기준 전체 소요 시간)
+            metrics.stage_seconds.observe(time.perf_counter() - started, ('total',))
+            completed = True
+            yield {
+                'step': 'complete',
+                'progress': 100,
+                'message': '완료!',
+                'session_id': session_id,
+                'trace_id': trace.trace_id,
+                'profile': profile_path is not None,
+                'preview': {
+                    'thumbnail_url': video_info['thumbnail_url'],
+                    'suggested_filename': suggested_filename,
+                    'original_title': video_info['title'],
+                    'duration': video_info['duration']
+                }
+            }
+
+        finally:
+            # 완료 전에 끝나면 세션과 연결한 파일 정리
+            # (에러뿐 아니라 클라이언트 연결 종료로 생성기가 닫히거나 취소된 경우 포함)
+            if not completed:
+                if session_created:
+                    session_manager.store.delete(session_id)
+                for path in (audio_path, profile_path):
+                    _remove_quietly(path)
+
+
+def error_event(e: Exception) -> Dict:
+    """추출 에러를 SSE 에러 이벤트로 변환 (카테고리별 에러 수 집계)"""
+    metrics.errors.inc(labels=(error_category(e),))
+
+    if isinstance(e, QueueFullError):
+        # 스트림 시작 후 대기열이 가득 찬 경우
+        return {
+            'step': 'error',
+            'progress': 0,
+            'message': str(e),
+            'error_detail': 'queue_full',
+            'retry_after': e.retry_after
+        }
+    if isinstance(e, (VideoError, JobCancelledError)):
+        # 영상 관련 에러 (공유 작업의 실패/취소 포함)
+        return {
+            'step': 'error',
+            'progress': 0,
+            'message': str(e),
+            'error_detail': 'storage_full' if getattr(e, 'category', None) == 'storage' else 'video_error'
+        }
+    # 일반 에러
+    return {
+        'step': 'error',
+        'progress': 0,
+        'message': '처리 중 오류가 발생했습니다',
+        'error_detail': str(e)
+    }
+
+
+def error_category(e: Exception) -> str:
+    """메트릭용 에러 분류 (VideoError는 category, 그 외는 종류별)"""
+    if isinstance(e, VideoError):
+        return e.category
+    if isinstance(e, JobCancelledError):
+        return 'cancelled'
+    if isinstance(e, QueueFullError):
+        return 'queue_full'
+    return 'internal'
+
+
+async def _pace(delay: float) -> None:
+    """단계 사이 연출용 지연 (fast-path 모드에서는 생략, 연출은 클라이언트 담당)"""
+    if not settings.PIPELINE_FAST_PATH and delay > 0:
+        await asyncio.sleep(delay)
@@ -0,0 +1,69 @@
+from typing import Callable, Optional
+import asyncio
+import threading
+
+
+class ProgressBridge:
+    """
+    워커 스레드의 진행 이벤트를 이벤트 루프로 전달 (스레드 안전)
+
+    진행률 이벤트는 마지막 값 하나만 유지하고 min_interval 간격으로 전달한다
+    (빠른 다운로드가 클라이언트로 이벤트를 쏟아내지 않도록 병합).
+    순서가 중요한 단계 이벤트는 이벤트 루프에서 job.publish()로 직접 보낸다.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        publish: Callable[[dict], None],
+        min_interval: float = 0.25
+    ):
+        self.loop = loop
+        self.publish = publish
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._latest: Optional[dict] = None
+        self._scheduled = False
+        self._closed = False
+        self._last_flush = 0.0
+
+    def push(self, event: dict) -> None:
+        """
+        진행 이벤트 전달 (어느 스레드에서나 호출 가능, 아직 전달되지 않은 이전 이벤트를 대체)
+
+        Args:
+            event: 진행 이벤트
+        """
+        with self._lock:
+            if self._closed:
+                return
+
+            self._latest = event
+            if self._scheduled:
+                return
+            self._scheduled = True
+
+        self.loop.call_soon_threadsafe(self._schedule)
+
+    def drain(self) -> None:
+        """남은 이벤트를 즉시 전달하고 이후 이벤트 무시 (이벤트 루프에서 호출)"""
+        self._flush()
+        with self._lock:
+            self._closed = True
+
+    def _schedule(self) -> None:
+        """마지막 전달 후 min_interval이 지나면 전달"""
+        delay = max(0.0, self._last_flush + self.min_interval - self.loop.time())
+        self.loop.call_later(delay, self._flush)
+
+    def _flush(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            event = self._latest
+            self._latest = None
+            self._scheduled = False
+
+        self._last_flush = self.loop.time()
+        if event is not None:
+            self.publish(event)
@@ -0,0 +1,241 @@
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional
+import asyncio
+import logging
+import os
+import re
+import time
+
+import mutagen
+
+from app.core.config import settings
+from app.services.jobs import JobManager, job_manager
+from app.services.session import SessionManager, session_manager
+from app.services.transcode import CODECS
+from app.utils.sanitize import parse_cover_filename
+
+logger = logging.getLogger(__name__)
+
+# 세션 파일: <session_id>.<mp3|m4a|opus>
+SESSION_FILE_PATTERN = re.compile(
+    r'^(?P<session_id>[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})\.(?P<ext>mp3|m4a|opus)$'
+)
+# 작업 프로파일: <session_id>.prof (PROFILE_MODE, 세션과 함께 삭제)
+PROFILE_FILE_PATTERN = re.compile(
+    r'^(?P<session_id>[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})\.prof$'
+)
+# 중간 파일: 작업 파일(job_*), yt-dlp 부분 다운로드, 원본/태그 임시 파일
+PARTIAL_FILE_PATTERN = re.compile(r'^job_|\.(part|ytdl|temp)$|\.part-Frag\d+$')
+
+EXT_TO_FORMAT = {codec['ext']: audio_format for audio_format, codec in CODECS.items()}
+
+
+class FileEntry(NamedTuple):
+    name: str
+    path: str
+    size: int
+    mtime: float
+
+
+class OrphanReconciler:
+    """
+    temp_files 고아 파일 정리 및 세션 복구
+
+    - 시작 시 백그라운드에서 한 번, 이후 주기적으로 os.scandir로 디렉토리를 색인
+    - 세션이 참조하지 않는 중간 파일(부분 다운로드, 원본, 작업 파일)은 일정 시간이 지나면 삭제
+      (진행 중인 작업 - 작업 저장소를 공유하는 다른 워커 포함 - 과 결과를 연결 중인 작업의 파일은
+      수정 시각과 관계없이 유지)
+    - 세션 파일(<session_id>.<ext>)은 아직 만료 전이면 태그에서 메타데이터를 읽어 세션을 복구하고,
+      만료됐으면 삭제 (작업 프로파일 <session_id>.prof는 복구된 세션에 다시 연결)
+    - 하위 디렉토리(캐시), DB, 쿠키 등 알 수 없는 파일은 건드리지 않음
+    """
+
+    def __init__(self, root: str, sessions: SessionManager, jobs: JobManager):
+        self.root = root
+        self.sessions = sessions
+        self.jobs = jobs
+        self.progress: Dict = {'state': 'idle'}
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """백그라운드 정리 시작 (앱 준비를 지연하지 않음)"""
+        self._task = asyncio.create_task(self._run_periodic())
+
+    async def stop(self) -> None:
+        """백그라운드 정리 중지"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def reconcile(self) -> Dict:
+        """
+        한 번 정리 실행
+
+        Returns:
+            결과 (scanned, recovered, deleted, bytes_reclaimed, duration_ms)
+        """
+        started = time.perf_counter()
+        self.progress = {
+            'state': 'scanning',
+            'scanned': 0,
+            'recovered': 0,
+            'deleted': 0,
+            'bytes_reclaimed': 0,
+            'started_at': datetime.now()
+        }
+        loop = asyncio.get_running_loop()
+
+        entries = await loop.run_in_executor(None, self._scan)
+
+        # 세션 참조 여부는 이벤트 루프에서 확인 (새 세션 생성과 경합하지 않도록)
+        self.progress['state'] = 'reconciling'
+        referenced = self.sessions.store.file_paths()
+        # 비정상 종료한 워커의 작업을 먼저 실패 처리해야 그 작업 파일이 정리 대상이 된다
+        self.jobs.recover_interrupted()
+        active_jobs = self.jobs.active_file_prefixes()
+        now = time.time()
+        max_age = settings.MAX_FILE_AGE_HOURS * 3600
+
+        to_delete: List[FileEntry] = []
+        to_recover: List[FileEntry] = []
+        profiles: Dict[str, FileEntry] = {}
+        for entry in entries:
+            if entry.path in referenced:
+                continue
+            age = now - entry.mtime
+            profile_match = PROFILE_FILE_PATTERN.match(entry.name)
+            if profile_match:
+                profiles[profile_match['session_id']] = entry
+            elif SESSION_FILE_PATTERN.match(entry.name):
+                if age > max_age:
+                    to_delete.append(entry)
+                else:
+                    to_recover.append(entry)
+            elif entry.name.split('.', 1)[0] in active_jobs:
+                continue
+            elif PARTIAL_FILE_PATTERN.search(entry.name) and age > settings.ORPHAN_PARTIAL_AGE_SECONDS:
+                to_delete.append(entry)
+
+        # 복구 대상 태그 읽기 (스레드), 세션 등록 (이벤트 루프)
+        if to_recover:
+            recovered = await loop.run_in_executor(None, self._read_metadata, to_recover)
+            for entry, metadata in recovered:
+                match = SESSION_FILE_PATTERN.match(entry.name)
+                # 새 세션은 항상 새 파일명을 쓰므로 ID만 다시 확인
+                if self.sessions.get_session(match['session_id']):
+                    continue
+                profile = profiles.pop(match['session_id'], None)
+                if profile is not None:
+                    metadata['profile_path'] = profile.path
+                self.sessions.create_session(
+                    entry.path,
+                    metadata,
+                    session_id=match['session_id'],
+                    created_at=datetime.fromtimestamp(entry.mtime)
+                )
+                self.progress['recovered'] += 1
+
+        # 세션이 없는 프로파일 (세션 파일은 위에서 복구됨)
+        for session_id, entry in profiles.items():
+            if now - entry.mtime > settings.ORPHAN_PARTIAL_AGE_SECONDS and not self.sessions.get_session(session_id):
+                to_delete.append(entry)
+
+        # 삭제 (스레드)
+        self.progress['state'] = 'deleting'
+        await loop.run_in_executor(None, self._delete, to_delete)
+
+        self.progress['state'] = 'done'
+        self.progress['finished_at'] = datetime.now()
+        self.progress['duration_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        return dict(self.progress)
+
+    def get_stats(self) -> Dict:
+        """진행 상황 (/health)"""
+        return dict(self.progress)
+
+    async def _run_periodic(self) -> None:
+        """시작 직후 한 번, 이후 ORPHAN_SWEEP_INTERVAL_SECONDS마다 실행"""
+        while True:
+            try:
+                result = await self.reconcile()
+                if result['recovered'] or result['deleted']:
+                    logger.info(
+                        f"Reconciled temp files: {result['recovered']} sessions recovered, "
+                        f"{result['deleted']} orphans deleted ({result['bytes_reclaimed']} bytes, "
+                        f"{result['duration_ms']}ms)"
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.progress['state'] = 'failed'
+                logger.error(f"Error in orphan reconciliation: {e}")
+
+            await asyncio.sleep(settings.ORPHAN_SWEEP_INTERVAL_SECONDS)
+
+    def _scan(self) -> List[FileEntry]:
+        """디렉토리 색인 (동기 함수, 하위 디렉토리는 건너뜀)"""
+        entries = []
+        with os.scandir(self.root) as it:
+            for dir_entry in it:
+                self.progress['scanned'] += 1
+                try:
+                    if not dir_entry.is_file(follow_symlinks=False):
+                        continue
+                    stat_result = dir_entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                entries.append(FileEntry(dir_entry.name, dir_entry.path, stat_result.st_size, stat_result.st_mtime))
+        return entries
+
+    @staticmethod
+    def _read_metadata(entries: List[FileEntry]) -> list:
+        """
+        세션 파일 태그에서 메타데이터 복구 (동기 함수)
+
+        Returns:
+            [(entry, metadata)], 태그를 읽을 수 없는 파일도 기본값으로 복구
+        """
+        recovered = []
+        for entry in entries:
+            title, artist, duration = None, None, 0
+            try:
+                audio = mutagen.File(entry.path, easy=True)
+                if audio is not None:
+                    title = (audio.get('title') or [None])[0]
+                    artist = (audio.get('artist') or [None])[0]
+                    duration = int(getattr(audio.info, 'length', 0) or 0)
+            except Exception:
+                pass
+
+            ext = entry.name.rsplit('.', 1)[1]
+            recovered.append((entry, {
+                'thumbnail_url': '',
+                'suggested_filename': parse_cover_filename(title) if title else 'audio',
+                'original_title': title or '',
+                'duration': duration,
+                'channel': artist or '',
+                'audio_format': EXT_TO_FORMAT.get(ext, 'mp3'),
+                'recovered': True
+            }))
+        return recovered
+
+    def _delete(self, entries: List[FileEntry]) -> None:
+        """고아 파일 삭제 (동기 함수)"""
+        for entry in entries:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                logger.warning(f"Failed to delete orphan {entry.path}: {e}")
+                continue
+            self.progress['deleted'] += 1
+            self.progress['bytes_reclaimed'] += entry.size
+
+
+# 싱글톤 인스턴스
+orphan_reconciler = OrphanReconciler(settings.upload_path, session_manager, job_manager)
@@ -1,34 +1,47 @@
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import logging
 import os
+import time
 import uuid
 
+from app.services import tracing
+from app.services.session_store import SessionStore, create_session_store
 
-class SessionManager:
-    """세션 관리 (인메모리)"""
+logger = logging.getLogger(__name__)
 
-    def __init__(self):
-        self.sessions: Dict[str, dict] = {}
 
-    def create_session(self, file_path: str, metadata: dict) -> str:
+class SessionManager:
+    """세션 관리 (저장소는 SESSION_STORE 설정에 따라 인메모리 또는 SQLite)"""
+
+    def __init__(self, store: SessionStore):
+        self.store = store
+        self.last_cleanup: Optional[Dict] = None  # 마지막 정리 결과 (/health)
+
+    def create_session(
+        self,
+        file_path: str,
+        metadata: dict,
+        session_id: Optional[str] = None,
+        created_at: Optional[datetime] = None
+    ) -> str:
         """
         새 세션 생성
 
         Args:
-            file_path: MP3 파일 경로
+            file_path: 음원 파일 경로 (파일명은 세션 ID, 재시작 후 복구에 사용)
             metadata: 영상 메타데이터
+            session_id: 미리 정한 세션 ID (없으면 생성)
+            created_at: 생성 시각 (복구 시 파일 수정 시각, 없으면 현재)
 
         Returns:
             Session ID (UUID)
         """
-        session_id = str(uuid.uuid4())
-
-        self.sessions[session_id] = {
-            'file_path': file_path,
-            'metadata': metadata,
-            'created_at': datetime.now()
-        }
-
+        session_id = session_id or str(uuid.uuid4())
+        with tracing.span('session.create', session_id=session_id) as span:
+            self.store.create(session_id, file_path, metadata, created_at or datetime.now())
+            span['bytes'] = os.path.getsize(file_path) if os.path.exists(file_path) else 0
         return session_id
 
     def get_session(self, session_id: str) -> Optional[dict]:
@@ -41,65 +54,130 @@ class SessionManager:
         Returns:
             Session data or None if not found
         """
-        return self.sessions.get(session_id)
+        return self.store.get(session_id)
 
     def delete_session(self, session_id: str) -> bool:
         """
         세션 삭제 (파일도 함께 삭제)
 
+        세션 파일은 세션마다 고유한 경로(캐시 히트 시 하드링크)이므로
+        다른 세션이나 캐시가 참조하는 데이터는 삭제되지 않는다.
+
         Args:
             session_id: Session ID
 
         Returns:
             True if deleted, False if not found
         """
-        if session_id not in self.sessions:
+        session = self.store.delete(session_id)
+        if session is None:
             return False
 
-        session = self.sessions[session_id]
-        file_path = session.get('file_path')
+        # 파일 삭제 (작업 프로파일이 있으면 함께)
+        for file_path in self._session_files(session):
+            if os.path.exists(file_path):
+                try:
+                    os.remove(file_path)
+                except Exception as e:
+                    print(f"Failed to delete file {file_path}: {e}")
 
-        # 파일 삭제
-        if file_path and os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-            except Exception as e:
-                print(f"Failed to delete file {file_path}: {e}")
-
-        # 세션 삭제
-        del self.sessions[session_id]
         return True
 
-    def cleanup_old_sessions(self, max_age_hours: int = 1) -> int:
+    async def cleanup_old_sessions(self, max_age_hours: int = 1) -> Dict:
         """
-        오래된 세션 정리 (1시간 이상)
+        만료된 세션 정리
+
+        저장소의 만료 인덱스로 만료된 세션만 꺼내고,
+        파일 삭제는 이벤트 루프를 막지 않도록 스레드에서 실행한다.
 
         Args:
             max_age_hours: 최대 보존 시간 (시간)
 
         Returns:
-            Number of cleaned sessions
+            정리 결과 (sessions, bytes_reclaimed, duration_ms)
         """
+        started = time.perf_counter()
         cutoff_time = datetime.now() - timedelta(hours=max_age_hours)
 
-        # 삭제할 세션 ID 목록
-        expired_sessions = [
-            sid for sid, data in self.sessions.items()
-            if data['created_at'] < cutoff_time
-        ]
+        count, reclaimed = await self.delete_sessions(self.store.expired(cutoff_time))
+
+        self.last_cleanup = {
+            'sessions': count,
+            'bytes_reclaimed': reclaimed,
+            'duration_ms': round((time.perf_counter() - started) * 1000, 1),
+            'finished_at': datetime.now()
+        }
+        return self.last_cleanup
+
+    async def delete_sessions(self, session_ids: List[str]) -> Tuple[int, int]:
+        """
+        여러 세션 삭제 (파일 삭제는 스레드에서 실행)
 
-        # 삭제
+        Returns:
+            (삭제된 세션 수, 회수된 바이트 수)
+        """
+        file_paths: List[str] = []
         count = 0
-        for sid in expired_sessions:
-            if self.delete_session(sid):
-                count += 1
+        for sid in session_ids:
+            session = self.store.delete(sid)
+            if session is None:
+                continue  # 다른 프로세스가 먼저 정리함
+            count += 1
+            file_paths.extend(self._session_files(session))
+
+        if not count:
+            return 0, 0
+
+        loop = asyncio.get_running_loop()
+        with tracing.span('session.delete', sessions=count) as span:
+            reclaimed = await loop.run_in_executor(None, tracing.bind(self._remove_files), file_paths)
+            span['bytes_reclaimed'] = reclaimed
+        return count, reclaimed
+
+    def oldest_sessions(
+        self,
+        limit: int,
+        after: Optional[Tuple[datetime, str]] = None
+    ) -> List[Tuple[str, str, datetime]]:
+        """
+        오래된 세션 (세션 ID, 파일 경로, 생성 시각), after 다음부터 limit개
+
+        저장소 기준이므로 SQLite 저장소를 공유하면 다른 워커의 세션도 포함된다.
+        """
+        return self.store.oldest(limit, after)
+
+    @staticmethod
+    def _session_files(session: Dict) -> List[str]:
+        """세션이 소유한 파일 (음원, 작업 프로파일)"""
+        paths = [session.get('file_path'), session['metadata'].get('profile_path')]
+        return [path for path in paths if path]
 
-        return count
+    @staticmethod
+    def _remove_files(file_paths: List[str]) -> int:
+        """
+        파일 삭제 (동기 함수)
+
+        Returns:
+            실제로 회수된 바이트 수 (캐시와 공유하는 하드링크는 제외)
+        """
+        reclaimed = 0
+        for file_path in file_paths:
+            try:
+                stat_result = os.stat(file_path)
+                os.remove(file_path)
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                logger.warning(f"Failed to delete file {file_path}: {e}")
+                continue
+            if stat_result.st_nlink == 1:
+                reclaimed += stat_result.st_size
+        return reclaimed
 
     def get_session_count(self) -> int:
         """현재 세션 수"""
-        return len(self.sessions)
+        return self.store.count()
 
 
 # 싱글톤 인스턴스
-session_manager = SessionManager()
+session_manager = SessionManager(create_session_store())
@@ -0,0 +1,225 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+import heapq
+import json
+import sqlite3
+import threading
+
+from app.core.config import settings
+
+
+class SessionStore(ABC):
+    """세션 저장소 인터페이스"""
+
+    @abstractmethod
+    def create(self, session_id: str, file_path: str, metadata: dict, created_at: datetime) -> None:
+        """세션 등록"""
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[Dict]:
+        """세션 조회"""
+
+    @abstractmethod
+    def delete(self, session_id: str) -> Optional[Dict]:
+        """
+        세션 삭제
+
+        Returns:
+            삭제된 세션 (없거나 다른 프로세스가 먼저 삭제했으면 None)
+        """
+
+    @abstractmethod
+    def expired(self, older_than: datetime) -> List[str]:
+        """
+        older_than 이전에 생성된 세션 ID 목록 (만료 인덱스 사용, 전체 순회 없음)
+
+        반환된 세션은 곧 delete()로 삭제된다고 가정한다.
+        """
+
+    @abstractmethod
+    def oldest(self, limit: int, after: Optional[Tuple[datetime, str]] = None) -> List[Tuple[str, str, datetime]]:
+        """
+        생성 시각 순 세션 목록 (삭제하지 않음, 용량 부족 시 조기 삭제 후보를 페이지 단위로 순회)
+
+        Args:
+            limit: 최대 개수
+            after: 이전 페이지의 마지막 (생성 시각, 세션 ID), 이 세션 다음부터 조회
+
+        Returns:
+            [(세션 ID, 파일 경로, 생성 시각)]
+        """
+
+    @abstractmethod
+    def count(self) -> int:
+        """세션 수"""
+
+    @abstractmethod
+    def file_paths(self) -> Set[str]:
+        """세션이 참조하는 파일 경로 (고아 파일 정리용)"""
+
+
+class InMemorySessionStore(SessionStore):
+    """인메모리 세션 저장소 (프로세스별, 워커가 하나일 때 사용)"""
+
+    def __init__(self):
+        self.sessions: Dict[str, dict] = {}
+        # 만료 인덱스 (생성 시각 최소 힙, 삭제된 세션은 꺼낼 때 건너뜀)
+        self._expiry: List[Tuple[datetime, str]] = []
+
+    def create(self, session_id: str, file_path: str, metadata: dict, created_at: datetime) -> None:
+        self.sessions[session_id] = {
+            'file_path': file_path,
+            'metadata': metadata,
+            'created_at': created_at
+        }
+        heapq.heappush(self._expiry, (created_at, session_id))
+
+    def get(self, session_id: str) -> Optional[Dict]:
+        return self.sessions.get(session_id)
+
+    def delete(self, session_id: str) -> Optional[Dict]:
+        session = self.sessions.pop(session_id, None)
+        # 힙에 남은 항목이 너무 많으면 재구성 (개별 삭제가 많은 경우)
+        if len(self._expiry) > 2 * len(self.sessions) + 64:
+            self._expiry = [
+                (data['created_at'], sid) for sid, data in self.sessions.items()
+            ]
+            heapq.heapify(self._expiry)
+        return session
+
+    def expired(self, older_than: datetime) -> List[str]:
+        expired = []
+        while self._expiry and self._expiry[0][0] < older_than:
+            _, session_id = heapq.heappop(self._expiry)
+            if session_id in self.sessions:
+                expired.append(session_id)
+        return expired
+
+    def oldest(self, limit: int, after: Optional[Tuple[datetime, str]] = None) -> List[Tuple[str, str, datetime]]:
+        # 스레드에서 호출되므로 먼저 복사 (이벤트 루프의 세션 생성/삭제와 경합 방지)
+        candidates = [
+            (data['created_at'], sid, data['file_path'])
+            for sid, data in list(self.sessions.items())
+            if after is None or (data['created_at'], sid) > after
+        ]
+        return [
+            (session_id, file_path, created_at)
+            for created_at, session_id, file_path in heapq.nsmallest(limit, candidates)
+        ]
+
+    def count(self) -> int:
+        return len(self.sessions)
+
+    def file_paths(self) -> Set[str]:
+        return {data['file_path'] for data in self.sessions.values()}
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    SQLite 세션 저장소 (같은 호스트의 여러 uvicorn 워커/프로세스가 공유)
+
+    기본 키 조회로 세션을 찾고, 생성 시각 인덱스로 만료 세션을 찾는다.
+    여러 프로세스가 동시에 정리해도 행 삭제에 성공한 프로세스만 파일을 지운다.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None, timeout=5.0)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS sessions (
+                session_id TEXT PRIMARY KEY,
+                file_path TEXT NOT NULL,
+                metadata TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )
+        ''')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_sessions_created_at ON sessions (created_at)')
+
+    def create(self, session_id: str, file_path: str, metadata: dict, created_at: datetime) -> None:
+        with self._lock:
+            self.conn.execute(
+                'INSERT INTO sessions (session_id, file_path, metadata, created_at) VALUES (?, ?, ?, ?)',
+                (session_id, file_path, json.dumps(metadata), created_at.isoformat())
+            )
+
+    def get(self, session_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT file_path, metadata, created_at FROM sessions WHERE session_id = ?',
+                (session_id,)
+            ).fetchone()
+        return self._to_session(row) if row else None
+
+    def delete(self, session_id: str) -> Optional[Dict]:
+        with self._lock:
+            # 조회와 삭제를 한 트랜잭션으로 (동시에 정리하는 다른 프로세스와 경합 방지)
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = self.conn.execute(
+                    'SELECT file_path, metadata, created_at FROM sessions WHERE session_id = ?',
+                    (session_id,)
+                ).fetchone()
+                if row:
+                    self.conn.execute('DELETE FROM sessions WHERE session_id = ?', (session_id,))
+                self.conn.execute('COMMIT')
+            except BaseException:
+                self.conn.execute('ROLLBACK')
+                raise
+        return self._to_session(row) if row else None
+
+    def expired(self, older_than: datetime) -> List[str]:
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT session_id FROM sessions WHERE created_at < ?',
+                (older_than.isoformat(),)
+            ).fetchall()
+        return [row['session_id'] for row in rows]
+
+    def oldest(self, limit: int, after: Optional[Tuple[datetime, str]] = None) -> List[Tuple[str, str, datetime]]:
+        with self._lock:
+            if after is None:
+                rows = self.conn.execute(
+                    'SELECT session_id, file_path, created_at FROM sessions '
+                    'ORDER BY created_at, session_id LIMIT ?',
+                    (limit,)
+                ).fetchall()
+            else:
+                created_at, session_id = after
+                rows = self.conn.execute(
+                    'SELECT session_id, file_path, created_at FROM sessions '
+                    'WHERE created_at > ? OR (created_at = ? AND session_id > ?) '
+                    'ORDER BY created_at, session_id LIMIT ?',
+                    (created_at.isoformat(), created_at.isoformat(), session_id, limit)
+                ).fetchall()
+        return [
+            (row['session_id'], row['file_path'], datetime.fromisoformat(row['created_at']))
+            for row in rows
+        ]
+
+    def count(self) -> int:
+        with self._lock:
+            return self.conn.execute('SELECT COUNT(*) FROM sessions').fetchone()[0]
+
+    def file_paths(self) -> Set[str]:
+        with self._lock:
+            rows = self.conn.execute('SELECT file_path FROM sessions').fetchall()
+        return {row['file_path'] for row in rows}
+
+    @staticmethod
+    def _to_session(row: sqlite3.Row) -> Dict:
+        return {
+            'file_path': row['file_path'],
+            'metadata': json.loads(row['metadata']),
+            'created_at': datetime.fromisoformat(row['created_at'])
+        }
+
+
+def create_session_store() -> SessionStore:
+    """설정에 따른 세션 저장소 생성"""
+    if settings.SESSION_STORE == 'sqlite':
+        return SQLiteSessionStore(settings.session_store_path)
+    return InMemorySessionStore()
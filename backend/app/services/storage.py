@@ -0,0 +1,351 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import logging
+import os
+import shutil
+import time
+import uuid
+
+from app.core.config import settings
+from app.services import tracing
+from app.services.cache import AudioCache, audio_cache
+from app.services.session import SessionManager, session_manager
+from app.services.youtube import VideoError
+
+logger = logging.getLogger(__name__)
+
+# 작업 파일명 접두사 길이 ("job_" + UUID), 같은 작업의 원본/결과/부분 파일을 묶는 데 사용
+JOB_PREFIX_LENGTH = len('job_') + 36
+
+# 조기 삭제 후보 세션 조회 단위
+EVICTION_PAGE_SIZE = 100
+
+
+class EvictionCandidates:
+    """
+    한 번의 공간 회수 동안 조기 삭제 후보 세션 순회 (next()는 스레드에서 호출)
+
+    세션을 생성 시각 순으로 페이지 단위로 조회하며 이미 지나간 세션은 다시 조회하지 않는다.
+    다른 경로와 inode를 공유해 건너뛴 세션은 inode별로 기억하고, 그 inode의 캐시 항목이
+    삭제됐을 때만 다시 확인한다.
+    """
+
+    def __init__(self, sessions: SessionManager, page_size: int = EVICTION_PAGE_SIZE):
+        self.sessions = sessions
+        self.page_size = page_size
+        self.cursor: Optional[Tuple[datetime, str]] = None  # 마지막으로 확인한 (생성 시각, 세션 ID)
+        self.shared: Dict[Tuple[int, int], List[Tuple[str, str]]] = {}  # inode -> [(세션 ID, 파일 경로)]
+        self.retry: List[Tuple[str, str]] = []
+
+    def next(self) -> Optional[str]:
+        """
+        삭제하면 디스크가 회수되는 가장 오래된 세션 (동기 함수)
+
+        Returns:
+            Session ID or None if no candidate is left
+        """
+        while self.retry:
+            session_id, file_path = self.retry.pop()
+            if self._reclaimable(session_id, file_path):
+                return session_id
+
+        while True:
+            rows = self.sessions.oldest_sessions(self.page_size, after=self.cursor)
+            if not rows:
+                return None
+            for session_id, file_path, created_at in rows:
+                self.cursor = (created_at, session_id)
+                if self._reclaimable(session_id, file_path):
+                    return session_id
+
+    def release_inode(self, inode: Tuple[int, int]) -> None:
+        """inode를 공유하던 캐시 파일이 삭제됨 (그 세션들을 다시 후보로)"""
+        self.retry.extend(self.shared.pop(inode, []))
+
+    def _reclaimable(self, session_id: str, file_path: str) -> bool:
+        try:
+            stat_result = os.stat(file_path)
+        except OSError:
+            return False  # 아직 파일을 연결하기 전인 세션이거나 이미 삭제됨
+        if stat_result.st_nlink > 1:
+            self.shared.setdefault((stat_result.st_dev, stat_result.st_ino), []).append((session_id, file_path))
+            return False
+        return True
+
+
+class StorageManager:
+    """
+    temp_files 용량 관리
+
+    - 사용량 = temp_files 실측 크기(세션 파일, 음원 캐시, 작업 파일) + 진행 중인 작업 예약량 중 아직 쓰지 않은 부분
+    - 하드링크(캐시 히트 세션, 같은 작업을 기다린 세션)는 inode 기준으로 한 번만 집계
+    - 작업 시작 전에 영상 길이 x 비트레이트로 필요한 공간을 예약
+    - 사용량이 임계치를 넘거나 디스크 여유 공간이 부족하면 공간을 회수:
+      다른 경로와 inode를 공유하지 않는 오래된 세션 -> 오래 사용되지 않은 캐시 항목 순
+      (삭제해도 디스크가 회수되지 않는 세션은 삭제하지 않음, 후보 확인은 스레드에서)
+    - 작업 시작 시에는 최근 실측을 재사용하고, 오래됐거나 예약하면 할당량을 넘을 때만 다시 측정
+    - 그래도 공간이 없으면 다운로드 전에 VideoError('storage')로 실패 (디스크가 가득 찬 뒤의 불명확한 에러 방지)
+
+    실측 크기는 디렉토리 전체 기준이라 SESSION_STORE=sqlite로 여러 워커가 temp_files를 공유해도
+    다른 워커의 세션과 작업 파일이 포함된다. 예약량은 프로세스별이므로 다른 워커가 예약만 하고
+    아직 쓰지 않은 공간은 포함되지 않는다 (디스크 여유 공간 하한으로 보완).
+    """
+
+    def __init__(
+        self,
+        sessions: SessionManager,
+        cache: Optional[AudioCache],
+        root: str,
+        quota_bytes: int,
+        pressure_percent: int,
+        min_free_bytes: int,
+        measure_interval: float = 0
+    ):
+        self.sessions = sessions
+        self.cache = cache
+        self.root = root
+        self.quota_bytes = quota_bytes
+        self.pressure_bytes = quota_bytes * pressure_percent // 100
+        self.min_free_bytes = min_free_bytes
+        self.measure_interval = measure_interval
+        self.reservations: Dict[str, Tuple[str, int]] = {}  # 토큰 -> (작업 파일 접두사, 예약량)
+        self.reserved_bytes = 0
+        self.disk_bytes = 0  # 마지막 실측 크기 (inode 기준)
+        self.cache_bytes = 0
+        self.job_bytes: Dict[str, int] = {}  # 작업 파일 접두사 -> 지금까지 쓴 크기
+        self.measured_at: Optional[float] = None
+        self.evicted_sessions = 0
+        self.evicted_cache_entries = 0
+        self.evicted_bytes = 0
+        self.rejected = 0
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def estimate_bytes(duration: Optional[float], bitrate: Optional[int] = None) -> int:
+        """
+        작업에 필요한 공간 추정
+
+        원본 파일과 변환 결과가 동시에 존재하므로 2배 (파이프 스트리밍이면 결과만),
+        원본 비트레이트를 모르므로 출력 비트레이트 기준으로 계산하고 커버 이미지 여유분을 더한다.
+        """
+        bitrate = bitrate or settings.AUDIO_BITRATE
+        copies = 1 if settings.PIPELINE_STREAMING else 2
+        return int((duration or 0) * bitrate * 1000 / 8 * copies) + 1024 * 1024
+
+    async def reserve(self, nbytes: int, job_prefix: str = '') -> str:
+        """
+        공간 예약 (필요하면 오래된 세션과 캐시 항목을 먼저 삭제)
+
+        Args:
+            nbytes: 예약할 바이트 수
+            job_prefix: 작업 파일명 접두사 (job_<job_id>, 이미 쓴 크기만큼 예약량에서 차감)
+
+        Returns:
+            예약 토큰 (작업이 끝나면 release() 호출)
+
+        Raises:
+            VideoError: If there is not enough space even after eviction
+        """
+        async with self._lock:
+            # 작업 시작마다 디렉토리를 순회하지 않도록 최근 실측 재사용
+            # (삭제나 거절은 항상 새로 측정한 값을 기준으로 판단)
+            if self._stale() or not self._fits(nbytes):
+                await self.refresh()
+            await self._evict_until(lambda: self._fits(nbytes))
+
+            if not self._fits(nbytes):
+                self.rejected += 1
+                raise VideoError('저장 공간이 부족합니다. 잠시 후 다시 시도해주세요', 'storage')
+
+            token = str(uuid.uuid4())
+            self.reservations[token] = (job_prefix, nbytes)
+            self.reserved_bytes += nbytes
+            return token
+
+    def release(self, token: str) -> None:
+        """
+        예약 해제
+
+        다음 실측 전까지는 아직 쓰지 않았던 예약량도 결과 파일로 남았다고 보고 실측 크기에 더한다
+        (실측을 재사용하는 동안 사용량을 적게 보지 않도록).
+        """
+        reservation = self.reservations.pop(token, None)
+        if reservation is not None:
+            job_prefix, nbytes = reservation
+            self.reserved_bytes -= nbytes
+            self.disk_bytes += max(0, nbytes - self.job_bytes.get(job_prefix, 0))
+
+    async def relieve_pressure(self) -> int:
+        """
+        사용량이 임계치를 넘었으면 오래된 세션과 캐시 항목 삭제
+
+        Returns:
+            Number of evicted sessions
+        """
+        async with self._lock:
+            await self.refresh()
+            before = self.evicted_sessions
+            await self._evict_until(lambda: not self._under_pressure())
+            return self.evicted_sessions - before
+
+    async def refresh(self) -> None:
+        """temp_files 사용량 실측 (디렉토리 순회는 스레드에서 실행)"""
+        loop = asyncio.get_running_loop()
+        cache_dir = self.cache.cache_dir if self.cache is not None else None
+        self.disk_bytes, self.cache_bytes, self.job_bytes = await loop.run_in_executor(
+            None, tracing.bind(self._measure), self.root, cache_dir
+        )
+        self.measured_at = time.time()
+
+    def used_bytes(self) -> int:
+        """실측 크기 + 예약량 중 아직 쓰지 않은 부분"""
+        pending = sum(
+            max(0, nbytes - self.job_bytes.get(prefix, 0))
+            for prefix, nbytes in self.reservations.values()
+        )
+        return self.disk_bytes + pending
+
+    def get_stats(self) -> Dict:
+        """용량 상태"""
+        disk = self._disk_usage()
+        return {
+            'quota_bytes': self.quota_bytes,
+            'used_bytes': self.used_bytes(),
+            'disk_bytes': self.disk_bytes,
+            'cache_bytes': self.cache_bytes,
+            'reserved_bytes': self.reserved_bytes,
+            'reservations': len(self.reservations),
+            'measured_at': self.measured_at,
+            'disk_free_bytes': disk.free if disk else None,
+            'under_pressure': self._under_pressure(),
+            'evicted_sessions': self.evicted_sessions,
+            'evicted_cache_entries': self.evicted_cache_entries,
+            'evicted_bytes': self.evicted_bytes,
+            'rejected': self.rejected
+        }
+
+    @staticmethod
+    def _measure(root: str, cache_dir: Optional[str]) -> Tuple[int, int, Dict[str, int]]:
+        """
+        디렉토리 사용량 실측 (동기 함수)
+
+        같은 inode는 한 번만 더한다. 캐시 디렉토리를 먼저 순회하므로
+        캐시 파일과 하드링크된 세션은 캐시 크기로 집계된다.
+
+        Returns:
+            (전체 바이트, 캐시 바이트, 작업 파일 접두사별 바이트)
+        """
+        seen = set()
+        job_bytes: Dict[str, int] = {}
+
+        def walk(directory: str, skip: Optional[str] = None) -> int:
+            total = 0
+            try:
+                it = os.scandir(directory)
+            except OSError:
+                return 0
+            with it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.path != skip:
+                                total += walk(entry.path, skip)
+                            continue
+                        if not entry.is_file(follow_symlinks=False):
+                            continue
+                        stat = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue  # 순회 중 삭제됨
+                    if entry.name.startswith('job_'):
+                        prefix = entry.name[:JOB_PREFIX_LENGTH]
+                        job_bytes[prefix] = job_bytes.get(prefix, 0) + stat.st_size
+                    inode = (stat.st_dev, stat.st_ino)
+                    if inode in seen:
+                        continue
+                    seen.add(inode)
+                    total += stat.st_size
+            return total
+
+        cache_bytes = walk(cache_dir) if cache_dir else 0
+        total = cache_bytes + walk(root, skip=cache_dir)
+        return total, cache_bytes, job_bytes
+
+    def _fits(self, nbytes: int) -> bool:
+        """예약 후에도 할당량과 디스크 여유 공간 기준을 만족하는지"""
+        if self.used_bytes() + nbytes > self.quota_bytes:
+            return False
+        disk = self._disk_usage()
+        return disk is None or disk.free - nbytes >= self.min_free_bytes
+
+    def _under_pressure(self) -> bool:
+        if self.used_bytes() > self.pressure_bytes:
+            return True
+        disk = self._disk_usage()
+        return disk is not None and disk.free < self.min_free_bytes
+
+    async def _evict_until(self, satisfied) -> None:
+        """
+        조건을 만족할 때까지 공간 회수
+
+        inode를 공유하지 않는 오래된 세션을 먼저 삭제하고, 없으면 가장 오래 사용되지 않은
+        캐시 항목을 삭제한다 (캐시와 공유하던 세션은 그 뒤 단독 파일이 되어 삭제 대상이 됨).
+        """
+        loop = asyncio.get_running_loop()
+        candidates = EvictionCandidates(self.sessions)
+        while not satisfied():
+            session_id = await loop.run_in_executor(None, candidates.next)
+            if session_id is not None:
+                await self._evict_session(session_id)
+                continue
+            if not await self._evict_cache_entry(candidates):
+                return
+
+    async def _evict_session(self, session_id: str) -> None:
+        count, reclaimed = await self.sessions.delete_sessions([session_id])
+        if not count:
+            return  # 다른 워커가 먼저 삭제함
+        self.evicted_sessions += count
+        self._reclaimed(reclaimed)
+        logger.info(f"Evicted session {session_id} under storage pressure ({reclaimed} bytes)")
+
+    async def _evict_cache_entry(self, candidates: EvictionCandidates) -> bool:
+        """가장 오래 사용되지 않은 캐시 항목 삭제"""
+        if self.cache is None:
+            return False
+        evicted = await asyncio.get_running_loop().run_in_executor(None, self.cache.evict_oldest)
+        if evicted is None:
+            return False
+        reclaimed, inode = evicted
+        if inode is not None:
+            candidates.release_inode(inode)
+        self.evicted_cache_entries += 1
+        self.cache_bytes = max(0, self.cache_bytes - reclaimed)
+        self._reclaimed(reclaimed)
+        return True
+
+    def _stale(self) -> bool:
+        """실측이 없거나 measure_interval보다 오래됨"""
+        return self.measured_at is None or time.time() - self.measured_at > self.measure_interval
+
+    def _reclaimed(self, nbytes: int) -> None:
+        self.evicted_bytes += nbytes
+        self.disk_bytes = max(0, self.disk_bytes - nbytes)
+
+    def _disk_usage(self):
+        try:
+            return shutil.disk_usage(self.root)
+        except OSError:
+            return None
+
+
+# 싱글톤 인스턴스
+storage_manager = StorageManager(
+    session_manager,
+    audio_cache if settings.AUDIO_CACHE_ENABLED else None,
+    settings.upload_path,
+    quota_bytes=settings.STORAGE_QUOTA_MB * 1024 * 1024,
+    pressure_percent=settings.STORAGE_PRESSURE_PERCENT,
+    min_free_bytes=settings.STORAGE_MIN_FREE_MB * 1024 * 1024,
+    measure_interval=settings.STORAGE_MEASURE_INTERVAL_SECONDS
+)
@@ -0,0 +1,128 @@
+from PIL import Image
+from typing import Tuple
+import asyncio
+import io
+
+from app.core.config import settings
+from app.services import tracing
+from app.services.cache import TTLCache
+from app.services.executors import thumbnail_executor
+from app.services.http import http_session
+
+
+def detect_image_mime(data: bytes) -> str:
+    """이미지 바이트의 MIME 타입 추정 (매직 넘버 기반)"""
+    if data.startswith(b'\xff\xd8\xff'):
+        return 'image/jpeg'
+    if data.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'image/png'
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return 'image/webp'
+    return 'application/octet-stream'
+
+
+class ThumbnailService:
+    """썸네일 다운로드, 커버용 JPEG 정규화, 영상 ID별 캐시"""
+
+    def __init__(self):
+        # 썸네일 다운로드/변환 전용 executor (기본 executor와 분리)
+        self.executor = thumbnail_executor
+        self.cache = TTLCache(
+            settings.THUMBNAIL_CACHE_MAX_ENTRIES,
+            settings.THUMBNAIL_CACHE_TTL_SECONDS
+        )
+
+    async def get_cover(self, video_id: str, thumbnail_url: str) -> Tuple[bytes, str]:
+        """
+        커버 이미지 가져오기 (캐시 → 다운로드 → 정규화)
+
+        Args:
+            video_id: YouTube video ID (캐시 키)
+            thumbnail_url: Thumbnail image URL
+
+        Returns:
+            (image data, MIME type)
+
+        Raises:
+            Exception: If download fails
+        """
+        key = f"{video_id}_{settings.THUMBNAIL_SIZE}"
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        loop = asyncio.get_event_loop()
+        with tracing.span('thumbnail.fetch', video_id=video_id) as span:
+            cover = await loop.run_in_executor(
+                self.executor,
+                tracing.bind(self._fetch_and_normalize),
+                thumbnail_url
+            )
+            span.update(bytes=len(cover[0]), mime=cover[1])
+
+        self.cache.set(key, cover)
+        return cover
+
+    def _fetch_and_normalize(self, url: str) -> Tuple[bytes, str]:
+        """다운로드 후 정규화 (동기 함수)"""
+        data = self._download(url)
+        try:
+            return self.normalize(data, settings.THUMBNAIL_SIZE, settings.THUMBNAIL_JPEG_QUALITY), 'image/jpeg'
+        except Exception:
+            # 변환할 수 없는 이미지는 원본 그대로 (MIME은 실제 포맷 기준)
+            return data, detect_image_mime(data)
+
+    @staticmethod
+    def normalize(data: bytes, size: int, quality: int) -> bytes:
+        """
+        정사각형 JPEG로 변환 (가운데 기준 자르기 후 축소)
+
+        Args:
+            data: 원본 이미지 (JPEG/PNG/WebP 등)
+            size: 최대 한 변 길이 (px)
+            quality: JPEG 품질 (1-95)
+
+        Returns:
+            JPEG image data
+        """
+        with Image.open(io.BytesIO(data)) as image:
+            image = image.convert('RGB')
+
+            width, height = image.size
+            side = min(width, height)
+            left = (width - side) // 2
+            top = (height - side) // 2
+            image = image.crop((left, top, left + side, top + side))
+
+            if side > size:
+                image = image.resize((size, size), Image.LANCZOS)
+
+            output = io.BytesIO()
+            image.save(output, format='JPEG', quality=quality, optimize=True)
+            return output.getvalue()
+
+    @staticmethod
+    def _download(url: str) -> bytes:
+        """
+        썸네일 다운로드 (동기 함수)
+
+        Args:
+            url: Thumbnail URL
+
+        Returns:
+            Image data as bytes
+
+        Raises:
+            Exception: If download fails
+        """
+        try:
+            # 커넥션 풀 재사용 (keep-alive)
+            response = http_session.get(url, timeout=settings.HTTP_TIMEOUT_SECONDS)
+            response.raise_for_status()
+            return response.content
+        except Exception as e:
+            raise Exception(f'썸네일 다운로드 실패: {str(e)}')
+
+
+# 싱글톤 인스턴스
+thumbnail_service = ThumbnailService()
@@ -0,0 +1,220 @@
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import cProfile
+import json
+import logging
+import pstats
+import threading
+import time
+import uuid
+
+from app.core.config import settings
+
+# 구조화 로그 (JSON 한 줄씩, 일반 로그 형식과 관계없이 항상 JSON)
+trace_logger = logging.getLogger('app.trace')
+
+# 표준 LogRecord 속성 (JSON 출력 시 extra 필드와 구분)
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """로그 레코드를 JSON 한 줄로 출력 (extra로 넘긴 필드 포함)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                payload[key] = value
+        if record.exc_info:
+            payload['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+def setup_logging() -> None:
+    """
+    로깅 설정 (앱 시작 시 한 번)
+
+    trace 로거는 항상 JSON으로 출력하고, 나머지 로그는 LOG_FORMAT(text | json)을 따른다.
+    """
+    formatter = JsonFormatter()
+    if settings.LOG_FORMAT == 'json':
+        for handler in logging.getLogger().handlers:
+            handler.setFormatter(formatter)
+
+    if not trace_logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(formatter)
+        trace_logger.addHandler(handler)
+        trace_logger.setLevel(logging.INFO)
+        trace_logger.propagate = False
+
+
+class JobProfile:
+    """
+    작업 하나의 cProfile (작업 코드를 실행한 스레드마다 별도 프로파일러, 저장 시 합침)
+
+    cProfile은 활성화한 스레드만 측정하므로 bind()를 거친 호출(다운로드, 변환, 태그 등)을 측정한다.
+    """
+
+    def __init__(self):
+        self._profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self._active = threading.local()
+
+    def run(self, fn: Callable, *args, **kwargs):
+        # 같은 스레드에서 중첩 호출되면 바깥 프로파일러가 이미 측정 중
+        if getattr(self._active, 'on', False):
+            return fn(*args, **kwargs)
+
+        profile = cProfile.Profile()
+        self._active.on = True
+        try:
+            return profile.runcall(fn, *args, **kwargs)
+        finally:
+            self._active.on = False
+            with self._lock:
+                self._profiles.append(profile)
+
+    def dump(self, path: str) -> bool:
+        """pstats 파일로 저장 (snakeviz, python -m pstats로 열 수 있음)"""
+        with self._lock:
+            profiles = list(self._profiles)
+        if not profiles:
+            return False
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        stats.dump_stats(path)
+        return True
+
+
+class Trace:
+    """요청/작업 추적 정보 (contextvar로 전달)"""
+
+    def __init__(self, trace_id: str, job_id: Optional[str] = None, profile: Optional[JobProfile] = None):
+        self.trace_id = trace_id
+        self.job_id = job_id
+        self.profile = profile
+
+
+_current: ContextVar[Optional[Trace]] = ContextVar('trace', default=None)
+
+
+def current() -> Optional[Trace]:
+    """현재 추적 정보 (없으면 None)"""
+    return _current.get()
+
+
+@contextmanager
+def start(
+    trace_id: Optional[str] = None,
+    job_id: Optional[str] = None,
+    profile: Optional[JobProfile] = None
+) -> Iterator[Trace]:
+    """
+    추적 시작 (with 블록 안에서 실행되는 코드와 그 안에서 만든 태스크에 전달)
+
+    Args:
+        trace_id: 추적 ID (없으면 현재 추적 ID를 이어받고, 그것도 없으면 생성)
+        job_id: 추출 작업 ID
+        profile: 이 작업의 프로파일 (bind()를 거친 호출을 측정)
+    """
+    parent = _current.get()
+    if trace_id is None:
+        trace_id = parent.trace_id if parent else uuid.uuid4().hex
+    trace = Trace(trace_id, job_id, profile)
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        try:
+            _current.reset(token)
+        except ValueError:
+            pass  # 다른 컨텍스트에서 닫힌 비동기 생성기 (GC 등)
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Dict[str, Any]]:
+    """
+    소요 시간 측정 구간 (끝나면 JSON 로그 한 줄)
+
+    with 블록에서 반환된 dict에 값을 넣으면 로그 필드로 함께 기록된다.
+
+    Example:
+        with tracing.span('youtube.download', format='mp3') as fields:
+            fields['bytes'] = size
+    """
+    fields: Dict[str, Any] = dict(attrs)
+    if not settings.TRACING_ENABLED:
+        yield fields
+        return
+
+    started = time.perf_counter()
+    status = 'ok'
+    try:
+        yield fields
+    except BaseException as e:
+        status = 'cancelled' if type(e).__name__ in ('CancelledError', 'JobCancelledError') else 'error'
+        fields['error'] = str(e)[:500]
+        if getattr(e, 'category', None):
+            fields['error_category'] = e.category
+        raise
+    finally:
+        _emit('span', name, duration_ms=round((time.perf_counter() - started) * 1000, 2), status=status, **fields)
+
+
+def event(name: str, **fields: Any) -> None:
+    """시점 이벤트 (작업 대기/시작/완료/취소 등)"""
+    if settings.TRACING_ENABLED:
+        _emit('event', name, **fields)
+
+
+def profiling_requested(header: Optional[str]) -> bool:
+    """
+    작업 프로파일 여부 (PROFILE_MODE: off | header | all)
+
+    Args:
+        header: X-Profile 요청 헤더 값 (PROFILE_MODE=header일 때 1/true면 프로파일)
+    """
+    if settings.PROFILE_MODE == 'all':
+        return True
+    return settings.PROFILE_MODE == 'header' and (header or '').lower() in ('1', 'true', 'yes')
+
+
+def bind(fn: Callable) -> Callable:
+    """
+    스레드 풀에서 실행할 함수에 현재 추적 컨텍스트 연결
+
+    run_in_executor는 contextvar를 전달하지 않으므로 제출 전에 감싼다.
+    작업 프로파일이 켜져 있으면 실행 스레드에서 cProfile로 측정한다.
+    """
+    context = copy_context()
+    trace = context.get(_current)
+    if trace is None:
+        return fn
+
+    def run(*args, **kwargs):
+        if trace.profile is not None:
+            return context.run(trace.profile.run, fn, *args, **kwargs)
+        return context.run(fn, *args, **kwargs)
+
+    return run
+
+
+def _emit(kind: str, name: str, **fields: Any) -> None:
+    # {"span": "youtube.download", ...} 또는 {"event": "job.started", ...}
+    trace = _current.get()
+    extra = {kind: name}
+    if trace is not None:
+        extra['trace_id'] = trace.trace_id
+        if trace.job_id:
+            extra['job_id'] = trace.job_id
+    extra.update(fields)
+    trace_logger.info(name, extra=extra)
@@ -0,0 +1,281 @@
+from typing import BinaryIO, Callable, Dict, List, Optional, Tuple
+import asyncio
+import os
+import subprocess
+import tempfile
+import threading
+
+from app.core.config import settings
+from app.services import tracing
+from app.services.executors import download_executor, transcode_executor
+from app.services.youtube import VideoError
+
+# 출력 포맷별 FFmpeg 인코더, 확장자, MIME 타입, 재인코딩 없이 복사 가능한 원본 코덱,
+# 변환 중 파일을 앞에서부터 재생할 수 있는지 (m4a는 faststart로 끝에서 moov를 다시 씀)
+CODECS: Dict[str, Dict] = {
+    'mp3': {'encoder': 'libmp3lame', 'ext': 'mp3', 'mime': 'audio/mpeg', 'copy_from': ('mp3',), 'streamable': True},
+    'm4a': {'encoder': 'aac', 'ext': 'm4a', 'mime': 'audio/mp4', 'copy_from': ('aac', 'mp4a'), 'streamable': False},
+    'opus': {'encoder': 'libopus', 'ext': 'opus', 'mime': 'audio/ogg', 'copy_from': ('opus',), 'streamable': True},
+}
+
+
+def can_stream_copy(audio_format: str, source_codec: Optional[str]) -> bool:
+    """
+    원본 코덱을 그대로 담을 수 있는지 확인 (mp4a.40.2 같은 코덱 문자열 포함)
+
+    Args:
+        audio_format: 출력 포맷
+        source_codec: 원본 오디오 코덱 (yt-dlp acodec)
+    """
+    codec = CODECS.get(audio_format)
+    if not (settings.STREAM_COPY_ENABLED and codec and source_codec):
+        return False
+    return source_codec.lower().split('.')[0] in codec['copy_from']
+
+
+class TranscodeService:
+    """
+    FFmpeg 변환 단계 (다운로드와 분리된 전용 풀에서 실행)
+
+    FFmpeg는 별도 자식 프로세스로 실행되므로 CPU 코어 수만큼의 워커가
+    네트워크 다운로드 슬롯을 점유하지 않고 인코딩을 병렬로 처리한다.
+    로컬 파일만 다루므로 네트워크 없이 테스트할 수 있다.
+    """
+
+    def __init__(self):
+        self.executor = transcode_executor
+
+    async def transcode(
+        self,
+        source_path: str,
+        output_path: str,
+        audio_format: Optional[str] = None,
+        bitrate: Optional[int] = None,
+        threads: Optional[int] = None,
+        duration: Optional[float] = None,
+        source_codec: Optional[str] = None,
+        progress_callback: Optional[Callable[[float], None]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> str:
+        """
+        음원 변환 (원본 코덱이 출력 포맷과 같으면 재인코딩 없이 컨테이너만 변경)
+
+        Args:
+            source_path: 원본 음원 파일 경로
+            output_path: Output file path (without extension)
+            audio_format: 출력 포맷 (mp3, m4a, opus, 기본값: settings.AUDIO_FORMAT)
+            bitrate: 비트레이트 (kbps, 기본값: settings.AUDIO_BITRATE)
+            threads: FFmpeg 스레드 수 (기본값: settings.FFMPEG_THREADS)
+            duration: 원본 길이 (초, 진행률 계산용)
+            source_codec: 원본 오디오 코덱 (알고 있는 경우, 스트림 복사 판단용)
+            progress_callback: 진행률(0-100) 콜백 (워커 스레드에서 호출)
+            cancel_event: 설정되면 FFmpeg 프로세스 종료
+
+        Returns:
+            Path to transcoded file
+
+        Raises:
+            VideoError: If transcoding fails or is cancelled
+        """
+        command, dest_path = self._build_command(
+            source_path, output_path, audio_format, bitrate, threads, source_codec
+        )
+
+        loop = asyncio.get_event_loop()
+        with tracing.span('ffmpeg.transcode', format=audio_format, copy='copy' in command):
+            await loop.run_in_executor(
+                self.executor,
+                tracing.bind(self._run_ffmpeg),
+                command,
+                duration,
+                progress_callback,
+                None,
+                cancel_event
+            )
+        return dest_path
+
+    async def transcode_stream(
+        self,
+        feeder: Callable[[BinaryIO], None],
+        output_path: str,
+        audio_format: Optional[str] = None,
+        bitrate: Optional[int] = None,
+        threads: Optional[int] = None,
+        source_codec: Optional[str] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> str:
+        """
+        파이프 입력 변환 (다운로드하면서 FFmpeg stdin으로 전달, 중간 파일 없음)
+
+        feeder는 다운로드 풀에서 실행되어 FFmpeg stdin에 원본 바이트를 쓰고,
+        FFmpeg 프로세스는 변환 풀에서 관리된다. 디스크에는 결과 파일만 한 번 기록된다.
+
+        Args:
+            feeder: stdin에 원본을 쓰는 동기 함수 (예: youtube_service.stream_source)
+            output_path: Output file path (without extension)
+            audio_format: 출력 포맷 (mp3, m4a, opus, 기본값: settings.AUDIO_FORMAT)
+            bitrate: 비트레이트 (kbps, 기본값: settings.AUDIO_BITRATE)
+            threads: FFmpeg 스레드 수 (기본값: settings.FFMPEG_THREADS)
+            source_codec: 원본 오디오 코덱 (스트림 복사 판단용)
+            cancel_event: 설정되면 FFmpeg 프로세스 종료 (feeder도 같은 신호로 중단해야 함)
+
+        Returns:
+            Path to transcoded file
+
+        Raises:
+            VideoError: If download or transcoding fails or is cancelled
+        """
+        command, dest_path = self._build_command(
+            'pipe:0', output_path, audio_format, bitrate, threads, source_codec
+        )
+
+        loop = asyncio.get_event_loop()
+        with tracing.span('ffmpeg.transcode_stream', format=audio_format, copy='copy' in command):
+            await loop.run_in_executor(
+                self.executor,
+                tracing.bind(self._run_ffmpeg),
+                command,
+                None,
+                None,
+                feeder,
+                cancel_event
+            )
+        return dest_path
+
+    @staticmethod
+    def _build_command(
+        source: str,
+        output_path: str,
+        audio_format: Optional[str],
+        bitrate: Optional[int],
+        threads: Optional[int],
+        source_codec: Optional[str]
+    ) -> Tuple[List[str], str]:
+        """FFmpeg 명령어와 결과 파일 경로 생성"""
+        audio_format = audio_format or settings.AUDIO_FORMAT
+        bitrate = bitrate or settings.AUDIO_BITRATE
+        threads = threads or settings.FFMPEG_THREADS
+
+        codec = CODECS.get(audio_format)
+        if codec is None:
+            raise VideoError(f'지원하지 않는 포맷입니다: {audio_format}', 'transcode')
+
+        dest_path = f"{output_path}.{codec['ext']}"
+        command = [settings.FFMPEG_PATH, '-hide_banner', '-loglevel', 'error', '-y']
+        if source != 'pipe:0':
+            command.append('-nostdin')  # 파이프 입력일 때는 stdin을 읽어야 함
+        command += ['-i', source, '-vn', '-map_metadata', '-1']
+
+        if can_stream_copy(audio_format, source_codec):
+            # 리먹스만 수행 (디코딩/인코딩 생략)
+            command += ['-c:a', 'copy']
+        else:
+            command += [
+                '-c:a', codec['encoder'], '-b:a', f'{bitrate}k',
+                '-threads', str(threads)
+            ]
+
+        if codec['ext'] == 'm4a':
+            # moov atom을 앞으로 (다운로드 중 재생 가능)
+            command += ['-movflags', '+faststart']
+
+        command += ['-progress', 'pipe:1', '-nostats', dest_path]
+        return command, dest_path
+
+    @staticmethod
+    def _run_ffmpeg(
+        command: list,
+        duration: Optional[float],
+        progress_callback: Optional[Callable[[float], None]],
+        feeder: Optional[Callable[[BinaryIO], None]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> None:
+        """
+        FFmpeg 실행 (동기 함수, -progress 출력으로 진행률 계산, 취소 시 프로세스 종료)
+
+        stderr는 임시 파일로 받는다. 손상된 원본에서 디코딩 에러가 대량으로 출력되어도
+        stdout 읽기와 서로 막히지 않고, 실패 시 마지막 부분만 에러 메시지에 담는다.
+        """
+        stderr_file = tempfile.TemporaryFile()
+        try:
+            try:
+                process = subprocess.Popen(
+                    command,
+                    stdin=subprocess.PIPE if feeder else subprocess.DEVNULL,
+                    stdout=subprocess.PIPE,
+                    stderr=stderr_file
+                )
+            except OSError as e:
+                raise VideoError(f'FFmpeg 실행 실패: {str(e)}', 'transcode')
+
+            feed_future = None
+            if feeder:
+                feed_future = download_executor.submit(tracing.bind(TranscodeService._feed), feeder, process)
+
+            if cancel_event is not None:
+                # 출력이 없는 구간(입력 대기 등)에도 취소되도록 별도 스레드에서 감시
+                threading.Thread(
+                    target=TranscodeService._watch_cancel,
+                    args=(process, cancel_event),
+                    daemon=True
+                ).start()
+
+            for line in process.stdout:
+                if not (progress_callback and duration and line.startswith(b'out_time_us=')):
+                    continue
+                try:
+                    elapsed = int(line.split(b'=', 1)[1]) / 1_000_000
+                except ValueError:
+                    continue  # out_time_us=N/A
+                progress_callback(min(100.0, elapsed / duration * 100))
+
+            returncode = process.wait()
+
+            # 다운로드 실패가 원인이면 다운로드 에러를 우선 보고
+            if feed_future is not None:
+                feed_future.result()
+
+            if cancel_event is not None and cancel_event.is_set():
+                raise VideoError('작업이 취소되었습니다', 'cancelled')
+
+            if returncode != 0:
+                stderr = TranscodeService._read_tail(stderr_file, 4096).decode('utf-8', errors='replace')
+                raise VideoError(f'음원 변환 실패: {stderr.strip()[-500:]}', 'transcode')
+        finally:
+            stderr_file.close()
+
+    @staticmethod
+    def _read_tail(file: BinaryIO, limit: int) -> bytes:
+        """파일의 마지막 limit 바이트"""
+        size = file.seek(0, os.SEEK_END)
+        file.seek(max(0, size - limit))
+        return file.read()
+
+    @staticmethod
+    def _watch_cancel(process: subprocess.Popen, cancel_event: threading.Event) -> None:
+        """취소 신호가 오면 FFmpeg 종료 (프로세스가 끝나면 감시 종료)"""
+        while process.poll() is None:
+            if cancel_event.wait(0.25):
+                process.kill()
+                return
+
+    @staticmethod
+    def _feed(feeder: Callable[[BinaryIO], None], process: subprocess.Popen) -> None:
+        """원본을 FFmpeg stdin에 쓰고 닫기 (다운로드 풀에서 실행)"""
+        sink = process.stdin
+        try:
+            feeder(sink)
+        except BrokenPipeError:
+            pass  # FFmpeg가 먼저 종료됨 (종료 코드로 보고)
+        except BaseException:
+            process.kill()
+            raise
+        finally:
+            try:
+                sink.close()
+            except BrokenPipeError:
+                pass
+
+
+# 싱글톤 인스턴스
+transcode_service = TranscodeService()
@@ -1,19 +1,46 @@
 import yt_dlp
-from typing import Dict, Optional, Callable
+from typing import BinaryIO, Dict, List, Optional, Callable, Tuple
 import os
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import re
+import threading
+import time
 from app.core.config import settings
+from app.services import metrics, tracing
+from app.services.cache import TTLCache
+from app.services.executors import metadata_executor, download_executor
+from app.services.http import http_session
+from app.utils.youtube_url import YouTubeURL, parse_youtube_url
+
+_VIDEO_ID_RE = re.compile(r'^[A-Za-z0-9_-]{11}$')
+
+# 출력 포맷별 원본 스트림 선택 (같은 코덱을 우선 받아 재인코딩 없이 복사)
+SOURCE_FORMATS = {
+    'm4a': 'bestaudio[ext=m4a]/bestaudio/best',
+    'opus': 'bestaudio[acodec=opus]/bestaudio/best',
+}
 
 
 class VideoError(Exception):
     """영상 관련 에러"""
-    pass
+
+    # 다시 시도해도 결과가 같은 에러 (부정 캐시 대상)
+    PERMANENT_CATEGORIES = ('private', 'unavailable', 'copyright')
+
+    def __init__(self, message: str, category: str = 'unknown'):
+        super().__init__(message)
+        self.category = category
+
+    @property
+    def is_permanent(self) -> bool:
+        return self.category in self.PERMANENT_CATEGORIES
 
 
 class YouTubeService:
     def __init__(self):
-        self.executor = ThreadPoolExecutor(max_workers=3)
+        # 메타데이터 조회와 다운로드는 서로 다른 풀에서 실행
+        self.metadata_executor = metadata_executor
+        self.download_executor = download_executor
 
         # 쿠키 파일 처리
         self.cookie_file = None
@@ -40,9 +67,15 @@ class YouTubeService:
         if self.cookie_file:
             self.ydl_opts_preview['cookiefile'] = self.cookie_file
 
+        # 영상 정보 캐시 (/preview 후 /extract 시 재조회 방지)
+        self.info_cache = TTLCache(
+            settings.VIDEO_INFO_CACHE_MAX_ENTRIES,
+            settings.VIDEO_INFO_CACHE_TTL_SECONDS
+        )
+
     async def get_video_info(self, url: str) -> Dict:
         """
-        영상 정보 미리보기 (다운로드 없이 메타데이터만)
+        영상 정보 미리보기 (다운로드 없이 메타데이터만, 캐시 사용)
 
         Args:
             url: YouTube video URL
@@ -53,22 +86,132 @@ class YouTubeService:
         Raises:
             VideoError: If video is unavailable or private
         """
+        parsed = self.parse_url(url)
+        key = parsed.video_id
+        cached = self.info_cache.get(key)
+        if isinstance(cached, VideoError):
+            raise VideoError(str(cached), cached.category)
+        if cached is not None:
+            return dict(cached)
+
+        try:
+            with tracing.span('youtube.info', video_id=key):
+                video_info = await self._fetch_video_info(parsed)
+        except VideoError as e:
+            # 비공개/삭제 영상 등은 짧게 캐시
+            if e.is_permanent:
+                self.info_cache.set(key, e, settings.VIDEO_INFO_CACHE_NEGATIVE_TTL_SECONDS)
+            raise
+
+        self.info_cache.set(key, video_info)
+        return dict(video_info)
+
+    async def resolve_entries(self, urls: List[str], max_items: int) -> List[Dict]:
+        """
+        배치 추출 대상 영상 목록 (영상 URL은 네트워크 없이, 재생목록은 flat extract_info 한 번으로 펼침)
+
+        재생목록 항목 중 제목/길이가 있는 영상은 정보 캐시에 미리 넣어
+        항목마다 extract_info를 다시 실행하지 않는다.
+
+        Args:
+            urls: 영상 또는 재생목록 URL 목록
+            max_items: 최대 영상 수 (초과분은 제외)
+
+        Returns:
+            [{'video_id', 'url', 'title'}] (중복 영상 제외, 입력 순서 유지)
+
+        Raises:
+            VideoError: If a URL is invalid or a playlist cannot be loaded
+        """
+        entries: List[Dict] = []
+        seen = set()
+
+        for url in urls:
+            if len(entries) >= max_items:
+                break
+
+            parsed = parse_youtube_url(url)
+            if parsed is None:
+                raise VideoError(f'올바른 YouTube URL이 아닙니다: {url}', 'invalid_url')
+
+            if parsed.video_id:
+                candidates = [{'video_id': parsed.video_id, 'title': None}]
+            else:
+                candidates = await self._fetch_playlist_entries(parsed, max_items - len(entries))
+
+            for candidate in candidates:
+                if candidate['video_id'] in seen or len(entries) >= max_items:
+                    continue
+                seen.add(candidate['video_id'])
+                entries.append({
+                    **candidate,
+                    'url': YouTubeURL(video_id=candidate['video_id']).canonical_url
+                })
+
+        return entries
+
+    async def _fetch_playlist_entries(self, parsed: YouTubeURL, limit: int) -> List[Dict]:
+        """재생목록 항목 조회 (flat, 영상별 페이지 요청 없음)"""
+        opts = {
+            **self.ydl_opts_preview,
+            'extract_flat': 'in_playlist',
+            'playlistend': limit
+        }
+
+        try:
+            loop = asyncio.get_event_loop()
+            with tracing.span('youtube.playlist', playlist_id=parsed.playlist_id, limit=limit):
+                info = await loop.run_in_executor(
+                    self.metadata_executor,
+                    tracing.bind(self._extract_with_opts),
+                    parsed.canonical_url,
+                    opts
+                )
+        except yt_dlp.utils.DownloadError as e:
+            raise VideoError(f'재생목록을 불러올 수 없습니다: {str(e)}', 'unavailable')
+        except Exception as e:
+            raise VideoError(f'재생목록 조회 중 오류가 발생했습니다: {str(e)}')
+
+        entries = []
+        for entry in info.get('entries') or []:
+            video_id = entry.get('id')
+            if not video_id or not _VIDEO_ID_RE.match(video_id):
+                continue
+
+            # 비공개/삭제 항목은 길이가 없음 (캐시하지 않고 추출 시 에러로 보고)
+            if entry.get('title') and entry.get('duration'):
+                if self.info_cache.get(video_id) is None:
+                    duration = int(entry['duration'])
+                    self.info_cache.set(video_id, {
+                        'video_id': video_id,
+                        'title': entry['title'],
+                        'thumbnail_url': self._get_best_thumbnail(entry) or f'https://i.ytimg.com/vi/{video_id}/hqdefault.jpg',
+                        'duration': duration,
+                        'channel': entry.get('channel') or entry.get('uploader') or 'Unknown',
+                        'warning': 'long_video' if duration > 1800 else None
+                    })
+
+            entries.append({'video_id': video_id, 'title': entry.get('title')})
+        return entries
+
+    async def _fetch_video_info(self, parsed: YouTubeURL) -> Dict:
+        """yt-dlp로 영상 정보 조회"""
         try:
             loop = asyncio.get_event_loop()
             info = await loop.run_in_executor(
-                self.executor,
-                self._extract_info,
-                url,
+                self.metadata_executor,
+                tracing.bind(self._extract_info),
+                parsed.canonical_url,
                 False  # download=False
             )
 
             # 비공개/삭제 체크
             if info.get('is_private'):
-                raise VideoError('비공개 영상입니다')
+                raise VideoError('비공개 영상입니다', 'private')
 
             availability = info.get('availability', '')
             if availability not in ['public', 'unlisted', '']:
-                raise VideoError('비공개 또는 삭제된 영상입니다')
+                raise VideoError('비공개 또는 삭제된 영상입니다', 'unavailable')
 
             # 썸네일 URL 추출 (최고 해상도)
             thumbnail_url = self._get_best_thumbnail(info)
@@ -78,6 +221,7 @@ class YouTubeService:
             warning = 'long_video' if duration > 1800 else None
 
             return {
+                'video_id': parsed.video_id,
                 'title': info.get('title', 'Unknown'),
                 'thumbnail_url': thumbnail_url,
                 'duration': duration,
@@ -85,40 +229,50 @@ class YouTubeService:
                 'warning': warning
             }
 
+        except VideoError:
+            raise
         except yt_dlp.utils.DownloadError as e:
             error_msg = str(e).lower()
             if 'private video' in error_msg:
-                raise VideoError('비공개 영상입니다')
+                raise VideoError('비공개 영상입니다', 'private')
             elif 'video unavailable' in error_msg or 'video not available' in error_msg:
-                raise VideoError('삭제되었거나 존재하지 않는 영상입니다')
+                raise VideoError('삭제되었거나 존재하지 않는 영상입니다', 'unavailable')
             elif 'copyright' in error_msg:
-                raise VideoError('저작권 제한으로 다운로드할 수 없습니다')
+                raise VideoError('저작권 제한으로 다운로드할 수 없습니다', 'copyright')
             else:
-                raise VideoError(f'영상을 불러올 수 없습니다: {str(e)}')
+                raise VideoError(f'영상을 불러올 수 없습니다: {str(e)}', 'download')
         except Exception as e:
             raise VideoError(f'영상 정보를 가져오는 중 오류가 발생했습니다: {str(e)}')
 
-    async def download_audio(
+    async def download_source(
         self,
         url: str,
         output_path: str,
-        progress_callback: Optional[Callable] = None
-    ) -> str:
+        audio_format: Optional[str] = None,
+        progress_callback: Optional[Callable] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Tuple[str, Optional[str]]:
         """
-        음원 다운로드 (MP3 192kbps)
+        원본 음원 스트림 다운로드 (변환 없음, 변환은 transcode_service에서 별도 실행)
 
         Args:
             url: YouTube video URL
             output_path: Output file path (without extension)
+            audio_format: 최종 출력 포맷 (같은 코덱의 스트림을 우선 선택)
             progress_callback: Optional callback for progress updates
+            cancel_event: 설정되면 진행 훅에서 다운로드 중단 (부분 파일은 호출 측에서 정리)
 
         Returns:
-            Path to downloaded MP3 file
+            (원본 파일 경로 (webm/m4a 등), 원본 오디오 코덱)
 
         Raises:
-            VideoError: If download fails
+            VideoError: If download fails or is cancelled
         """
         def progress_hook(d):
+            # yt-dlp는 훅의 예외를 그대로 전파하므로 다운로드 스레드가 즉시 중단됨
+            if cancel_event is not None and cancel_event.is_set():
+                raise VideoError('작업이 취소되었습니다', 'cancelled')
+
             if progress_callback and d['status'] == 'downloading':
                 # yt-dlp progress format
                 downloaded = d.get('downloaded_bytes', 0)
@@ -136,12 +290,7 @@ class YouTubeService:
                     })
 
         ydl_opts = {
-            'format': 'bestaudio/best',
-            'postprocessors': [{
-                'key': 'FFmpegExtractAudio',
-                'preferredcodec': 'mp3',
-                'preferredquality': '192',
-            }],
+            'format': SOURCE_FORMATS.get(audio_format or settings.AUDIO_FORMAT, 'bestaudio/best'),
             'outtmpl': f"{output_path}.%(ext)s",
             'quiet': False,
             'no_warnings': False,
@@ -149,7 +298,9 @@ class YouTubeService:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
             },
             'force_ipv4': True,
-            'progress_hooks': [progress_hook] if progress_callback else [],
+            # 파일 수정 시각을 영상 업로드 시각으로 바꾸지 않음 (고아 파일 정리가 수정 시각 기준)
+            'updatetime': False,
+            'progress_hooks': [progress_hook] if progress_callback or cancel_event else [],
         }
 
         if self.cookie_file:
@@ -157,41 +308,193 @@ class YouTubeService:
 
         try:
             loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                self.executor,
-                self._download_with_opts,
-                url,
-                ydl_opts
-            )
-
-            # MP3 파일 경로 반환 (.mp3 확장자 추가)
-            mp3_path = f"{output_path}.mp3"
-            if not os.path.exists(mp3_path):
-                # 디버깅을 위해 디렉토리 내용 확인
-                dir_path = os.path.dirname(output_path)
-                files = os.listdir(dir_path) if os.path.exists(dir_path) else []
-                raise VideoError(f'음원 파일 생성에 실패했습니다. (Files in {dir_path}: {files})')
-
-            return mp3_path
-
+            with tracing.span('youtube.download', format=audio_format) as span:
+                source_path, source_codec = await loop.run_in_executor(
+                    self.download_executor,
+                    tracing.bind(self._download_with_opts),
+                    self.parse_url(url).canonical_url,
+                    ydl_opts
+                )
+
+                if not source_path or not os.path.exists(source_path):
+                    # 디버깅을 위해 디렉토리 내용 확인
+                    dir_path = os.path.dirname(output_path)
+                    files = os.listdir(dir_path) if os.path.exists(dir_path) else []
+                    raise VideoError(f'음원 파일 생성에 실패했습니다. (Files in {dir_path}: {files})', 'download')
+
+                size = os.path.getsize(source_path)
+                span.update(bytes=size, acodec=source_codec)
+
+            metrics.bytes_downloaded.inc(size)
+            return source_path, source_codec
+
+        except VideoError:
+            raise
         except yt_dlp.utils.DownloadError as e:
             error_msg = str(e).lower()
             if 'copyright' in error_msg:
-                raise VideoError('저작권 제한으로 다운로드할 수 없습니다')
+                raise VideoError('저작권 제한으로 다운로드할 수 없습니다', 'copyright')
             else:
-                raise VideoError(f'다운로드 실패: {str(e)}')
+                raise VideoError(f'다운로드 실패: {str(e)}', 'download')
         except Exception as e:
             raise VideoError(f'음원 다운로드 중 오류가 발생했습니다: {str(e)}')
 
+    async def resolve_source(self, url: str, audio_format: Optional[str] = None) -> Dict:
+        """
+        다운로드 없이 원본 음원 스트림 URL 조회 (파이프 스트리밍용)
+
+        Args:
+            url: YouTube video URL
+            audio_format: 최종 출력 포맷 (같은 코덱의 스트림을 우선 선택)
+
+        Returns:
+            Dict with url, http_headers, acodec, filesize
+
+        Raises:
+            VideoError: If the stream cannot be resolved
+        """
+        opts = {
+            **self.ydl_opts_preview,
+            'format': SOURCE_FORMATS.get(audio_format or settings.AUDIO_FORMAT, 'bestaudio/best')
+        }
+
+        try:
+            loop = asyncio.get_event_loop()
+            with tracing.span('youtube.resolve', format=audio_format):
+                info = await loop.run_in_executor(
+                    self.metadata_executor,
+                    tracing.bind(self._extract_with_opts),
+                    self.parse_url(url).canonical_url,
+                    opts
+                )
+        except VideoError:
+            raise
+        except yt_dlp.utils.DownloadError as e:
+            if 'copyright' in str(e).lower():
+                raise VideoError('저작권 제한으로 다운로드할 수 없습니다', 'copyright')
+            raise VideoError(f'다운로드 실패: {str(e)}', 'download')
+        except Exception as e:
+            raise VideoError(f'음원 스트림 조회 중 오류가 발생했습니다: {str(e)}')
+
+        # 단일 포맷이 선택된 경우에만 직접 URL이 있음 (영상+음성 병합 포맷은 불가)
+        if not info.get('url') or info.get('requested_formats'):
+            raise VideoError('스트리밍 가능한 음원 포맷이 없습니다', 'download')
+
+        return {
+            'url': info['url'],
+            'http_headers': info.get('http_headers') or {},
+            'acodec': info.get('acodec'),
+            'filesize': info.get('filesize') or info.get('filesize_approx')
+        }
+
+    @staticmethod
+    def stream_source(
+        source: Dict,
+        sink: BinaryIO,
+        progress_callback: Optional[Callable] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> None:
+        """
+        원본 음원을 받아 그대로 sink(FFmpeg stdin)에 쓰기 (동기 함수, 중간 파일 없음)
+
+        YouTube는 큰 단일 요청의 속도를 제한하므로 STREAM_CHUNK_BYTES 단위 Range 요청으로 나눠 받는다.
+        진행 정보는 download_source의 progress_callback과 같은 형식으로 전달한다.
+
+        Args:
+            source: resolve_source() 결과
+            sink: 쓰기 대상 (FFmpeg stdin)
+            progress_callback: Optional callback for progress updates
+            cancel_event: 설정되면 다음 청크에서 중단
+
+        Raises:
+            VideoError: If download fails or is cancelled
+        """
+        chunk_bytes = settings.STREAM_CHUNK_BYTES
+        total = source.get('filesize') or 0
+        downloaded = 0
+        started = time.monotonic()
+
+        with tracing.span('youtube.stream', acodec=source.get('acodec')) as span:
+            while not total or downloaded < total:
+                headers = {
+                    **source['http_headers'],
+                    'Range': f'bytes={downloaded}-{downloaded + chunk_bytes - 1}'
+                }
+                try:
+                    response = http_session.get(
+                        source['url'],
+                        headers=headers,
+                        stream=True,
+                        timeout=settings.HTTP_TIMEOUT_SECONDS
+                    )
+                    response.raise_for_status()
+                except Exception as e:
+                    raise VideoError(f'다운로드 실패: {str(e)}', 'download')
+
+                with response:
+                    # Content-Range: bytes 0-1023/12345
+                    content_range = response.headers.get('Content-Range', '')
+                    if '/' in content_range and content_range.rsplit('/', 1)[1].isdigit():
+                        total = int(content_range.rsplit('/', 1)[1])
+
+                    received = 0
+                    for chunk in response.iter_content(chunk_size=64 * 1024):
+                        if cancel_event is not None and cancel_event.is_set():
+                            raise VideoError('작업이 취소되었습니다', 'cancelled')
+                        # FFmpeg가 먼저 종료되면 BrokenPipeError (에러는 FFmpeg 종료 코드로 보고)
+                        sink.write(chunk)
+                        metrics.bytes_downloaded.inc(len(chunk))
+                        received += len(chunk)
+                        downloaded += len(chunk)
+
+                        if progress_callback and total > 0:
+                            elapsed = time.monotonic() - started
+                            speed = downloaded / elapsed if elapsed > 0 else 0
+                            progress_callback({
+                                'status': 'downloading',
+                                'downloaded_bytes': downloaded,
+                                'total_bytes': total,
+                                'percent': min(100.0, downloaded / total * 100),
+                                'speed': speed,
+                                'eta': int((total - downloaded) / speed) if speed > 0 else 0
+                            })
+
+                # Range를 무시하고 전체를 보낸 경우 또는 마지막 조각
+                if response.status_code != 206 or received < chunk_bytes:
+                    break
+            span['bytes'] = downloaded
+
+    @staticmethod
+    def parse_url(url: str) -> YouTubeURL:
+        """
+        영상 URL 검증 및 파싱 (executor 작업 전에 잘못된 입력 차단)
+
+        Raises:
+            VideoError: If the URL is not a YouTube video URL
+        """
+        parsed = parse_youtube_url(url)
+        if parsed is None or not parsed.video_id:
+            raise VideoError('올바른 YouTube 영상 URL이 아닙니다', 'invalid_url')
+        return parsed
+
     def _extract_info(self, url: str, download: bool = False) -> Dict:
         """yt-dlp를 사용하여 정보 추출 (동기 함수)"""
         with yt_dlp.YoutubeDL(self.ydl_opts_preview) as ydl:
             return ydl.extract_info(url, download=download)
 
-    def _download_with_opts(self, url: str, opts: Dict):
-        """yt-dlp를 사용하여 다운로드 (동기 함수)"""
+    def _extract_with_opts(self, url: str, opts: Dict) -> Dict:
+        """지정한 옵션으로 정보 추출 (동기 함수)"""
+        with yt_dlp.YoutubeDL(opts) as ydl:
+            return ydl.extract_info(url, download=False)
+
+    def _download_with_opts(self, url: str, opts: Dict) -> Tuple[Optional[str], Optional[str]]:
+        """yt-dlp를 사용하여 다운로드 후 (파일 경로, 오디오 코덱) 반환 (동기 함수)"""
         with yt_dlp.YoutubeDL(opts) as ydl:
-            ydl.download([url])
+            info = ydl.extract_info(url, download=True)
+            downloads = info.get('requested_downloads') or []
+            if downloads:
+                return downloads[0].get('filepath'), downloads[0].get('acodec') or info.get('acodec')
+            return ydl.prepare_filename(info), info.get('acodec')
 
     def _get_best_thumbnail(self, info: Dict) -> str:
         """최고 해상도 썸네일 URL 추출"""
@@ -204,7 +507,7 @@ class YouTubeService:
         # 해상도별 정렬 (높은 순)
         sorted_thumbnails = sorted(
             thumbnails,
-            key=lambda t: (t.get('width', 0) * t.get('height', 0)),
+            key=lambda t: ((t.get('width') or 0) * (t.get('height') or 0)),
             reverse=True
         )
 
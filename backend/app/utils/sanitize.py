@@ -1,7 +1,61 @@
+from functools import lru_cache
 import re
 import unicodedata
 
+# 같은 제목이 반복되는 경우 (캐시/합류한 작업, 재생목록 재요청, 복구된 세션)
+_CACHE_SIZE = 1024
+
+# 파일시스템 금지 문자
+_FORBIDDEN_CHARS = frozenset('<>:"/\\|?*')
+
+# 이모지 (유니코드 범위 기반)
+# U+24C2-U+1F251 범위는 이모지 외 문자(한글, 한자 등)도 포함하지만 기존 파일명과 같도록 그대로 유지
+_EMOJI_RANGES = (
+    (0x1F600, 0x1F64F),  # 이모티콘
+    (0x1F300, 0x1F5FF),  # 기호 & 픽토그램
+    (0x1F680, 0x1F6FF),  # 교통 & 지도
+    (0x1F1E0, 0x1F1FF),  # 국기
+    (0x2702, 0x27B0),
+    (0x24C2, 0x1F251),
+)
+
+_BRACKETED = re.compile(r'\s*[\(\[].*?[\)\]]')
+_LEADING_ARTIST = re.compile(r'^[^\-]+-\s*')
+_ARTIST_NOISE = re.compile(r'\s*(?:official|mv|video|audio|ver\.|ver|version)\s*', re.IGNORECASE)
+
+# 패턴 매칭: 곡명 + cover/커버 키워드 + by + 아티스트 (순서대로 시도)
+_COVER_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    # "곡명 - 원곡가수 COVER by 아티스트" 형식
+    r'^(?:[^\-]+\s*-\s*)?(.+?)\s*(?:cover|커버)\s*by\s*(.+?)(?:\s*[\(\[].*?[\)\]]|$)',
+    # "곡명 covered by 아티스트" 형식
+    r'^(?:[^\-]+\s*-\s*)?(.+?)\s*(?:covered|커버드)\s*by\s*(.+?)(?:\s*[\(\[].*?[\)\]]|$)',
+    # "곡명 (아티스트 cover)" 형식
+    r'^(?:[^\-]+\s*-\s*)?(.+?)\s*[\(\[]\s*(.+?)\s*(?:cover|커버)\s*[\)\]]',
+))
+
+
+class _RemovedChars(dict):
+    """
+    str.translate용 삭제 테이블 (금지 문자, 제어 문자, 이모지)
+
+    처음 보는 문자만 분류해 저장하므로 이후 호출은 C 수준의 사전 조회만 한다.
+    """
+
+    def __missing__(self, codepoint: int):
+        removed = (
+            chr(codepoint) in _FORBIDDEN_CHARS
+            or unicodedata.category(chr(codepoint))[0] == 'C'
+            or any(start <= codepoint <= end for start, end in _EMOJI_RANGES)
+        )
+        value = None if removed else codepoint
+        self[codepoint] = value
+        return value
+
+
+_REMOVED_CHARS = _RemovedChars()
 
+
+@lru_cache(maxsize=_CACHE_SIZE)
 def sanitize_filename(filename: str) -> str:
     """
     파일명 자동 정리
@@ -16,31 +70,11 @@ def sanitize_filename(filename: str) -> str:
     Returns:
         정리된 파일명
     """
-    # 1. 파일시스템 금지 문자 제거
-    forbidden_chars = r'[<>:"/\\|?*]'
-    filename = re.sub(forbidden_chars, '', filename)
-
-    # 2. 제어 문자 제거
-    filename = ''.join(char for char in filename if unicodedata.category(char)[0] != 'C')
-
-    # 3. 이모지 제거 (유니코드 범위 기반)
-    emoji_pattern = re.compile(
-        "["
-        u"\U0001F600-\U0001F64F"  # 이모티콘
-        u"\U0001F300-\U0001F5FF"  # 기호 & 픽토그램
-        u"\U0001F680-\U0001F6FF"  # 교통 & 지도
-        u"\U0001F1E0-\U0001F1FF"  # 국기
-        u"\U00002702-\U000027B0"
-        u"\U000024C2-\U0001F251"
-        "]+", flags=re.UNICODE
-    )
-    filename = emoji_pattern.sub('', filename)
-
-    # 4. 연속 공백을 단일 공백으로
-    filename = re.sub(r'\s+', ' ', filename)
-
-    # 5. 앞뒤 공백 제거
-    filename = filename.strip()
+    # 1~3. 파일시스템 금지 문자, 제어 문자, 이모지 제거 (한 번에)
+    filename = filename.translate(_REMOVED_CHARS)
+
+    # 4~5. 연속 공백을 단일 공백으로, 앞뒤 공백 제거
+    filename = ' '.join(filename.split())
 
     # 6. 점(.)으로 시작하는 파일명 방지 (숨김 파일)
     if filename.startswith('.'):
@@ -61,6 +95,7 @@ def sanitize_filename(filename: str) -> str:
     return filename
 
 
+@lru_cache(maxsize=_CACHE_SIZE)
 def parse_cover_filename(youtube_title: str) -> str:
     """
     유튜브 제목에서 '곡명 (cover by. 아티스트)' 형식 추출 후 정리
@@ -75,39 +110,19 @@ def parse_cover_filename(youtube_title: str) -> str:
     Returns:
         파싱 및 정리된 파일명
     """
-    # 패턴 매칭: 곡명 + cover/커버 키워드 + by + 아티스트
-    patterns = [
-        # "곡명 - 원곡가수 COVER by 아티스트" 형식
-        r'^(?:[^\-]+\s*-\s*)?(.+?)\s*(?:cover|커버|COVER|Cover)\s*(?:by|BY|By)\s*(.+?)(?:\s*[\(\[].*?[\)\]]|$)',
-        # "곡명 covered by 아티스트" 형식
-        r'^(?:[^\-]+\s*-\s*)?(.+?)\s*(?:covered|커버드|COVERED)\s*(?:by|BY|By)\s*(.+?)(?:\s*[\(\[].*?[\)\]]|$)',
-        # "곡명 (아티스트 cover)" 형식
-        r'^(?:[^\-]+\s*-\s*)?(.+?)\s*[\(\[]\s*(.+?)\s*(?:cover|커버|COVER|Cover)\s*[\)\]]',
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, youtube_title, re.IGNORECASE)
+    for pattern in _COVER_PATTERNS:
+        match = pattern.search(youtube_title)
         if match:
-            song = match.group(1).strip()
-            artist = match.group(2).strip()
-
-            # 원곡 가수 제거 (하이픈 앞부분)
-            song = re.sub(r'^[^\-]+-\s*', '', song).strip()
-
-            # 괄호/대괄호 내용 제거
-            song = re.sub(r'\s*[\(\[].*?[\)\]]', '', song).strip()
-            artist = re.sub(r'\s*[\(\[].*?[\)\]]', '', artist).strip()
+            # 원곡 가수 제거 (하이픈 앞부분), 괄호/대괄호 내용 제거
+            song = _LEADING_ARTIST.sub('', match.group(1).strip()).strip()
+            song = _BRACKETED.sub('', song).strip()
+            artist = _BRACKETED.sub('', match.group(2).strip()).strip()
 
             # Official, MV 등 불필요한 단어 제거
-            artist = re.sub(r'\s*(?:official|mv|video|audio|ver\.|ver|version)\s*', '', artist, flags=re.IGNORECASE).strip()
-
-            filename = f"{song} (cover by. {artist})"
+            artist = _ARTIST_NOISE.sub('', artist).strip()
 
             # 자동 정리 적용
-            return sanitize_filename(filename)
-
-    # 파싱 실패 시 원본 제목 사용 (괄호 내용은 제거)
-    cleaned_title = re.sub(r'\s*[\(\[].*?[\)\]]', '', youtube_title).strip()
+            return sanitize_filename(f"{song} (cover by. {artist})")
 
-    # 자동 정리 적용
-    return sanitize_filename(cleaned_title)
+    # 파싱 실패 시 원본 제목 사용 (괄호 내용은 제거), 자동 정리 적용
+    return sanitize_filename(_BRACKETED.sub('', youtube_title).strip())
@@ -0,0 +1,105 @@
+from typing import NamedTuple, Optional
+from urllib.parse import parse_qsl
+import re
+
+# YouTube URL 파싱용 정규식 (모듈 로드 시 한 번만 컴파일)
+_URL_RE = re.compile(
+    r'^(?:https?://)?(?:(?:www|m|music)\.)?'
+    r'(?P<host>youtube\.com|youtube-nocookie\.com|youtu\.be)'
+    r'(?P<path>/[^?#]*)?(?:\?(?P<query>[^#]*))?(?:#(?P<fragment>.*))?$',
+    re.IGNORECASE
+)
+_PATH_ID_RE = re.compile(r'^/(?:shorts|embed|v|e|live)/(?P<id>[A-Za-z0-9_-]{11})/?$')
+_SHORT_PATH_ID_RE = re.compile(r'^/(?P<id>[A-Za-z0-9_-]{11})/?$')
+_VIDEO_ID_RE = re.compile(r'^[A-Za-z0-9_-]{11}$')
+_PLAYLIST_ID_RE = re.compile(r'^[A-Za-z0-9_-]{2,64}$')
+_TIMESTAMP_RE = re.compile(r'^(?:(?P<h>\d+)h)?(?:(?P<m>\d+)m)?(?:(?P<s>\d+)s?)?$')
+
+
+class YouTubeURL(NamedTuple):
+    """파싱된 YouTube URL"""
+    video_id: Optional[str]
+    playlist_id: Optional[str] = None
+    start_time: Optional[int] = None  # 초
+
+    @property
+    def canonical_url(self) -> str:
+        """yt-dlp에 전달할 정규화된 URL (영상 단위)"""
+        if self.video_id:
+            return f"https://www.youtube.com/watch?v={self.video_id}"
+        return f"https://www.youtube.com/playlist?list={self.playlist_id}"
+
+
+def parse_youtube_url(url: str) -> Optional[YouTubeURL]:
+    """
+    YouTube URL에서 영상 ID, 재생목록 ID, 시작 시간 추출 (네트워크 요청 없음)
+
+    지원 형식:
+    - https://www.youtube.com/watch?v=ID&t=30
+    - https://m.youtube.com/watch?v=ID, https://music.youtube.com/watch?v=ID
+    - https://youtu.be/ID?t=1m30s
+    - https://www.youtube.com/shorts/ID, /embed/ID, /live/ID
+    - https://www.youtube.com/playlist?list=PLAYLIST_ID
+    - 11자리 영상 ID
+
+    Args:
+        url: 사용자가 입력한 URL
+
+    Returns:
+        YouTubeURL or None if not a YouTube video/playlist URL
+    """
+    url = url.strip()
+
+    if _VIDEO_ID_RE.match(url):
+        return YouTubeURL(video_id=url)
+
+    match = _URL_RE.match(url)
+    if not match:
+        return None
+
+    host = match.group('host').lower()
+    path = match.group('path') or '/'
+    params = dict(parse_qsl(match.group('query') or ''))
+
+    video_id = None
+    if host == 'youtu.be':
+        id_match = _SHORT_PATH_ID_RE.match(path)
+        if id_match:
+            video_id = id_match.group('id')
+    elif path.rstrip('/') == '/watch':
+        candidate = params.get('v', '')
+        if _VIDEO_ID_RE.match(candidate):
+            video_id = candidate
+    else:
+        id_match = _PATH_ID_RE.match(path)
+        if id_match:
+            video_id = id_match.group('id')
+
+    playlist_id = params.get('list')
+    if playlist_id and not _PLAYLIST_ID_RE.match(playlist_id):
+        playlist_id = None
+
+    if not video_id and not playlist_id:
+        return None
+
+    return YouTubeURL(
+        video_id=video_id,
+        playlist_id=playlist_id,
+        start_time=_parse_timestamp(params.get('t') or params.get('start'))
+    )
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[int]:
+    """'90', '90s', '1m30s', '1h2m3s' 형식을 초 단위로 변환"""
+    if not value:
+        return None
+
+    match = _TIMESTAMP_RE.match(value)
+    if not match or not any(match.groups()):
+        return None
+
+    return (
+        int(match.group('h') or 0) * 3600
+        + int(match.group('m') or 0) * 60
+        + int(match.group('s') or 0)
+    )
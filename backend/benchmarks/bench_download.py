@@ -0,0 +1,159 @@
+"""
+/api/download 전송 경로 벤치마크
+
+기존 경로(POST + FileResponse, 64KB 청크)와 새 경로(GET + RangeFileResponse)의
+처리량과 서버 CPU 사용량을 비교하고, 끊긴 다운로드를 이어받을 때 전송량 차이를 측정한다.
+
+서버는 별도 프로세스의 uvicorn으로 실행되며, 서버 CPU 시간은 /cpu 엔드포인트
+(time.process_time)로 측정한다. 네트워크나 외부 서비스 없이 로컬에서 실행된다.
+
+사용법 (backend 디렉토리에서):
+    python -m benchmarks.bench_download --size-mb 100 --clients 4 --rounds 3
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def create_app(file_path: str):
+    """두 전송 경로를 같은 파일로 제공하는 벤치마크용 앱"""
+    from fastapi import FastAPI, Request
+    from fastapi.responses import FileResponse
+
+    from app.api.responses import RangeFileResponse
+
+    app = FastAPI()
+
+    @app.post('/legacy')
+    async def legacy():
+        return FileResponse(path=file_path, filename='audio.mp3', media_type='audio/mpeg')
+
+    @app.get('/range')
+    async def ranged(request: Request):
+        return RangeFileResponse(
+            path=file_path,
+            filename='audio.mp3',
+            media_type='audio/mpeg',
+            stat_result=os.stat(file_path),
+            method=request.method
+        )
+
+    @app.get('/cpu')
+    async def cpu():
+        return {'cpu': time.process_time()}
+
+    return app
+
+
+def serve(file_path: str, port: int) -> None:
+    """서버 프로세스 진입점"""
+    import uvicorn
+    uvicorn.run(create_app(file_path), host='127.0.0.1', port=port, log_level='warning')
+
+
+def wait_ready(base_url: str, timeout: float = 15.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            requests.get(f'{base_url}/cpu', timeout=1)
+            return
+        except requests.ConnectionError:
+            time.sleep(0.1)
+    raise RuntimeError('server did not start')
+
+
+def fetch(method: str, url: str, headers: Dict = None) -> int:
+    """응답 본문을 모두 읽고 받은 바이트 수 반환"""
+    received = 0
+    with requests.request(method, url, headers=headers, stream=True) as response:
+        response.raise_for_status()
+        for chunk in response.iter_content(chunk_size=1024 * 1024):
+            received += len(chunk)
+    return received
+
+
+def run_scenario(base_url: str, name: str, method: str, path: str,
+                 clients: int, rounds: int, headers: Dict = None) -> Dict:
+    """동시 클라이언트로 rounds회 반복 다운로드"""
+    cpu_before = requests.get(f'{base_url}/cpu').json()['cpu']
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        futures = [
+            pool.submit(fetch, method, f'{base_url}{path}', headers)
+            for _ in range(clients * rounds)
+        ]
+        total_bytes = sum(f.result() for f in futures)
+
+    elapsed = time.perf_counter() - started
+    cpu = requests.get(f'{base_url}/cpu').json()['cpu'] - cpu_before
+
+    return {
+        'scenario': name,
+        'requests': clients * rounds,
+        'bytes': total_bytes,
+        'seconds': round(elapsed, 3),
+        'throughput_mb_s': round(total_bytes / elapsed / 1e6, 1),
+        'server_cpu_s': round(cpu, 3),
+        'cpu_ms_per_gb': round(cpu * 1000 / (total_bytes / 1e9), 1) if total_bytes else 0.0
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size-mb', type=int, default=100, help='test file size (MB)')
+    parser.add_argument('--clients', type=int, default=4, help='concurrent clients')
+    parser.add_argument('--rounds', type=int, default=3, help='downloads per client')
+    parser.add_argument('--port', type=int, default=8799)
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    size = args.size_mb * 1024 * 1024
+    fd, file_path = tempfile.mkstemp(suffix='.mp3')
+    with os.fdopen(fd, 'wb') as f:
+        block = os.urandom(1024 * 1024)
+        for _ in range(args.size_mb):
+            f.write(block)
+
+    server = multiprocessing.Process(target=serve, args=(file_path, args.port), daemon=True)
+    server.start()
+    base_url = f'http://127.0.0.1:{args.port}'
+
+    try:
+        wait_ready(base_url)
+        results: List[Dict] = [
+            run_scenario(base_url, 'legacy POST FileResponse', 'POST', '/legacy', args.clients, args.rounds),
+            run_scenario(base_url, 'GET RangeFileResponse', 'GET', '/range', args.clients, args.rounds),
+            # 절반 받은 뒤 연결이 끊긴 경우: 기존 경로는 전체를 다시 받아야 함
+            run_scenario(base_url, 'resume from 50% (legacy)', 'POST', '/legacy', args.clients, 1),
+            run_scenario(base_url, 'resume from 50% (Range)', 'GET', '/range', args.clients, 1,
+                         headers={'Range': f'bytes={size // 2}-'}),
+        ]
+    finally:
+        server.terminate()
+        server.join()
+        os.remove(file_path)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"file={args.size_mb}MB clients={args.clients} rounds={args.rounds}")
+    print(f"{'scenario':<28} {'MB/s':>8} {'cpu s':>8} {'cpu ms/GB':>10} {'MB sent':>9}")
+    for r in results:
+        print(f"{r['scenario']:<28} {r['throughput_mb_s']:>8} {r['server_cpu_s']:>8} "
+              f"{r['cpu_ms_per_gb']:>10} {r['bytes'] / 1e6:>9.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,413 @@
+"""
+추출 전체 경로 벤치마크 (미리보기 → 추출 SSE → 다운로드, 오프라인)
+
+서버는 별도 프로세스에서 실제 앱(app.main)으로 실행되고, yt_dlp.YoutubeDL만 로컬 픽스처를 제공하는
+FakeYoutubeDL로 바뀐다 (benchmarks/fixtures.py). 원본 음원과 썸네일은 로컬 HTTP 서버가
+연결마다 대역폭을 제한해 제공하므로, 다운로드 대기와 FFmpeg 변환, 썸네일 정규화, 태그 삽입,
+세션 생성까지 실제 코드 경로를 그대로 측정한다.
+
+측정 항목:
+    - 요청별 지연 시간 p50/p95/p99 (preview, extract 첫 이벤트, extract 완료, download)
+    - 분당 완료 작업 수
+    - 서버 CPU 시간 (앱 프로세스, FFmpeg 자식 프로세스 별도)과 최대 RSS
+
+결과는 JSON으로 저장해 커밋 간 비교할 수 있다 (--output, --compare).
+
+사용법 (backend 디렉토리에서, FFmpeg 필요):
+    python -m benchmarks.bench_e2e --jobs 40 --concurrency 8 --output before.json
+    python -m benchmarks.bench_e2e --jobs 40 --concurrency 8 --compare before.json
+    python -m benchmarks.bench_e2e --env PIPELINE_STREAMING=true --format opus
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixtures import FixtureServer, make_audio_fixture, make_thumbnail  # noqa: E402
+
+# 앱 기본값 중 벤치마크 측정을 흐리는 설정 (--env로 덮어쓸 수 있음)
+DEFAULT_ENV = {
+    'TRACING_ENABLED': 'false',  # 구간 로그 출력 비용 제외 (추적 오버헤드 측정 시 true)
+    'PIPELINE_FAST_PATH': 'true',
+}
+
+# 비교 대상 지표 (경로, 클수록 좋은지)
+COMPARE_METRICS = [
+    ('jobs.jobs_per_minute', True),
+    ('latency_ms.preview.p50', False),
+    ('latency_ms.preview.p95', False),
+    ('latency_ms.extract.p50', False),
+    ('latency_ms.extract.p95', False),
+    ('latency_ms.extract.p99', False),
+    ('latency_ms.download.p95', False),
+    ('server.cpu_s_per_job', False),
+    ('server.ffmpeg_cpu_s_per_job', False),
+    ('server.peak_rss_mb', False),
+]
+
+
+def serve(port: int, upload_dir: str, fixture: Dict, env: Dict[str, str]) -> None:
+    """서버 프로세스 진입점 (앱 import 전에 설정과 FakeYoutubeDL 적용)"""
+    os.environ.update(env)
+    os.environ['UPLOAD_DIR'] = upload_dir
+
+    from benchmarks.fixtures import install
+    install(**fixture)
+
+    import resource
+    import uvicorn
+    from app.main import app
+
+    @app.get('/bench/usage')
+    async def usage():
+        own = resource.getrusage(resource.RUSAGE_SELF)
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)  # 종료된 FFmpeg 프로세스
+        return {
+            'cpu_s': own.ru_utime + own.ru_stime,
+            'children_cpu_s': children.ru_utime + children.ru_stime,
+            'peak_rss_kb': own.ru_maxrss
+        }
+
+    uvicorn.run(app, host='127.0.0.1', port=port, log_level='warning')
+
+
+def wait_ready(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f'{base_url}/health', timeout=1).ok:
+                return
+        except requests.ConnectionError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError('server did not start')
+
+
+class LoadGenerator:
+    """동시 클라이언트로 작업마다 preview → extract(SSE) → download 실행"""
+
+    def __init__(self, base_url: str, audio_format: str):
+        self.base_url = base_url
+        self.audio_format = audio_format
+        self.samples: Dict[str, List[float]] = {
+            'preview': [], 'extract_first_event': [], 'extract': [], 'download': []
+        }
+        self.errors: Dict[str, int] = {}
+        self.completed = 0
+        self.downloaded_bytes = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def run(self, video_ids: List[str], concurrency: int) -> float:
+        """모든 작업 실행 후 경과 시간 (초) 반환"""
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for future in [pool.submit(self.run_job, video_id) for video_id in video_ids]:
+                future.result()
+        return time.perf_counter() - started
+
+    def run_job(self, video_id: str) -> None:
+        http = self._session()
+        youtube_url = f'https://www.youtube.com/watch?v={video_id}'
+
+        started = time.perf_counter()
+        response = http.post(f'{self.base_url}/api/preview', json={'youtube_url': youtube_url})
+        self._record('preview', started, response.ok, f'preview_{response.status_code}')
+        if not response.ok:
+            return
+
+        started = time.perf_counter()
+        session_id, error = None, None
+        with http.get(
+            f'{self.base_url}/api/extract',
+            params={'youtube_url': youtube_url, 'format': self.audio_format},
+            stream=True
+        ) as response:
+            if not response.ok:
+                self._record('extract', started, False, f'extract_{response.status_code}')
+                return
+            first = True
+            for line in response.iter_lines():
+                if not line.startswith(b'data: '):
+                    continue
+                if first:
+                    self._record('extract_first_event', started, True)
+                    first = False
+                event = json.loads(line[6:])
+                if event['step'] == 'complete':
+                    session_id = event['session_id']
+                    break
+                if event['step'] == 'error':
+                    error = event.get('error_detail') or 'error'
+                    break
+        self._record('extract', started, session_id is not None, f'extract_{error}')
+        if session_id is None:
+            return
+
+        started = time.perf_counter()
+        received = 0
+        with http.get(f'{self.base_url}/api/download/{session_id}', stream=True) as response:
+            for chunk in response.iter_content(chunk_size=256 * 1024):
+                received += len(chunk)
+        self._record('download', started, response.ok, f'download_{response.status_code}')
+
+        with self._lock:
+            self.downloaded_bytes += received
+            if response.ok:
+                self.completed += 1
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _record(self, name: str, started: float, ok: bool, error: Optional[str] = None) -> None:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            if ok:
+                self.samples[name].append(elapsed_ms)
+            else:
+                self.errors[error] = self.errors.get(error, 0) + 1
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """선형 보간 백분위수 (q: 0-100)"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def summarize(values: List[float]) -> Dict:
+    values = sorted(values)
+    return {
+        'count': len(values),
+        'p50': round(percentile(values, 50), 1),
+        'p95': round(percentile(values, 95), 1),
+        'p99': round(percentile(values, 99), 1),
+        'mean': round(sum(values) / len(values), 1) if values else 0.0,
+        'max': round(values[-1], 1) if values else 0.0
+    }
+
+
+def git_revision() -> Dict:
+    """현재 커밋 (결과 비교용, git이 없으면 None)"""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = bool(subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True, text=True
+        ).stdout.strip())
+        return {'commit': commit, 'dirty': dirty}
+    except (OSError, subprocess.CalledProcessError):
+        return {'commit': None, 'dirty': None}
+
+
+def fixture_duration(path: str, fallback: int) -> int:
+    """음원 길이 (초, 태그를 읽을 수 없으면 fallback)"""
+    try:
+        import mutagen
+        audio = mutagen.File(path)
+        return int(audio.info.length) if audio is not None else fallback
+    except Exception:
+        return fallback
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> bool:
+    """
+    기준 결과와 비교 출력
+
+    Returns:
+        threshold(%) 이상 나빠진 지표가 있으면 True
+    """
+    def lookup(result: Dict, path: str) -> Optional[float]:
+        for key in path.split('.'):
+            if not isinstance(result, dict) or key not in result:
+                return None
+            result = result[key]
+        return result
+
+    print(f"\ncompared with {baseline.get('git', {}).get('commit')} ({baseline.get('timestamp')})")
+    print(f"{'metric':<32} {'baseline':>10} {'current':>10} {'change':>8}")
+    regressed = False
+    for path, higher_is_better in COMPARE_METRICS:
+        before, after = lookup(baseline, path), lookup(current, path)
+        if before is None or after is None:
+            continue
+        change = (after - before) / before * 100 if before else 0.0
+        worse = -change if higher_is_better else change
+        flag = ' !' if worse >= threshold else ''
+        regressed = regressed or bool(flag)
+        print(f"{path:<32} {before:>10} {after:>10} {change:>+7.1f}%{flag}")
+    return regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=40, help='extractions to run')
+    parser.add_argument('--concurrency', type=int, default=8, help='concurrent clients')
+    parser.add_argument('--repeat-ratio', type=float, default=0.0,
+                        help='fraction of jobs that reuse an earlier video (cache / shared job path)')
+    parser.add_argument('--format', default='mp3', choices=['mp3', 'm4a', 'opus'], help='output format')
+    parser.add_argument('--fixture', help='source audio fixture (default: generated with FFmpeg)')
+    parser.add_argument('--fixture-format', default='webm', choices=['webm', 'm4a', 'mp3'],
+                        help='generated fixture container (webm=opus, m4a=aac)')
+    parser.add_argument('--duration', type=int, default=180, help='generated fixture length (seconds)')
+    parser.add_argument('--bandwidth-mbps', type=float, default=40.0,
+                        help='per-connection source bandwidth in Mbit/s (0 = unlimited)')
+    parser.add_argument('--info-latency-ms', type=float, default=150.0, help='simulated metadata lookup latency')
+    parser.add_argument('--ffmpeg', default='ffmpeg', help='FFmpeg binary for the fixture and the server')
+    parser.add_argument('--env', action='append', default=[], metavar='KEY=VALUE',
+                        help='server setting override (repeatable)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--port', type=int, default=8798)
+    parser.add_argument('--output', help='write results JSON to this file')
+    parser.add_argument('--compare', help='baseline results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='regression threshold in percent for --compare (exit code 1)')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='ytaudio-bench-')
+    upload_dir = os.path.join(workdir, 'temp_files')
+    os.makedirs(upload_dir)
+
+    env = dict(DEFAULT_ENV, FFMPEG_PATH=args.ffmpeg)
+    for item in args.env:
+        key, _, value = item.partition('=')
+        env[key] = value
+
+    if args.fixture:
+        fixture_path = args.fixture
+        duration = fixture_duration(fixture_path, args.duration)
+    else:
+        fixture_path = os.path.join(workdir, f'fixture.{args.fixture_format}')
+        make_audio_fixture(fixture_path, args.duration, args.ffmpeg)
+        duration = args.duration
+
+    fixtures = FixtureServer(fixture_path, make_thumbnail(), args.bandwidth_mbps * 1e6 / 8)
+    fixtures.start()
+
+    # 작업별 영상 ID (11자, repeat_ratio만큼 앞의 영상을 다시 요청)
+    rng = random.Random(args.seed)
+    video_ids: List[str] = []
+    for index in range(args.jobs):
+        if video_ids and rng.random() < args.repeat_ratio:
+            video_ids.append(rng.choice(video_ids))
+        else:
+            video_ids.append(f'bench{index:06d}')
+
+    server = multiprocessing.Process(
+        target=serve,
+        args=(args.port, upload_dir, {
+            'media_url': fixtures.media_url,
+            'thumbnail_base': fixtures.base_url,
+            'fixture_path': fixture_path,
+            'duration': duration,
+            'info_latency': args.info_latency_ms / 1000
+        }, env),
+        daemon=True
+    )
+    server.start()
+    base_url = f'http://127.0.0.1:{args.port}'
+
+    try:
+        wait_ready(base_url)
+        usage_before = requests.get(f'{base_url}/bench/usage').json()
+        load = LoadGenerator(base_url, args.format)
+        elapsed = load.run(video_ids, args.concurrency)
+        usage_after = requests.get(f'{base_url}/bench/usage').json()
+    finally:
+        server.terminate()
+        server.join()
+        fixtures.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    completed = max(load.completed, 1)
+    cpu = usage_after['cpu_s'] - usage_before['cpu_s']
+    ffmpeg_cpu = usage_after['children_cpu_s'] - usage_before['children_cpu_s']
+    result = {
+        'benchmark': 'e2e',
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'git': git_revision(),
+        'python': platform.python_version(),
+        'params': {
+            'jobs': args.jobs,
+            'concurrency': args.concurrency,
+            'repeat_ratio': args.repeat_ratio,
+            'format': args.format,
+            'fixture': os.path.basename(fixture_path),
+            'fixture_bytes': os.path.getsize(fixture_path) if os.path.exists(fixture_path) else None,
+            'duration_s': duration,
+            'bandwidth_mbps': args.bandwidth_mbps,
+            'info_latency_ms': args.info_latency_ms,
+            'env': env
+        },
+        'jobs': {
+            'completed': load.completed,
+            'failed': args.jobs - load.completed,
+            'errors': load.errors,
+            'seconds': round(elapsed, 2),
+            'jobs_per_minute': round(load.completed / elapsed * 60, 1),
+            'downloaded_mb': round(load.downloaded_bytes / 1e6, 1)
+        },
+        'latency_ms': {name: summarize(values) for name, values in load.samples.items()},
+        'server': {
+            'cpu_s': round(cpu, 2),
+            'ffmpeg_cpu_s': round(ffmpeg_cpu, 2),
+            'cpu_s_per_job': round(cpu / completed, 3),
+            'ffmpeg_cpu_s_per_job': round(ffmpeg_cpu / completed, 3),
+            # ru_maxrss는 프로세스 전체 기간의 최대값 (Linux: KB)
+            # 자식 프로세스의 값은 fork 직후 복사된 앱 메모리가 섞이므로 앱 프로세스만 기록
+            'peak_rss_mb': round(usage_after['peak_rss_kb'] / 1024, 1)
+        }
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        jobs = result['jobs']
+        print(f"jobs={args.jobs} concurrency={args.concurrency} format={args.format} "
+              f"fixture={result['params']['fixture']} ({duration}s) bandwidth={args.bandwidth_mbps}Mbps")
+        print(f"completed={jobs['completed']} failed={jobs['failed']} {jobs['errors'] or ''}")
+        print(f"{'request':<22} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+        for name, stats in result['latency_ms'].items():
+            print(f"{name:<22} {stats['count']:>6} {stats['p50']:>9} {stats['p95']:>9} "
+                  f"{stats['p99']:>9} {stats['max']:>9}")
+        server_stats = result['server']
+        print(f"jobs/min={jobs['jobs_per_minute']} cpu/job={server_stats['cpu_s_per_job']}s "
+              f"ffmpeg cpu/job={server_stats['ffmpeg_cpu_s_per_job']}s "
+              f"peak rss={server_stats['peak_rss_mb']}MB")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(result, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+파일명 정리 벤치마크 (app/utils/sanitize.py, pytest-benchmark)
+
+실제 영상 제목 코퍼스(benchmarks/titles.txt) 전체를 한 번 처리하는 시간을
+기존 구현, 캐시를 거치지 않은 경로(__wrapped__), 캐시 적중으로 나누어 비교한다.
+결과가 기존 구현과 같은지는 tests/test_sanitize.py에서 확인한다.
+
+사용법 (backend 디렉토리에서, pytest-benchmark 필요):
+    pip install pytest-benchmark
+    python -m pytest benchmarks/bench_sanitize.py
+    python -m pytest benchmarks/bench_sanitize.py --benchmark-group-by=group --benchmark-columns=min,mean,ops
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.sanitize import parse_cover_filename, sanitize_filename  # noqa: E402
+from tests.test_sanitize import (  # noqa: E402
+    CORPUS, legacy_parse_cover_filename, legacy_sanitize_filename
+)
+
+
+# ---------------------------------------------------------------------------
+# pytest-benchmark (코퍼스 전체 1회 처리 기준)
+# ---------------------------------------------------------------------------
+
+def _run_all(fn):
+    return lambda: [fn(title) for title in CORPUS]
+
+
+@pytest.mark.benchmark(group='sanitize')
+def test_bench_sanitize_legacy(benchmark) -> None:
+    benchmark(_run_all(legacy_sanitize_filename))
+
+
+@pytest.mark.benchmark(group='sanitize')
+def test_bench_sanitize_uncached(benchmark) -> None:
+    benchmark(_run_all(sanitize_filename.__wrapped__))
+
+
+@pytest.mark.benchmark(group='sanitize')
+def test_bench_sanitize_cached(benchmark) -> None:
+    benchmark(_run_all(sanitize_filename))
+
+
+@pytest.mark.benchmark(group='parse')
+def test_bench_parse_legacy(benchmark) -> None:
+    benchmark(_run_all(legacy_parse_cover_filename))
+
+
+@pytest.mark.benchmark(group='parse')
+def test_bench_parse_uncached(benchmark) -> None:
+    benchmark(_run_all(parse_cover_filename.__wrapped__))
+
+
+@pytest.mark.benchmark(group='parse')
+def test_bench_parse_cached(benchmark) -> None:
+    benchmark(_run_all(parse_cover_filename))
@@ -0,0 +1,285 @@
+"""
+오프라인 벤치마크용 로컬 픽스처
+
+- FixtureServer: 썸네일(JPEG)과 원본 음원 파일을 제공하는 로컬 HTTP 서버
+  (연결마다 대역폭 제한, Range 요청 지원 - PIPELINE_STREAMING의 Range 다운로드와 동일한 경로)
+- FakeYoutubeDL: yt_dlp.YoutubeDL 대체 (영상 정보는 지연 후 고정 응답, 다운로드는 픽스처 서버에서 받음)
+- make_audio_fixture / make_thumbnail: 픽스처 생성 (음원은 FFmpeg lavfi, 썸네일은 Pillow)
+
+YouTube에 접속하지 않으므로 네트워크 없이 실행되고, 실행할 때마다 같은 조건으로 측정된다.
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+import io
+import os
+import re
+import subprocess
+import threading
+import time
+
+# 픽스처 확장자별 yt-dlp acodec (출력 포맷과 같으면 스트림 복사 경로로 측정됨)
+FIXTURE_CODECS = {
+    'webm': 'opus',
+    'opus': 'opus',
+    'm4a': 'mp4a.40.2',
+    'mp3': 'mp3',
+}
+
+# 영상 제목 (한글/영문/이모지/커버 표기 등 파일명 정리 경로를 골고루 거치도록)
+TITLES = (
+    '아이유 (IU) - 밤편지 (cover by. 김하늘)',
+    'Ed Sheeran - Perfect [Official Music Video]',
+    '🎵 lofi hip hop radio - beats to relax/study to 🎧',
+    'NewJeans (뉴진스) \'Ditto\' Official MV (side A)',
+    'Yesterday - The Beatles (Acoustic Cover) | Jane Doe',
+    '【歌ってみた】 夜に駆ける / YOASOBI 【cover】',
+    '악뮤 - 어떻게 이별까지 사랑하겠어, 널 사랑하는 거지 (Live) #shorts',
+    'Bohemian Rhapsody | Piano Cover by. Someone 🎹',
+)
+
+_VIDEO_ID_PARAM = re.compile(r'[?&]v=([A-Za-z0-9_-]{11})')
+
+
+def make_audio_fixture(path: str, seconds: int, ffmpeg: str = 'ffmpeg') -> None:
+    """
+    테스트 음원 생성 (사인파, 확장자에 맞는 코덱)
+
+    Raises:
+        RuntimeError: If FFmpeg is not available
+    """
+    ext = os.path.splitext(path)[1].lstrip('.')
+    encoder = {'webm': 'libopus', 'opus': 'libopus', 'm4a': 'aac', 'mp3': 'libmp3lame'}[ext]
+    command = [
+        ffmpeg, '-hide_banner', '-loglevel', 'error', '-y',
+        '-f', 'lavfi', '-i', f'sine=frequency=440:duration={seconds}',
+        '-c:a', encoder, '-b:a', '128k', path
+    ]
+    try:
+        subprocess.run(command, check=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        raise RuntimeError(f'failed to generate audio fixture with {ffmpeg} (use --fixture): {e}')
+
+
+def make_thumbnail(width: int = 1280, height: int = 720) -> bytes:
+    """썸네일 JPEG 생성 (그라데이션, 커버 정규화 단계가 실제 크기 이미지를 처리하도록)"""
+    from PIL import Image
+
+    gradient = Image.linear_gradient('L').resize((width, height))
+    image = Image.merge('RGB', (gradient, gradient.rotate(90).resize((width, height)), gradient.transpose(Image.FLIP_LEFT_RIGHT)))
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', quality=90)
+    return buffer.getvalue()
+
+
+class FixtureServer:
+    """
+    픽스처 HTTP 서버 (별도 스레드)
+
+    - GET /thumb/<video_id>.jpg: 썸네일
+    - GET /media/<name>: 원본 음원 (Range 지원, 연결마다 bandwidth_bps로 제한)
+    """
+
+    def __init__(self, media_path: str, thumbnail: bytes, bandwidth_bps: float, chunk_size: int = 64 * 1024):
+        self.media_path = media_path
+        self.media_name = os.path.basename(media_path)
+        self.media_size = os.path.getsize(media_path)
+        self.thumbnail = thumbnail
+        self.bandwidth_bps = bandwidth_bps
+        self.chunk_size = chunk_size
+        self.requests = 0
+        self._httpd: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def media_url(self) -> str:
+        return f'{self.base_url}/media/{self.media_name}'
+
+    def start(self) -> None:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                server.requests += 1
+                path = urlparse(self.path).path
+                if path.startswith('/thumb/'):
+                    self._send(200, 'image/jpeg', server.thumbnail)
+                elif path == f'/media/{server.media_name}':
+                    self._send_media()
+                else:
+                    self._send(404, 'text/plain', b'not found')
+
+            def _send(self, status: int, content_type: str, body: bytes) -> None:
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_media(self) -> None:
+                start, end = _parse_range(self.headers.get('Range'), server.media_size)
+                if start is None:
+                    self.send_response(200)
+                else:
+                    self.send_response(206)
+                    self.send_header('Content-Range', f'bytes {start}-{end}/{server.media_size}')
+                start = start or 0
+                end = server.media_size - 1 if end is None else end
+                self.send_header('Content-Type', 'application/octet-stream')
+                self.send_header('Content-Length', str(end - start + 1))
+                self.send_header('Accept-Ranges', 'bytes')
+                self.end_headers()
+
+                try:
+                    with open(server.media_path, 'rb') as file:
+                        file.seek(start)
+                        _throttled_copy(file, self.wfile, end - start + 1, server.bandwidth_bps, server.chunk_size)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # 클라이언트가 중단함 (작업 취소)
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._httpd.daemon_threads = True
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+
+
+def _parse_range(header: Optional[str], size: int) -> Tuple[Optional[int], Optional[int]]:
+    """bytes=a-b 하나만 지원 (없거나 형식이 다르면 전체)"""
+    match = re.match(r'bytes=(\d+)-(\d*)$', header or '')
+    if not match:
+        return None, None
+    start = int(match.group(1))
+    end = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+    return start, end
+
+
+def _throttled_copy(src, dst, length: int, bandwidth_bps: float, chunk_size: int) -> None:
+    """length 바이트를 bandwidth_bps 속도로 복사 (보낸 양에 맞춰 대기)"""
+    started = time.monotonic()
+    sent = 0
+    while sent < length:
+        chunk = src.read(min(chunk_size, length - sent))
+        if not chunk:
+            break
+        dst.write(chunk)
+        sent += len(chunk)
+        if bandwidth_bps > 0:
+            delay = sent / bandwidth_bps - (time.monotonic() - started)
+            if delay > 0:
+                time.sleep(delay)
+
+
+class FakeYoutubeDL:
+    """
+    yt_dlp.YoutubeDL 대체 (install()로 설정 후 yt_dlp.YoutubeDL에 덮어씀)
+
+    - extract_info(download=False): info_latency 후 영상 정보 (썸네일/음원 URL은 픽스처 서버)
+    - extract_info(download=True): 픽스처 서버에서 음원을 받아 outtmpl에 저장하고 progress_hooks 호출
+    - 영상 ID가 'missing'으로 시작하면 DownloadError (에러 경로 측정용)
+    """
+
+    media_url = ''
+    thumbnail_base = ''
+    fixture_ext = 'webm'
+    fixture_size = 0
+    duration = 0
+    info_latency = 0.0
+
+    def __init__(self, params: Optional[Dict] = None):
+        self.params = params or {}
+
+    def __enter__(self) -> 'FakeYoutubeDL':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+    def extract_info(self, url: str, download: bool = False) -> Dict:
+        import yt_dlp
+
+        match = _VIDEO_ID_PARAM.search(url)
+        if not match:
+            raise yt_dlp.utils.DownloadError(f'ERROR: unsupported URL: {url}')
+        video_id = match.group(1)
+        if video_id.startswith('missing'):
+            raise yt_dlp.utils.DownloadError(f'ERROR: [youtube] {video_id}: Video unavailable')
+
+        if not download and self.info_latency:
+            time.sleep(self.info_latency)
+
+        info = {
+            'id': video_id,
+            'title': TITLES[sum(video_id.encode()) % len(TITLES)],
+            'duration': self.duration,
+            'uploader': 'Benchmark Channel',
+            'channel': 'Benchmark Channel',
+            'availability': 'public',
+            'thumbnails': [{'url': f'{self.thumbnail_base}/thumb/{video_id}.jpg', 'width': 1280, 'height': 720}],
+            'url': self.media_url,
+            'ext': self.fixture_ext,
+            'acodec': FIXTURE_CODECS[self.fixture_ext],
+            'filesize': self.fixture_size,
+            'http_headers': {},
+        }
+
+        if download:
+            info['requested_downloads'] = [{
+                'filepath': self._download(info),
+                'acodec': info['acodec']
+            }]
+        return info
+
+    def _download(self, info: Dict) -> str:
+        """픽스처 서버에서 받아 저장하며 yt-dlp 형식의 진행 훅 호출"""
+        import requests
+
+        path = self.params['outtmpl'].replace('%(ext)s', self.fixture_ext)
+        hooks = self.params.get('progress_hooks') or []
+        downloaded = 0
+        started = time.monotonic()
+        # yt-dlp처럼 .part에 받은 뒤 이름 변경 (중단되면 .part가 남고 파이프라인이 정리)
+        with requests.get(info['url'], stream=True, timeout=30) as response, open(f'{path}.part', 'wb') as file:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                file.write(chunk)
+                downloaded += len(chunk)
+                elapsed = time.monotonic() - started
+                status = {
+                    'status': 'downloading',
+                    'downloaded_bytes': downloaded,
+                    'total_bytes': self.fixture_size,
+                    'speed': downloaded / elapsed if elapsed > 0 else 0,
+                    'eta': 0
+                }
+                for hook in hooks:
+                    hook(status)
+        os.replace(f'{path}.part', path)
+        for hook in hooks:
+            hook({'status': 'finished', 'downloaded_bytes': downloaded, 'total_bytes': self.fixture_size})
+        return path
+
+
+def install(media_url: str, thumbnail_base: str, fixture_path: str, duration: int, info_latency: float) -> None:
+    """yt_dlp.YoutubeDL을 FakeYoutubeDL로 교체 (서버 프로세스에서 앱 import 전에 호출)"""
+    import yt_dlp
+
+    FakeYoutubeDL.media_url = media_url
+    FakeYoutubeDL.thumbnail_base = thumbnail_base
+    FakeYoutubeDL.fixture_ext = os.path.splitext(fixture_path)[1].lstrip('.')
+    FakeYoutubeDL.fixture_size = os.path.getsize(fixture_path)
+    FakeYoutubeDL.duration = duration
+    FakeYoutubeDL.info_latency = info_latency
+    yt_dlp.YoutubeDL = FakeYoutubeDL
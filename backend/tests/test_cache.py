@@ -0,0 +1,93 @@
+"""완성 음원 캐시 (AudioCache)"""
+import os
+import time
+
+from app.core.config import settings
+from app.services import cache as cache_module
+from app.services.cache import AudioCache
+
+
+def _store(cache: AudioCache, tmp_path, video_id: str, nbytes: int = 1024) -> None:
+    source = tmp_path / f'{video_id}.mp3'
+    source.write_bytes(b'\0' * nbytes)
+    cache.store(video_id, 'mp3', 192, str(source))
+    source.unlink()
+
+
+def test_fetch_links_outside_lock(tmp_path, monkeypatch):
+    """하드링크 대신 복사하는 동안에도 다른 조회/등록이 잠금을 기다리지 않음"""
+    cache = AudioCache(str(tmp_path / 'cache'), 10 * 1024 * 1024)
+    _store(cache, tmp_path, 'video')
+    lock_free = []
+
+    def copy_without_link(src, dst):
+        acquired = cache._lock.acquire(blocking=False)
+        if acquired:
+            cache._lock.release()
+        lock_free.append(acquired)
+        with open(src, 'rb') as source, open(dst, 'wb') as dest:
+            dest.write(source.read())
+
+    monkeypatch.setattr(cache_module, 'link_file', copy_without_link)
+    dest = str(tmp_path / 'session.mp3')
+    assert cache.fetch('video', 'mp3', 192, dest)
+    assert lock_free == [True]
+    assert os.path.getsize(dest) == 1024
+    assert cache.get_stats()['hits'] == 1
+
+
+def test_fetch_missing_file_is_miss(tmp_path):
+    cache = AudioCache(str(tmp_path / 'cache'), 10 * 1024 * 1024)
+    _store(cache, tmp_path, 'video')
+    os.remove(os.path.join(cache.cache_dir, cache.make_key('video', 'mp3', 192)))
+
+    dest = str(tmp_path / 'session.mp3')
+    assert not cache.fetch('video', 'mp3', 192, dest)
+    assert not os.path.exists(dest)
+    assert not cache.contains('video', 'mp3', 192)
+    assert cache.get_stats()['misses'] == 1
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = AudioCache(str(tmp_path / 'cache'), 2048)
+    _store(cache, tmp_path, 'old')
+    _store(cache, tmp_path, 'new')
+    assert cache.fetch('old', 'mp3', 192, str(tmp_path / 'session.mp3'))  # old가 최근 사용
+
+    _store(cache, tmp_path, 'third')
+    assert cache.contains('old', 'mp3', 192)
+    assert not cache.contains('new', 'mp3', 192)
+    assert cache.get_stats()['bytes'] == 2048
+
+
+def test_workers_share_entries_and_limit(tmp_path):
+    """같은 디렉토리를 쓰는 캐시(워커)는 서로의 항목을 조회하고 용량 한도를 합계로 지킴"""
+    cache_dir = str(tmp_path / 'cache')
+    first = AudioCache(cache_dir, 2048)
+    second = AudioCache(cache_dir, 2048)
+
+    _store(first, tmp_path, 'old')
+    _store(second, tmp_path, 'new')
+    assert second.contains('old', 'mp3', 192)
+    assert second.fetch('old', 'mp3', 192, str(tmp_path / 'session.mp3'))  # old가 최근 사용
+
+    _store(first, tmp_path, 'third')
+    assert not os.path.exists(os.path.join(cache_dir, first.make_key('new', 'mp3', 192)))
+    assert sorted(os.listdir(cache_dir)) == [first.make_key('old', 'mp3', 192), first.make_key('third', 'mp3', 192)]
+    assert first.get_stats()['bytes'] == 2048
+
+
+def test_keeps_recent_tmp_files(tmp_path):
+    """시작 시 다른 워커가 등록 중인 임시 파일은 남기고 오래된 것만 삭제"""
+    cache_dir = tmp_path / 'cache'
+    cache_dir.mkdir()
+    recent = cache_dir / 'recent.mp3.0a1b.tmp'
+    stale = cache_dir / 'stale.mp3.2c3d.tmp'
+    recent.write_bytes(b'\0')
+    stale.write_bytes(b'\0')
+    old = time.time() - settings.ORPHAN_PARTIAL_AGE_SECONDS - 60
+    os.utime(stale, (old, old))
+
+    cache = AudioCache(str(cache_dir), 2048)
+    assert recent.exists() and not stale.exists()
+    assert cache.get_stats()['entries'] == 0
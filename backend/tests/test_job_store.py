@@ -0,0 +1,133 @@
+"""작업 상태 저장소 (InMemoryJobStore, SQLiteJobStore)"""
+from datetime import datetime, timedelta
+import multiprocessing
+import sqlite3
+
+import pytest
+
+from app.services.job_store import (
+    InMemoryJobStore, SQLiteJobStore,
+    JOB_QUEUED, JOB_RUNNING, JOB_COMPLETED, JOB_FAILED
+)
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def store(request, tmp_path):
+    if request.param == 'sqlite':
+        return SQLiteJobStore(str(tmp_path / 'jobs.db'))
+    return InMemoryJobStore()
+
+
+def test_lifecycle(store):
+    store.create('job-1', 'video:mp3:192')
+    job = store.get('job-1')
+    assert job['status'] == JOB_QUEUED
+    assert job['key'] == 'video:mp3:192'
+    assert isinstance(job['created_at'], datetime)
+    assert job['started_at'] is None and job['finished_at'] is None
+
+    store.update('job-1', JOB_RUNNING)
+    assert isinstance(store.get('job-1')['started_at'], datetime)
+
+    store.update('job-1', JOB_FAILED, 'boom')
+    job = store.get('job-1')
+    assert job['status'] == JOB_FAILED
+    assert job['error'] == 'boom'
+    assert isinstance(job['finished_at'], datetime)
+
+
+def test_get_missing(store):
+    assert store.get('nope') is None
+    store.update('nope', JOB_RUNNING)  # 없는 작업 변경은 무시
+
+
+def test_purge_only_finished(store):
+    store.create('done', 'a')
+    store.update('done', JOB_COMPLETED)
+    store.create('queued', 'b')
+
+    assert store.purge(datetime.now() + timedelta(seconds=1)) == 1
+    assert store.get('done') is None
+    assert store.get('queued') is not None
+
+
+def test_active_ids(store):
+    store.create('queued', 'a')
+    store.create('running', 'b')
+    store.update('running', JOB_RUNNING)
+    store.create('done', 'c')
+    store.update('done', JOB_COMPLETED)
+    assert store.active_ids() == {'queued', 'running'}
+
+
+def test_recover_keeps_own_jobs(store):
+    store.create('mine', 'a')
+    assert store.recover() == 0
+    assert store.get('mine')['status'] == JOB_QUEUED
+
+
+def _hold_job(db_path: str, ready, done) -> None:
+    """다른 워커 프로세스: 작업을 만든 뒤 종료 신호까지 대기"""
+    store = SQLiteJobStore(db_path)
+    store.create('other', 'video:mp3:192')
+    store.update('other', JOB_RUNNING)
+    ready.set()
+    done.wait(30)
+
+
+def test_sqlite_recover_only_dead_processes(tmp_path):
+    db_path = str(tmp_path / 'jobs.db')
+    ctx = multiprocessing.get_context('spawn')
+    ready, done = ctx.Event(), ctx.Event()
+    worker = ctx.Process(target=_hold_job, args=(db_path, ready, done))
+    worker.start()
+    try:
+        assert ready.wait(30)
+
+        # 다른 워커가 살아 있으면 그 작업은 건드리지 않음
+        store = SQLiteJobStore(db_path)
+        assert store.recover() == 0
+        assert store.get('other')['status'] == JOB_RUNNING
+    finally:
+        done.set()
+        worker.join(30)
+
+    # 워커가 종료되면 다음 시작 시 실패 처리
+    assert SQLiteJobStore(db_path).recover() == 1
+    job = store.get('other')
+    assert job['status'] == JOB_FAILED
+    assert job['error'] == 'interrupted'
+
+
+def test_sqlite_recover_reused_pid(tmp_path):
+    """같은 PID의 이전 인스턴스 (컨테이너 재시작) 작업은 실패 처리"""
+    db_path = str(tmp_path / 'jobs.db')
+    SQLiteJobStore(db_path).create('stale', 'a')
+
+    store = SQLiteJobStore(db_path)
+    store.create('fresh', 'b')
+    assert store.recover() == 1
+    assert store.get('stale')['status'] == JOB_FAILED
+    assert store.get('fresh')['status'] == JOB_QUEUED
+
+
+def test_sqlite_migrates_legacy_rows(tmp_path):
+    """소유자 컬럼이 없던 이전 스키마의 미완료 작업은 실패 처리"""
+    db_path = str(tmp_path / 'jobs.db')
+    conn = sqlite3.connect(db_path)
+    conn.execute('''
+        CREATE TABLE jobs (
+            job_id TEXT PRIMARY KEY, key TEXT NOT NULL, status TEXT NOT NULL, error TEXT,
+            created_at TEXT NOT NULL, started_at TEXT, finished_at TEXT
+        )
+    ''')
+    conn.execute(
+        'INSERT INTO jobs (job_id, key, status, created_at) VALUES (?, ?, ?, ?)',
+        ('legacy', 'a', JOB_RUNNING, datetime.now().isoformat())
+    )
+    conn.commit()
+    conn.close()
+
+    store = SQLiteJobStore(db_path)
+    assert store.recover() == 1
+    assert store.get('legacy')['status'] == JOB_FAILED
@@ -0,0 +1,151 @@
+"""추출 작업 대기열 (JobManager)"""
+import asyncio
+
+import pytest
+
+from app.services.job_store import InMemoryJobStore, JOB_COMPLETED
+from app.services.jobs import JobManager, QueueFullError
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 10))
+
+
+async def _started_manager(**kwargs) -> JobManager:
+    options = {'download_workers': 1, 'transcode_workers': 1, 'max_queue_depth': 10}
+    options.update(kwargs)
+    manager = JobManager(InMemoryJobStore(), **options)
+    manager.start()
+    return manager
+
+
+def test_single_flight_and_result():
+    async def scenario():
+        manager = await _started_manager()
+        calls = []
+
+        async def runner(job):
+            calls.append(job.job_id)
+            return '/tmp/result'
+
+        job, created = manager.attach('key', runner)
+        same, joined = manager.attach('key', runner)
+        assert created and not joined and same is job
+
+        assert await job.result == '/tmp/result'
+        assert calls == [job.job_id]
+        assert manager.store.get(job.job_id)['status'] == JOB_COMPLETED
+        await manager.stop()
+
+    run(scenario())
+
+
+def test_queue_full():
+    async def scenario():
+        manager = await _started_manager(max_queue_depth=1)
+        gate = asyncio.Event()
+
+        async def runner(job):
+            await gate.wait()
+            return None
+
+        manager.attach('a', runner)
+        await asyncio.sleep(0)  # a가 다운로드 슬롯을 받음
+        manager.attach('b', runner)  # 대기열 1개
+
+        with pytest.raises(QueueFullError) as info:
+            manager.attach('c', runner)
+        assert info.value.retry_after >= 1
+
+        manager.check_capacity('b')  # 대기 중인 작업 합류는 항상 허용
+        gate.set()
+        await manager.stop()
+
+    run(scenario())
+
+
+def test_slow_transcode_does_not_block_download():
+    """변환 중인 작업은 다운로드 슬롯을 반납하므로 다음 작업이 다운로드를 시작함"""
+    async def scenario():
+        manager = await _started_manager(download_workers=1, transcode_workers=1)
+        encoding = asyncio.Event()
+        finish_encode = asyncio.Event()
+        second_downloading = asyncio.Event()
+
+        async def slow_encode(job):
+            async with manager.transcode_stage(job):
+                encoding.set()
+                await finish_encode.wait()
+            return None
+
+        async def fetch(job):
+            second_downloading.set()
+            return None
+
+        first, _ = manager.attach('slow', slow_encode)
+        await encoding.wait()
+
+        second, _ = manager.attach('fetch', fetch)
+        await asyncio.wait_for(second_downloading.wait(), 1)
+        assert manager.get_stats()['transcoding'] == 1
+
+        finish_encode.set()
+        await first.result
+        await second.result
+        assert manager.get_stats()['downloading'] == 0
+        await manager.stop()
+
+    run(scenario())
+
+
+def test_transcode_concurrency_limit():
+    async def scenario():
+        manager = await _started_manager(download_workers=3, transcode_workers=1)
+        active = 0
+        peak = 0
+
+        async def encode(job):
+            nonlocal active, peak
+            async with manager.transcode_stage(job):
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+            return None
+
+        jobs = [manager.attach(f'job-{i}', encode)[0] for i in range(3)]
+        await asyncio.gather(*(job.result for job in jobs))
+        assert peak == 1
+        await manager.stop()
+
+    run(scenario())
+
+
+def test_streaming_stage_keeps_download_slot():
+    """release_download=False면 변환 중에도 다운로드 슬롯을 유지"""
+    async def scenario():
+        manager = await _started_manager(download_workers=1, transcode_workers=2)
+        streaming = asyncio.Event()
+        finish = asyncio.Event()
+
+        async def stream(job):
+            async with manager.transcode_stage(job, release_download=False):
+                streaming.set()
+                await finish.wait()
+            return None
+
+        async def other(job):
+            return None
+
+        first, _ = manager.attach('stream', stream)
+        await streaming.wait()
+        second, _ = manager.attach('other', other)
+        await asyncio.sleep(0.05)
+        assert not second.result.done()
+        assert manager.get_stats()['queued'] == 1
+
+        finish.set()
+        await second.result
+        await manager.stop()
+
+    run(scenario())
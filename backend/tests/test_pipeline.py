@@ -0,0 +1,130 @@
+"""추출 요청 처리 (extract_to_session) - 캐시 히트 경로, 연결 종료/취소 시 파일 정리"""
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.services import cache as cache_module
+from app.services import pipeline
+from app.services.cache import AudioCache
+from app.services.jobs import job_manager
+from app.services.reconcile import OrphanReconciler
+from app.services.session import session_manager
+
+VIDEO_INFO = {
+    'video_id': 'dQw4w9WgXcQ',
+    'title': 'Song COVER by Someone',
+    'thumbnail_url': '',
+    'duration': 10,
+    'channel': 'Channel',
+}
+URL = f"https://www.youtube.com/watch?v={VIDEO_INFO['video_id']}"
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    """업로드 디렉토리와 캐시를 임시 디렉토리로 (캐시에 완성본 하나)"""
+    monkeypatch.setattr(settings, 'UPLOAD_DIR', str(tmp_path))
+    monkeypatch.setattr(settings, 'AUDIO_CACHE_ENABLED', True)
+    cache = AudioCache(str(tmp_path / 'cache'), 10 * 1024 * 1024)
+    source = tmp_path / 'source.mp3'
+    source.write_bytes(b'\xff\xfb' * 512)
+    cache.store(VIDEO_INFO['video_id'], 'mp3', settings.AUDIO_BITRATE, str(source))
+    source.unlink()
+    monkeypatch.setattr(pipeline, 'audio_cache', cache)
+    return tmp_path
+
+
+def _session_files(directory) -> list:
+    return [name for name in os.listdir(directory) if name.endswith('.mp3')]
+
+
+def test_cache_hit_creates_session(upload_dir):
+    async def scenario():
+        return [event async for event in pipeline.extract_to_session(URL, 'mp3', video_info=VIDEO_INFO)]
+
+    events = asyncio.run(scenario())
+    session_id = events[-1]['session_id']
+    session = session_manager.get_session(session_id)
+    try:
+        assert events[-1]['step'] == 'complete'
+        assert os.path.exists(session['file_path'])
+    finally:
+        session_manager.delete_session(session_id)
+
+
+def test_disconnect_after_cache_hit_removes_file(upload_dir):
+    """캐시 히트 이벤트에서 스트림이 닫혀도 세션 없는 파일이 남지 않음"""
+    before = session_manager.get_session_count()
+
+    async def scenario():
+        stream = pipeline.extract_to_session(URL, 'mp3', video_info=VIDEO_INFO)
+        async for event in stream:
+            if event['message'] == '캐시된 음원 사용':
+                break
+        await stream.aclose()
+
+    asyncio.run(scenario())
+    assert _session_files(upload_dir) == []
+    assert session_manager.get_session_count() == before
+
+
+def test_cancel_while_linking_removes_file(upload_dir, monkeypatch):
+    """파일 연결 스레드가 실행 중일 때 취소돼도 스레드가 끝난 뒤 파일을 삭제"""
+    linking = threading.Event()
+    linked = threading.Event()
+    real_link = cache_module.link_file
+
+    def slow_link(src, dst):
+        linking.set()
+        time.sleep(0.2)
+        real_link(src, dst)
+        linked.set()
+
+    monkeypatch.setattr(cache_module, 'link_file', slow_link)
+    before = session_manager.get_session_count()
+
+    async def scenario():
+        async def consume():
+            async for _ in pipeline.extract_to_session(URL, 'mp3', video_info=VIDEO_INFO):
+                pass
+
+        task = asyncio.create_task(consume())
+        await asyncio.get_running_loop().run_in_executor(None, linking.wait, 5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.get_running_loop().run_in_executor(None, linked.wait, 5)
+        await asyncio.sleep(0.05)  # 완료 콜백 실행
+
+    asyncio.run(scenario())
+    assert linked.is_set()
+    assert _session_files(upload_dir) == []
+    assert session_manager.get_session_count() == before
+
+
+def test_reconcile_does_not_recover_linked_session(upload_dir):
+    """세션 파일을 연결한 뒤 완료 전의 고아 파일 정리는 같은 ID로 세션을 복구하지 않음"""
+    reconciler = OrphanReconciler(str(upload_dir), session_manager, job_manager)
+
+    async def scenario():
+        events = []
+        async for event in pipeline.extract_to_session(URL, 'mp3', video_info=VIDEO_INFO):
+            events.append(event)
+            if event['message'] == '캐시된 음원 사용':
+                result = await reconciler.reconcile()
+                assert result['recovered'] == 0 and result['deleted'] == 0
+        return events
+
+    events = asyncio.run(scenario())
+    session_id = events[-1]['session_id']
+    try:
+        session = session_manager.get_session(session_id)
+        assert 'recovered' not in session['metadata']
+        assert session['metadata']['suggested_filename'] == 'Song (cover by. Someone)'
+        assert os.path.exists(session['file_path'])
+    finally:
+        session_manager.delete_session(session_id)
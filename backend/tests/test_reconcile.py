@@ -0,0 +1,81 @@
+"""temp_files 고아 파일 정리 (OrphanReconciler)"""
+import asyncio
+import multiprocessing
+import os
+import time
+import uuid
+
+from app.core.config import settings
+from app.services.job_store import InMemoryJobStore, SQLiteJobStore, JOB_RUNNING
+from app.services.jobs import ExtractionJob, JobManager
+from app.services.reconcile import OrphanReconciler
+from app.services.session import SessionManager
+from app.services.session_store import InMemorySessionStore
+
+
+def _old_file(path: str) -> str:
+    """수정 시각이 정리 기준보다 오래된 파일 (yt-dlp가 업로드 시각으로 바꾼 경우 등)"""
+    with open(path, 'wb') as file:
+        file.write(b'\0' * 1024)
+    old = time.time() - settings.ORPHAN_PARTIAL_AGE_SECONDS - 3600
+    os.utime(path, (old, old))
+    return path
+
+
+def test_active_job_files_are_kept(tmp_path):
+    async def scenario():
+        jobs = JobManager(InMemoryJobStore(), download_workers=1, transcode_workers=1, max_queue_depth=10)
+        reconciler = OrphanReconciler(str(tmp_path), SessionManager(InMemorySessionStore()), jobs)
+
+        active_prefix = str(tmp_path / f'job_{uuid.uuid4()}')
+        jobs.track_files(ExtractionJob('active', lambda job: None), active_prefix)
+        active = [
+            _old_file(f'{active_prefix}.source.webm.part'),
+            _old_file(f'{active_prefix}.mp3'),
+        ]
+        orphan = _old_file(str(tmp_path / f'job_{uuid.uuid4()}.source.webm'))
+
+        result = await reconciler.reconcile()
+        return active, orphan, result
+
+    active, orphan, result = asyncio.run(scenario())
+    assert all(os.path.exists(path) for path in active)
+    assert not os.path.exists(orphan)
+    assert result['deleted'] == 1
+
+
+def _hold_job(db_path: str, job_id: str, ready, done) -> None:
+    """다른 워커 프로세스: 실행 중인 작업을 만든 뒤 종료 신호까지 대기"""
+    store = SQLiteJobStore(db_path)
+    store.create(job_id, 'video:mp3:192')
+    store.update(job_id, JOB_RUNNING)
+    ready.set()
+    done.wait(30)
+
+
+def test_other_worker_job_files_are_kept(tmp_path):
+    """SQLite 작업 저장소를 공유하는 다른 워커의 진행 중인 작업 파일은 유지, 워커가 종료되면 삭제"""
+    db_path = str(tmp_path / 'jobs.db')
+    job_id = str(uuid.uuid4())
+    job_file = _old_file(str(tmp_path / f'job_{job_id}.source.webm'))
+
+    async def reconcile():
+        jobs = JobManager(SQLiteJobStore(db_path), download_workers=1, transcode_workers=1, max_queue_depth=10)
+        reconciler = OrphanReconciler(str(tmp_path), SessionManager(InMemorySessionStore()), jobs)
+        return await reconciler.reconcile()
+
+    ctx = multiprocessing.get_context('spawn')
+    ready, done = ctx.Event(), ctx.Event()
+    worker = ctx.Process(target=_hold_job, args=(db_path, job_id, ready, done))
+    worker.start()
+    try:
+        assert ready.wait(30)
+        assert asyncio.run(reconcile())['deleted'] == 0
+        assert os.path.exists(job_file)
+    finally:
+        done.set()
+        worker.join(30)
+
+    # 종료된 워커의 작업은 실패 처리된 뒤 정리
+    assert asyncio.run(reconcile())['deleted'] == 1
+    assert not os.path.exists(job_file)
@@ -0,0 +1,175 @@
+"""Range/조건부 요청 파일 응답 (RangeFileResponse, /download/{session_id})"""
+from email.utils import formatdate
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import os
+
+import pytest
+
+from app.api.responses import RangeFileResponse
+from app.core.config import settings
+from app.main import app
+from app.services.session import session_manager
+
+SIZE = 1000
+BODY = bytes(range(256)) * 3 + bytes(range(232))
+
+
+@pytest.mark.parametrize('header, expected', [
+    (None, None),
+    ('', None),
+    ('items=0-10', None),
+    ('bytes=0-99', (0, 100)),
+    ('bytes=100-199', (100, 100)),
+    ('bytes=999-999', (999, 1)),
+    ('bytes=500-5000', (500, 500)),  # 끝이 파일보다 크면 잘라냄
+    ('bytes=900-', (900, 100)),  # 열린 범위
+    ('bytes=0-', (0, SIZE)),
+    ('bytes=-100', (900, 100)),  # 끝에서부터
+    ('bytes=-5000', (0, SIZE)),
+    ('bytes= 10-19', (10, 10)),
+    ('bytes=0-10,20-30', None),  # 여러 범위는 전체 파일
+    ('bytes=0-0,-1', None),
+    ('bytes=1000-', 'unsatisfiable'),
+    ('bytes=5000-6000', 'unsatisfiable'),
+    ('bytes=-0', 'unsatisfiable'),
+    ('bytes=20-10', None),  # 끝이 시작보다 작으면 무시
+    ('bytes=abc-def', None),
+    ('bytes=-', None),
+    ('bytes=1.5-2', None),
+])
+def test_parse_range(header, expected):
+    assert RangeFileResponse.parse_range(header, SIZE) == expected
+
+
+def test_parse_range_empty_file():
+    assert RangeFileResponse.parse_range('bytes=0-', 0) == 'unsatisfiable'
+    assert RangeFileResponse.parse_range(None, 0) is None
+
+
+@pytest.fixture
+def session_id(tmp_path):
+    path = tmp_path / 'audio.mp3'
+    path.write_bytes(BODY)
+    sid = session_manager.create_session(str(path), {'suggested_filename': 'song', 'audio_format': 'mp3'})
+    yield sid
+    session_manager.store.delete(sid)
+
+
+def _get(path: str, headers: Optional[Dict[str, str]] = None, method: str = 'GET') -> Tuple[int, Dict[str, str], bytes]:
+    """ASGI 앱에 요청 하나를 보내고 (상태 코드, 헤더, 본문) 반환"""
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': b'',
+        'root_path': '',
+        'headers': [(k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in (headers or {}).items()],
+        'client': ('127.0.0.1', 12345),
+        'server': ('testserver', 80),
+    }
+    messages: List[dict] = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    start = messages[0]
+    response_headers = {k.decode('latin-1'): v.decode('latin-1') for k, v in start['headers']}
+    body = b''.join(m.get('body', b'') for m in messages[1:])
+    return start['status'], response_headers, body
+
+
+def _url(session_id: str) -> str:
+    return f'{settings.API_PREFIX}/download/{session_id}'
+
+
+def test_full_download(session_id):
+    status, headers, body = _get(_url(session_id))
+    assert status == 200
+    assert body == BODY
+    assert headers['accept-ranges'] == 'bytes'
+    assert headers['content-length'] == str(SIZE)
+    assert 'etag' in headers and 'last-modified' in headers
+
+
+def test_partial_content(session_id):
+    status, headers, body = _get(_url(session_id), {'Range': 'bytes=100-199'})
+    assert status == 206
+    assert headers['content-range'] == f'bytes 100-199/{SIZE}'
+    assert headers['content-length'] == '100'
+    assert body == BODY[100:200]
+
+
+def test_suffix_range(session_id):
+    status, headers, body = _get(_url(session_id), {'Range': 'bytes=-10'})
+    assert status == 206
+    assert headers['content-range'] == f'bytes 990-999/{SIZE}'
+    assert body == BODY[-10:]
+
+
+def test_range_not_satisfiable(session_id):
+    status, headers, body = _get(_url(session_id), {'Range': f'bytes={SIZE}-'})
+    assert status == 416
+    assert headers['content-range'] == f'bytes */{SIZE}'
+    assert headers['content-length'] == '0'
+    assert body == b''
+
+
+def test_if_range_etag(session_id):
+    _, headers, _ = _get(_url(session_id))
+    etag = headers['etag']
+
+    status, _, body = _get(_url(session_id), {'Range': 'bytes=0-9', 'If-Range': etag})
+    assert status == 206 and body == BODY[:10]
+
+    # 파일이 바뀐 경우 (ETag 불일치) 전체 파일
+    status, headers, body = _get(_url(session_id), {'Range': 'bytes=0-9', 'If-Range': '"stale"'})
+    assert status == 200
+    assert 'content-range' not in headers
+    assert body == BODY
+
+
+def test_if_range_date(session_id):
+    path = session_manager.get_session(session_id)['file_path']
+    mtime = os.stat(path).st_mtime
+
+    status, _, _ = _get(_url(session_id), {'Range': 'bytes=0-9', 'If-Range': formatdate(mtime + 60, usegmt=True)})
+    assert status == 206
+    status, _, body = _get(_url(session_id), {'Range': 'bytes=0-9', 'If-Range': formatdate(mtime - 3600, usegmt=True)})
+    assert status == 200 and body == BODY
+
+
+def test_if_none_match(session_id):
+    _, headers, _ = _get(_url(session_id))
+    etag = headers['etag']
+
+    status, headers, body = _get(_url(session_id), {'If-None-Match': etag})
+    assert status == 304
+    assert body == b''
+    assert 'content-length' not in headers
+    assert headers['etag'] == etag
+
+    status, _, _ = _get(_url(session_id), {'If-None-Match': f'"other", W/{etag}'})
+    assert status == 304
+    status, _, body = _get(_url(session_id), {'If-None-Match': '"other"'})
+    assert status == 200 and body == BODY
+
+
+def test_head(session_id):
+    status, headers, body = _get(_url(session_id), method='HEAD')
+    assert status == 200
+    assert headers['content-length'] == str(SIZE)
+    assert body == b''
+
+
+def test_missing_session():
+    status, _, _ = _get(_url('00000000-0000-0000-0000-000000000000'))
+    assert status == 404
@@ -0,0 +1,101 @@
+"""세션 저장소 (InMemorySessionStore, SQLiteSessionStore, 여러 프로세스 공유)"""
+from datetime import datetime, timedelta
+import asyncio
+import multiprocessing
+
+import pytest
+
+from app.services.session import SessionManager
+from app.services.session_store import InMemorySessionStore, SQLiteSessionStore
+
+WORKERS = 4
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def store(request, tmp_path):
+    if request.param == 'sqlite':
+        return SQLiteSessionStore(str(tmp_path / 'sessions.db'))
+    return InMemorySessionStore()
+
+
+def test_create_get_delete(store):
+    created_at = datetime.now()
+    store.create('s1', '/tmp/s1.mp3', {'title': '밤편지'}, created_at)
+
+    session = store.get('s1')
+    assert session['file_path'] == '/tmp/s1.mp3'
+    assert session['metadata'] == {'title': '밤편지'}
+    assert session['created_at'] == created_at
+    assert store.count() == 1
+    assert store.file_paths() == {'/tmp/s1.mp3'}
+
+    assert store.delete('s1')['file_path'] == '/tmp/s1.mp3'
+    assert store.delete('s1') is None
+    assert store.get('s1') is None
+    assert store.count() == 0
+
+
+def test_expired_uses_created_at(store):
+    now = datetime.now()
+    store.create('old', '/tmp/old.mp3', {}, now - timedelta(hours=2))
+    store.create('new', '/tmp/new.mp3', {}, now)
+
+    assert store.expired(now - timedelta(hours=1)) == ['old']
+
+
+def test_oldest_pages(store):
+    now = datetime.now()
+    for index, sid in enumerate(['c', 'a', 'b', 'd']):
+        store.create(sid, f'/tmp/{sid}.mp3', {}, now + timedelta(seconds=index // 2))  # c, a 동시각 / b, d 동시각
+
+    first = store.oldest(3)
+    assert [row[0] for row in first] == ['a', 'c', 'b']
+    assert first[0] == ('a', '/tmp/a.mp3', now)
+
+    last_id, _, last_created = first[-1]
+    assert [row[0] for row in store.oldest(3, after=(last_created, last_id))] == ['d']
+    assert store.oldest(3, after=(now + timedelta(seconds=1), 'd')) == []
+
+
+def _share_session(db_path: str, file_path: str, index: int, barrier, results) -> None:
+    """워커 프로세스: 0번이 세션을 만들고, 모두 조회한 뒤 동시에 만료 정리"""
+    manager = SessionManager(SQLiteSessionStore(db_path))
+    if index == 0:
+        manager.create_session(file_path, {'title': 'shared'}, session_id='shared',
+                               created_at=datetime.now() - timedelta(hours=2))
+    barrier.wait()
+
+    session = manager.get_session('shared')
+    visible = session is not None and session['metadata'] == {'title': 'shared'}
+    barrier.wait()
+
+    cleanup = asyncio.run(manager.cleanup_old_sessions(max_age_hours=1))
+    results.put((index, visible, cleanup['sessions']))
+
+
+def test_sqlite_shared_across_processes(tmp_path):
+    db_path = str(tmp_path / 'sessions.db')
+    file_path = tmp_path / 'shared.mp3'
+    file_path.write_bytes(b'\xff\xfb' * 1024)
+    SQLiteSessionStore(db_path)  # 스키마를 먼저 만들어 워커끼리 초기화가 겹치지 않게 함
+
+    ctx = multiprocessing.get_context('spawn')
+    barrier = ctx.Barrier(WORKERS, timeout=30)
+    results = ctx.Queue()
+    workers = [
+        ctx.Process(target=_share_session, args=(db_path, str(file_path), index, barrier, results))
+        for index in range(WORKERS)
+    ]
+    for worker in workers:
+        worker.start()
+    outcomes = [results.get(timeout=60) for _ in workers]
+    for worker in workers:
+        worker.join(30)
+        assert worker.exitcode == 0
+
+    # 다른 프로세스가 만든 세션을 모두 조회
+    assert all(visible for _, visible, _ in outcomes)
+    # 만료 세션은 정확히 한 프로세스만 삭제
+    assert sum(deleted for _, _, deleted in outcomes) == 1
+    assert not file_path.exists()
+    assert SQLiteSessionStore(db_path).count() == 0
@@ -0,0 +1,165 @@
+"""temp_files 용량 관리 (StorageManager)"""
+from datetime import datetime, timedelta
+import asyncio
+import os
+
+import pytest
+
+from app.services.cache import AudioCache, link_file
+from app.services.session import SessionManager
+from app.services.session_store import InMemorySessionStore
+from app.services import storage as storage_module
+from app.services.storage import EvictionCandidates, StorageManager
+from app.services.youtube import VideoError
+
+MB = 1024 * 1024
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 10))
+
+
+@pytest.fixture
+def root(tmp_path):
+    return str(tmp_path)
+
+
+def _manager(root: str, quota_mb: int, cache: bool = True, measure_interval: float = 0) -> StorageManager:
+    audio_cache = AudioCache(os.path.join(root, 'cache'), 100 * MB) if cache else None
+    return StorageManager(
+        SessionManager(InMemorySessionStore()),
+        audio_cache,
+        root,
+        quota_bytes=quota_mb * MB,
+        pressure_percent=50,
+        min_free_bytes=0,
+        measure_interval=measure_interval
+    )
+
+
+def _write(path: str, nbytes: int) -> str:
+    with open(path, 'wb') as file:
+        file.write(b'\0' * nbytes)
+    return path
+
+
+def _session(storage: StorageManager, path: str, age_minutes: int) -> str:
+    return storage.sessions.create_session(
+        path, {}, created_at=datetime.now() - timedelta(minutes=age_minutes)
+    )
+
+
+def test_hardlinked_sessions_counted_once(root):
+    """캐시 히트로 만든 세션은 캐시 파일과 같은 inode이므로 한 번만 집계"""
+    storage = _manager(root, quota_mb=100)
+    source = _write(os.path.join(root, 'result.mp3'), 2 * MB)
+    storage.cache.store('video', 'mp3', 192, source)
+    os.remove(source)
+    for index in range(3):
+        path = os.path.join(root, f'session-{index}.mp3')
+        assert storage.cache.fetch('video', 'mp3', 192, path)
+        _session(storage, path, index)
+
+    run(storage.refresh())
+    stats = storage.get_stats()
+    assert stats['disk_bytes'] == 2 * MB
+    assert stats['cache_bytes'] == 2 * MB
+
+
+def test_reservation_counts_unwritten_part(root):
+    """작업 파일로 이미 쓴 만큼은 예약량에서 빠짐 (실측과 중복 집계하지 않음)"""
+    storage = _manager(root, quota_mb=100, cache=False)
+    prefix = 'job_00000000-0000-0000-0000-000000000000'
+
+    async def scenario():
+        await storage.reserve(10 * MB, job_prefix=prefix)
+        _write(os.path.join(root, f'{prefix}.source.webm'), 4 * MB)
+        await storage.refresh()
+        return storage.used_bytes()
+
+    assert run(scenario()) == 10 * MB
+
+
+def test_eviction_skips_sessions_sharing_cache(root):
+    """캐시와 inode를 공유하는 세션은 건너뛰고, 단독 세션 다음 캐시 항목을 회수"""
+    storage = _manager(root, quota_mb=10)
+    cached = _write(os.path.join(root, 'cached.mp3'), 3 * MB)
+    storage.cache.store('cached', 'mp3', 192, cached)
+    shared = _session(storage, cached, age_minutes=30)  # 가장 오래됨, 삭제해도 회수 안 됨
+    alone = _session(storage, _write(os.path.join(root, 'alone.mp3'), 3 * MB), age_minutes=20)
+    recent = _session(storage, _write(os.path.join(root, 'recent.mp3'), 1 * MB), age_minutes=10)
+
+    # 사용량 7MB > 임계치 5MB: 단독 세션(alone)만 삭제하면 4MB
+    evicted = run(storage.relieve_pressure())
+    assert evicted == 1
+    assert storage.sessions.get_session(alone) is None
+    assert storage.sessions.get_session(shared) is not None
+    assert storage.sessions.get_session(recent) is not None
+    assert storage.evicted_bytes == 3 * MB
+
+    # 4MB + 예약 8MB > 할당량 10MB: 남은 단독 세션(recent) -> 캐시 항목 -> 단독 파일이 된 세션 순
+    run(storage.reserve(8 * MB))
+    assert storage.evicted_cache_entries == 1
+    assert storage.sessions.get_session(recent) is None
+    assert storage.sessions.get_session(shared) is None
+    assert storage.evicted_bytes == 7 * MB
+
+
+def test_reject_when_nothing_reclaimable(root):
+    """같은 작업을 기다린 세션끼리 공유하는 파일은 삭제해도 회수되지 않으므로 남겨두고 실패"""
+    storage = _manager(root, quota_mb=4, cache=False)
+    first = _write(os.path.join(root, 'first.mp3'), 3 * MB)
+    second = os.path.join(root, 'second.mp3')
+    link_file(first, second)
+    sessions = [_session(storage, first, 20), _session(storage, second, 10)]
+
+    with pytest.raises(VideoError) as info:
+        run(storage.reserve(2 * MB))
+    assert info.value.category == 'storage'
+    assert all(storage.sessions.get_session(sid) for sid in sessions)
+    assert storage.get_stats()['disk_bytes'] == 3 * MB
+
+
+def test_candidates_remember_shared_sessions(root, monkeypatch):
+    """inode를 공유하는 세션은 한 번만 확인하고, 캐시 항목이 삭제되면 다시 후보가 됨"""
+    storage = _manager(root, quota_mb=100)
+    cached = _write(os.path.join(root, 'cached.mp3'), MB)
+    storage.cache.store('cached', 'mp3', 192, cached)
+    shared = [_session(storage, cached, age_minutes=30)]
+    for index in range(3):
+        path = os.path.join(root, f'shared-{index}.mp3')
+        assert storage.cache.fetch('cached', 'mp3', 192, path)
+        shared.append(_session(storage, path, age_minutes=25 - index))
+    pending = _session(storage, os.path.join(root, 'pending.mp3'), age_minutes=15)  # 파일 연결 전
+    alone = _session(storage, _write(os.path.join(root, 'alone.mp3'), MB), age_minutes=10)
+
+    stat_calls = []
+    real_stat = os.stat
+    monkeypatch.setattr(storage_module.os, 'stat', lambda path: stat_calls.append(path) or real_stat(path))
+
+    candidates = EvictionCandidates(storage.sessions, page_size=2)
+    assert candidates.next() == alone
+    assert pending not in {sid for group in candidates.shared.values() for sid, _ in group}
+    assert candidates.next() is None
+    assert len(stat_calls) == 6  # 세션마다 한 번
+
+    inode = (real_stat(cached).st_dev, real_stat(cached).st_ino)
+    candidates.release_inode(inode)
+    assert {sid for sid, _ in candidates.retry} == set(shared)
+
+
+def test_reserve_reuses_recent_measurement(root, monkeypatch):
+    storage = _manager(root, quota_mb=10, cache=False, measure_interval=60)
+    measured = []
+    real_measure = StorageManager._measure
+    monkeypatch.setattr(storage, '_measure', lambda *args: measured.append(1) or real_measure(*args))
+
+    async def scenario():
+        await storage.reserve(MB)  # 첫 실측
+        await storage.reserve(MB)  # 최근 실측 재사용
+        assert len(measured) == 1
+        await storage.reserve(9 * MB)  # 할당량을 넘으면 다시 측정 후 거절
+
+    with pytest.raises(VideoError):
+        run(scenario())
+    assert len(measured) == 2
@@ -0,0 +1,124 @@
+"""FFmpeg 변환 단계 (로컬 음원 픽스처, 네트워크 없음)"""
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import shutil
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from app.core.config import settings
+from app.services.transcode import CODECS, TranscodeService, transcode_service
+from app.services.youtube import VideoError
+
+requires_ffmpeg = pytest.mark.skipif(shutil.which(settings.FFMPEG_PATH) is None, reason='FFmpeg not installed')
+
+FIXTURE_SECONDS = 3
+FIXTURE_ENCODERS = {'webm': 'libopus', 'm4a': 'aac', 'mp3': 'libmp3lame'}
+
+
+@pytest.fixture(scope='module')
+def fixtures(tmp_path_factory):
+    """확장자별 사인파 음원 (FFmpeg lavfi로 생성)"""
+    if shutil.which(settings.FFMPEG_PATH) is None:
+        pytest.skip('FFmpeg not installed')
+
+    directory = tmp_path_factory.mktemp('fixtures')
+    paths = {}
+    for ext, encoder in FIXTURE_ENCODERS.items():
+        path = str(directory / f'source.{ext}')
+        subprocess.run([
+            settings.FFMPEG_PATH, '-hide_banner', '-loglevel', 'error', '-y',
+            '-f', 'lavfi', '-i', f'sine=frequency=440:duration={FIXTURE_SECONDS}',
+            '-c:a', encoder, '-b:a', '96k', path
+        ], check=True)
+        paths[ext] = path
+    return paths
+
+
+def _probe_length(path: str) -> float:
+    import mutagen
+    return mutagen.File(path).info.length
+
+
+@requires_ffmpeg
+@pytest.mark.parametrize('audio_format, source, codec', [
+    ('mp3', 'webm', 'opus'),
+    ('m4a', 'webm', 'opus'),
+    ('opus', 'm4a', 'mp4a.40.2'),
+    ('mp3', 'mp3', 'mp3'),  # 스트림 복사
+    ('m4a', 'm4a', 'mp4a.40.2'),  # 스트림 복사
+])
+def test_transcode_fixture(fixtures, tmp_path, audio_format, source, codec):
+    progress = []
+    output = asyncio.run(transcode_service.transcode(
+        fixtures[source],
+        str(tmp_path / 'out'),
+        audio_format=audio_format,
+        duration=FIXTURE_SECONDS,
+        source_codec=codec,
+        progress_callback=progress.append
+    ))
+
+    assert output.endswith(f".{CODECS[audio_format]['ext']}")
+    assert _probe_length(output) == pytest.approx(FIXTURE_SECONDS, abs=0.5)
+    assert progress and progress[-1] == pytest.approx(100, abs=5)
+
+
+@requires_ffmpeg
+def test_transcode_stream_fixture(fixtures, tmp_path):
+    def feeder(sink):
+        with open(fixtures['webm'], 'rb') as file:
+            shutil.copyfileobj(file, sink, 16 * 1024)
+
+    output = asyncio.run(transcode_service.transcode_stream(
+        feeder, str(tmp_path / 'out'), audio_format='mp3', source_codec='opus'
+    ))
+    assert _probe_length(output) == pytest.approx(FIXTURE_SECONDS, abs=0.5)
+
+
+@requires_ffmpeg
+def test_transcode_invalid_source(tmp_path):
+    source = tmp_path / 'broken.webm'
+    source.write_bytes(b'not audio' * 100)
+
+    with pytest.raises(VideoError) as info:
+        asyncio.run(transcode_service.transcode(str(source), str(tmp_path / 'out'), audio_format='mp3'))
+    assert info.value.category == 'transcode'
+
+
+def test_cancel_kills_process():
+    cancel_event = threading.Event()
+    command = [sys.executable, '-c', 'import time; time.sleep(30)']
+    threading.Timer(0.2, cancel_event.set).start()
+
+    with pytest.raises(VideoError) as info:
+        TranscodeService._run_ffmpeg(command, None, None, cancel_event=cancel_event)
+    assert info.value.category == 'cancelled'
+
+
+def test_large_stderr_does_not_block():
+    """stderr가 파이프 버퍼보다 많이 쌓여도 stdout 진행률 읽기와 막히지 않음"""
+    script = (
+        'import sys\n'
+        'for i in range(20000):\n'
+        '    sys.stderr.write(f"[mp3 @ 0x0] decode error {i}\\n")\n'
+        '    if i % 1000 == 0:\n'
+        '        print(f"out_time_us={i * 100}", flush=True)\n'
+        'sys.stderr.write("last error line\\n")\n'
+        'sys.exit(1)\n'
+    )
+    progress = []
+    executor = ThreadPoolExecutor(1)
+    future = executor.submit(
+        TranscodeService._run_ffmpeg, [sys.executable, '-c', script], 2.0, progress.append
+    )
+    try:
+        with pytest.raises(VideoError) as info:
+            future.result(timeout=20)
+    finally:
+        executor.shutdown(wait=False)
+
+    assert 'last error line' in str(info.value)
+    assert progress
@@ -0,0 +1,96 @@
+"""YouTube URL 파싱 (캐시 키, 동일 작업 합류, 영상 정보 캐시의 기준)"""
+import pytest
+
+from app.utils.youtube_url import YouTubeURL, parse_youtube_url
+
+VIDEO_ID = 'dQw4w9WgXcQ'
+
+
+@pytest.mark.parametrize('url, expected', [
+    # 영상 ID만
+    (VIDEO_ID, YouTubeURL(VIDEO_ID)),
+    (f'  {VIDEO_ID}\n', YouTubeURL(VIDEO_ID)),
+    # youtu.be
+    (f'https://youtu.be/{VIDEO_ID}', YouTubeURL(VIDEO_ID)),
+    (f'youtu.be/{VIDEO_ID}/', YouTubeURL(VIDEO_ID)),
+    (f'https://youtu.be/{VIDEO_ID}?si=abcdef', YouTubeURL(VIDEO_ID)),
+    # watch
+    (f'https://www.youtube.com/watch?v={VIDEO_ID}', YouTubeURL(VIDEO_ID)),
+    (f'http://youtube.com/watch?v={VIDEO_ID}', YouTubeURL(VIDEO_ID)),
+    (f'www.youtube.com/watch?feature=share&v={VIDEO_ID}', YouTubeURL(VIDEO_ID)),
+    (f'HTTPS://WWW.YOUTUBE.COM/watch?v={VIDEO_ID}', YouTubeURL(VIDEO_ID)),
+    (f'https://www.youtube.com/watch/?v={VIDEO_ID}#comments', YouTubeURL(VIDEO_ID)),
+    # 모바일, YouTube Music
+    (f'https://m.youtube.com/watch?v={VIDEO_ID}', YouTubeURL(VIDEO_ID)),
+    (f'https://music.youtube.com/watch?v={VIDEO_ID}', YouTubeURL(VIDEO_ID)),
+    # 경로형 (shorts, embed, live, v, e)
+    (f'https://www.youtube.com/shorts/{VIDEO_ID}', YouTubeURL(VIDEO_ID)),
+    (f'https://youtube.com/shorts/{VIDEO_ID}/?feature=share', YouTubeURL(VIDEO_ID)),
+    (f'https://www.youtube.com/embed/{VIDEO_ID}', YouTubeURL(VIDEO_ID)),
+    (f'https://www.youtube-nocookie.com/embed/{VIDEO_ID}', YouTubeURL(VIDEO_ID)),
+    (f'https://www.youtube.com/live/{VIDEO_ID}', YouTubeURL(VIDEO_ID)),
+    (f'https://www.youtube.com/v/{VIDEO_ID}', YouTubeURL(VIDEO_ID)),
+    (f'https://www.youtube.com/e/{VIDEO_ID}', YouTubeURL(VIDEO_ID)),
+    # 재생목록
+    (f'https://www.youtube.com/watch?v={VIDEO_ID}&list=PLx0sYbCqOb8TBPRdmBHs5Iftvv9TPboYG',
+     YouTubeURL(VIDEO_ID, 'PLx0sYbCqOb8TBPRdmBHs5Iftvv9TPboYG')),
+    (f'https://youtu.be/{VIDEO_ID}?list=RDdQw4w9WgXcQ', YouTubeURL(VIDEO_ID, 'RDdQw4w9WgXcQ')),
+    ('https://www.youtube.com/playlist?list=PLx0sYbCqOb8TBPRdmBHs5Iftvv9TPboYG',
+     YouTubeURL(None, 'PLx0sYbCqOb8TBPRdmBHs5Iftvv9TPboYG')),
+    (f'https://www.youtube.com/watch?v={VIDEO_ID}&list=bad!list', YouTubeURL(VIDEO_ID)),
+])
+def test_parse(url, expected):
+    assert parse_youtube_url(url) == expected
+
+
+@pytest.mark.parametrize('url, start_time', [
+    (f'https://youtu.be/{VIDEO_ID}?t=90', 90),
+    (f'https://youtu.be/{VIDEO_ID}?t=90s', 90),
+    (f'https://youtu.be/{VIDEO_ID}?t=1m30s', 90),
+    (f'https://youtu.be/{VIDEO_ID}?t=1h2m3s', 3723),
+    (f'https://youtu.be/{VIDEO_ID}?t=2m', 120),
+    (f'https://www.youtube.com/watch?v={VIDEO_ID}&t=45', 45),
+    (f'https://www.youtube.com/embed/{VIDEO_ID}?start=30', 30),
+    (f'https://www.youtube.com/watch?v={VIDEO_ID}&t=10&start=99', 10),  # t 우선
+    (f'https://www.youtube.com/watch?v={VIDEO_ID}&t=', None),
+    (f'https://www.youtube.com/watch?v={VIDEO_ID}&t=abc', None),
+    (f'https://www.youtube.com/watch?v={VIDEO_ID}&t=1:30', None),
+    (f'https://www.youtube.com/watch?v={VIDEO_ID}', None),
+])
+def test_timestamp(url, start_time):
+    assert parse_youtube_url(url).start_time == start_time
+
+
+@pytest.mark.parametrize('url', [
+    '',
+    'not a url',
+    # 다른 호스트
+    f'https://vimeo.com/{VIDEO_ID}',
+    f'https://www.youtube.com.evil.com/watch?v={VIDEO_ID}',
+    f'https://evilyoutube.com/watch?v={VIDEO_ID}',
+    f'https://youtube.co/watch?v={VIDEO_ID}',
+    f'https://gaming.youtube.com/watch?v={VIDEO_ID}',
+    f'ftp://www.youtube.com/watch?v={VIDEO_ID}',
+    # 잘못된 영상 ID
+    'dQw4w9WgXc',  # 10자
+    'dQw4w9WgXcQQ',  # 12자
+    'dQw4w9WgX!Q',
+    'https://www.youtube.com/watch?v=dQw4w9WgXc',
+    'https://www.youtube.com/watch?v=dQw4w9WgXcQQ',
+    'https://youtu.be/dQw4w9WgX%51',
+    'https://www.youtube.com/shorts/dQw4w9WgXc',
+    f'https://www.youtube.com/shorts/{VIDEO_ID}/extra',
+    f'https://www.youtube.com/user/{VIDEO_ID}',
+    f'https://www.youtube.com/{VIDEO_ID}',
+    'https://www.youtube.com/watch',
+    'https://www.youtube.com/playlist?list=x',
+])
+def test_rejected(url):
+    assert parse_youtube_url(url) is None
+
+
+def test_canonical_url():
+    assert parse_youtube_url(f'https://youtu.be/{VIDEO_ID}?t=30').canonical_url == \
+        f'https://www.youtube.com/watch?v={VIDEO_ID}'
+    assert parse_youtube_url('https://www.youtube.com/playlist?list=PLabc').canonical_url == \
+        'https://www.youtube.com/playlist?list=PLabc'
@@ -19,15 +19,52 @@ export interface PreviewData {
   duration: number;
 }
 
+export type AudioFormat = 'mp3' | 'm4a' | 'opus';
+
 export interface ProgressEvent {
-  step: 'validating' | 'downloading' | 'extracting_thumbnail' | 'embedding' | 'complete' | 'error';
+  step: 'validating' | 'queued' | 'downloading' | 'postprocessing' | 'extracting_thumbnail' | 'embedding' | 'complete' | 'error';
   progress: number;
   message: string;
+  percent?: number;
+  downloaded_bytes?: number;
+  total_bytes?: number;
+  speed?: number | null;
+  eta?: number | null;
+  job_id?: string;
+  queue_position?: number;
+  retry_after?: number;
   session_id?: string;
+  trace_id?: string;
+  profile?: boolean;
   preview?: PreviewData;
   error_detail?: string;
 }
 
+export interface BatchItem {
+  index: number;
+  video_id: string;
+  title?: string | null;
+  session_id?: string | null;
+  suggested_filename?: string | null;
+  error?: string | null;
+}
+
+export interface BatchProgressEvent {
+  step: 'resolving' | 'resolved' | 'item' | 'complete' | 'error';
+  progress: number;
+  message: string;
+  total?: number;
+  completed?: number;
+  failed?: number;
+  index?: number;
+  video_id?: string;
+  item_step?: ProgressEvent['step'];
+  item_progress?: number;
+  session_ids?: string[];
+  items?: BatchItem[];
+  error_detail?: string;
+}
+
 /**
  * Fetch video info preview
  */
@@ -63,11 +100,14 @@ export function extractAudio(
   youtubeUrl: string,
   onProgress: (event: ProgressEvent) => void,
   onError: (error: Error) => void,
-  onComplete: (preview: PreviewData, sessionId: string) => void
+  onComplete: (preview: PreviewData, sessionId: string) => void,
+  format?: AudioFormat
 ): () => void {
-  const eventSource = new EventSource(
-    `${API_BASE_URL}/extract?youtube_url=${encodeURIComponent(youtubeUrl)}`
-  );
+  const params = new URLSearchParams({ youtube_url: youtubeUrl });
+  if (format) {
+    params.set('format', format);
+  }
+  const eventSource = new EventSource(`${API_BASE_URL}/extract?${params.toString()}`);
 
   eventSource.onmessage = (event) => {
     try {
@@ -98,7 +138,70 @@ export function extractAudio(
 }
 
 /**
- * Download MP3 file
+ * Extract several videos or playlists with a single SSE stream
+ */
+export function extractBatch(
+  youtubeUrls: string[],
+  onProgress: (event: BatchProgressEvent) => void,
+  onError: (error: Error) => void,
+  onComplete: (items: BatchItem[], sessionIds: string[]) => void,
+  format?: AudioFormat
+): () => void {
+  const params = new URLSearchParams();
+  youtubeUrls.forEach((url) => params.append('youtube_url', url));
+  if (format) {
+    params.set('format', format);
+  }
+  const eventSource = new EventSource(`${API_BASE_URL}/batch/extract?${params.toString()}`);
+
+  eventSource.onmessage = (event) => {
+    try {
+      const data: BatchProgressEvent = JSON.parse(event.data);
+      onProgress(data);
+
+      if (data.step === 'complete') {
+        eventSource.close();
+        onComplete(data.items || [], data.session_ids || []);
+      } else if (data.step === 'error') {
+        eventSource.close();
+        onError(new Error(data.message || '처리 중 오류가 발생했습니다'));
+      }
+    } catch (error) {
+      console.error('Failed to parse SSE message:', error);
+    }
+  };
+
+  eventSource.onerror = () => {
+    eventSource.close();
+    onError(new Error('서버 연결이 끊어졌습니다'));
+  };
+
+  return () => {
+    eventSource.close();
+  };
+}
+
+/**
+ * URL for downloading batch results as one ZIP (streamed, use as <a href>)
+ */
+export function batchZipUrl(sessionIds: string[], filename?: string): string {
+  const params = new URLSearchParams();
+  sessionIds.forEach((id) => params.append('session_id', id));
+  if (filename) {
+    params.set('filename', filename);
+  }
+  return `${API_BASE_URL}/batch/zip?${params.toString()}`;
+}
+
+/**
+ * URL for listening to an extraction while it is still running (use as <audio src>)
+ */
+export function listenUrl(jobId: string): string {
+  return `${API_BASE_URL}/listen/${encodeURIComponent(jobId)}`;
+}
+
+/**
+ * Download audio file
  */
 export async function downloadFile(sessionId: string, filename?: string): Promise<void> {
   try {
@@ -120,8 +223,12 @@ export async function downloadFile(sessionId: string, filename?: string): Promis
     let downloadFilename = filename ? `${filename}.mp3` : 'audio.mp3';
 
     if (contentDisposition) {
+      // Non-ASCII filenames are sent as filename*=utf-8''<percent-encoded>
+      const encoded = /filename\*=utf-8''([^;]+)/i.exec(contentDisposition);
       const matches = /filename="(.+)"/.exec(contentDisposition);
-      if (matches && matches[1]) {
+      if (encoded && encoded[1]) {
+        downloadFilename = decodeURIComponent(encoded[1]);
+      } else if (matches && matches[1]) {
         downloadFilename = matches[1];
       }
     }